@@ -0,0 +1,246 @@
+"""
+Duração de arquivos MP3 sem decodificar o áudio.
+
+`AudioSegment.from_mp3` decodifica o arquivo inteiro com o FFmpeg só para medir
+`len(audio)`. Aqui a duração sai dos cabeçalhos: o cabeçalho Xing/Info (com o atraso
+e o preenchimento do encoder gravados pelo LAME/FFmpeg) ou VBRI, quando existem; caso
+contrário, os cabeçalhos de todos os frames são percorridos (só 4 bytes por frame),
+o que vale para CBR e VBR.
+
+`DurationIndex` guarda as durações num arquivo ao lado dos áudios (validadas por
+tamanho e data de modificação), então uma nova execução sobre centenas de segmentos
+já gerados não lê nenhum MP3.
+
+Usage:
+    >>> mp3_duration("audio_dublado_pt/segment_001_00_00_00.mp3")
+    1.992
+    >>> with DurationIndex("audio_dublado_pt/durations.json") as durations:
+    ...     durations.probe_many(glob.glob("audio_dublado_pt/*.mp3"))
+"""
+import json
+import os
+import struct
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+
+INDEX_VERSION = 1
+
+# Bitrates (kbps) por índice: MPEG-1 camadas I, II, III e MPEG-2/2.5 camada I, camadas II/III.
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+
+class _Frame:
+    """Campos de um cabeçalho de frame MPEG de áudio."""
+    __slots__ = ("version", "layer", "bitrate", "sample_rate", "samples", "length", "mono")
+
+    def __init__(self, header: int):
+        version_bits = (header >> 19) & 3
+        layer_bits = (header >> 17) & 3
+        bitrate_index = (header >> 12) & 15
+        rate_index = (header >> 10) & 3
+        if (header >> 21) != 0x7FF or version_bits == 1 or layer_bits == 0 \
+                or bitrate_index in (0, 15) or rate_index == 3:
+            raise ValueError("cabeçalho de frame inválido")
+        self.version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+        self.layer = 4 - layer_bits
+        table = (1, self.layer) if self.version == 1 else (2, 1 if self.layer == 1 else 2)
+        self.bitrate = _BITRATES[table][bitrate_index] * 1000
+        self.sample_rate = _SAMPLE_RATES[self.version][rate_index]
+        padding = (header >> 9) & 1
+        self.mono = ((header >> 6) & 3) == 3
+        if self.layer == 1:
+            self.samples = 384
+            self.length = (12 * self.bitrate // self.sample_rate + padding) * 4
+        else:
+            self.samples = 1152 if self.layer == 2 or self.version == 1 else 576
+            self.length = self.samples // 8 * self.bitrate // self.sample_rate + padding
+
+
+def _audio_start(file) -> int:
+    """Posição do primeiro byte depois das tags ID3v2 (pode haver mais de uma)."""
+    position = 0
+    while True:
+        file.seek(position)
+        head = file.read(10)
+        if len(head) < 10 or head[:3] != b"ID3":
+            return position
+        size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        footer = 10 if head[5] & 0x10 else 0
+        position += 10 + size + footer
+
+
+def _first_frame(file, start: int, limit: int = 64 * 1024):
+    """Procura o primeiro frame válido (seguido de outro frame válido) a partir de `start`."""
+    file.seek(start)
+    data = file.read(limit)
+    position = data.find(b"\xff")
+    while 0 <= position <= len(data) - 4:
+        try:
+            frame = _Frame(struct.unpack(">I", data[position:position + 4])[0])
+        except ValueError:
+            position = data.find(b"\xff", position + 1)
+            continue
+        following = position + frame.length
+        if following + 4 > len(data):
+            return start + position, frame
+        try:
+            _Frame(struct.unpack(">I", data[following:following + 4])[0])
+            return start + position, frame
+        except ValueError:
+            position = data.find(b"\xff", position + 1)
+    raise ValueError("nenhum frame MPEG de áudio encontrado")
+
+
+def _header_duration(file, position: int, frame: _Frame) -> Optional[float]:
+    """Duração pelo cabeçalho Xing/Info ou VBRI do primeiro frame, se houver."""
+    file.seek(position)
+    data = file.read(frame.length)
+    if frame.version == 1:
+        side_info = 17 if frame.mono else 32
+    else:
+        side_info = 9 if frame.mono else 17
+    xing = 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if not flags & 1:
+            return None
+        frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+        samples = frames * frame.samples
+        # Campos opcionais: bytes (flag 2), TOC (flag 4) e qualidade (flag 8); depois, a tag LAME.
+        lame = xing + 12 + (4 if flags & 2 else 0) + (100 if flags & 4 else 0) + (4 if flags & 8 else 0)
+        if len(data) >= lame + 24 and data[lame:lame + 4] in (b"LAME", b"Lavc", b"Lavf", b"L3.9"):
+            # O FFmpeg (e portanto o pydub) pula atraso + 529 amostras no início e para
+            # 529 amostras antes do preenchimento no fim: o atraso do decodificador se
+            # cancela e a duração decodificada é frames * amostras - atraso - preenchimento.
+            delay_padding = int.from_bytes(data[lame + 21:lame + 24], "big")
+            samples -= (delay_padding >> 12) + (delay_padding & 0xFFF)
+        return max(samples, 0) / frame.sample_rate
+    if data[36:40] == b"VBRI":
+        frames = struct.unpack(">I", data[50:54])[0]
+        return frames * frame.samples / frame.sample_rate
+    return None
+
+
+def mp3_duration(path: str) -> float:
+    """
+    Duração (s) de um MP3 lida dos cabeçalhos, sem decodificar.
+
+    Raises:
+        ValueError: Se o arquivo não contém frames MPEG de áudio.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        start = _audio_start(file)
+        position, frame = _first_frame(file, start)
+        duration = _header_duration(file, position, frame)
+        if duration is not None:
+            return duration
+        # Sem cabeçalho Xing/VBRI: soma os frames, pulando de cabeçalho em cabeçalho.
+        samples = 0
+        sample_rate = frame.sample_rate
+        while position + 4 <= size:
+            file.seek(position)
+            try:
+                frame = _Frame(struct.unpack(">I", file.read(4))[0])
+            except ValueError:
+                break  # tag ID3v1/APE no fim do arquivo, ou lixo
+            samples += frame.samples
+            position += frame.length
+        return samples / sample_rate
+
+
+class DurationIndex:
+    """
+    Índice persistente de durações de MP3 (arquivo JSON ao lado dos áudios).
+
+    Uma entrada vale enquanto o tamanho e a data de modificação do arquivo não mudarem,
+    então áudios regravados são medidos de novo. Seguro para várias threads.
+
+    Args:
+        index_path (str): Caminho do arquivo do índice.
+        workers (int): Threads usadas por `probe_many`.
+    """
+
+    def __init__(self, index_path: str, workers: int = 8):
+        self.index_path = index_path
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.probed = 0
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") == INDEX_VERSION:
+                self._entries = data["entries"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    def _key(self, path: str) -> str:
+        # Caminhos relativos à pasta do índice, para o índice sobreviver a uma mudança de pasta.
+        return os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(self.index_path)))
+
+    def duration(self, path: str) -> float:
+        """Duração de `path`, do índice ou medida (e guardada) se o arquivo mudou."""
+        stat = os.stat(path)
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["duration"]
+        duration = mp3_duration(path)
+        with self._lock:
+            self._entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "duration": duration}
+            self._dirty = True
+            self.probed += 1
+        return duration
+
+    def probe_many(self, paths: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Durações de vários arquivos, medidas em paralelo. Arquivos ausentes ou que não
+        são MP3 válidos ficam com None.
+        """
+        def probe(path):
+            try:
+                return self.duration(path)
+            except (OSError, ValueError):
+                return None
+
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mp3-probe") as executor:
+            durations = dict(zip(paths, executor.map(probe, paths)))
+        self.flush()
+        return durations
+
+    def flush(self):
+        """Grava o índice em disco (escrita atômica), se houve mudanças."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump({"version": INDEX_VERSION, "entries": self._entries}, file)
+            os.replace(temporary, self.index_path)
+            self._dirty = False
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "DurationIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
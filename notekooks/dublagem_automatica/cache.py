@@ -0,0 +1,257 @@
+"""
+Cache persistente, endereçado por conteúdo, para traduções e áudios sintetizados.
+
+A chave de cada entrada é um hash do conteúdo que a produz (texto, idiomas, voz,
+velocidade...), não da posição do segmento: editar uma linha da transcrição só
+invalida os segmentos cujo texto mudou, e um áudio antigo nunca é reaproveitado
+para um texto diferente.
+
+Os dados ficam em `<pasta>/objects/<2 primeiros caracteres da chave>/<chave><sufixo>`
+e um índice JSON (`index.json`) guarda tamanho e último acesso de cada entrada. Quando
+o total passa de `max_bytes`, as entradas usadas há mais tempo são removidas (LRU). O
+índice é regravado no máximo a cada `flush_interval` segundos e no `close`, não a
+cada acesso.
+
+Usage:
+    >>> with ContentCache(".cache_dublagem", max_bytes=500 * 2**20) as cache:
+    ...     key = ContentCache.key("translation", "hello", source="en", target="pt")
+    ...     cache.get_text(key) or cache.put_text(key, "olá")
+    ...     with cache.pinned(key) as path:  # não é despejado enquanto estiver em uso
+    ...         shutil.copyfile(path, "traducao.txt")
+    ...     print(cache.stats())
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+INDEX_VERSION = 1
+
+
+class ContentCache:
+    """
+    Cache em disco com índice, despejo LRU por tamanho e estatísticas de acerto.
+    Seguro para uso por várias threads (ex: as etapas de `pipeline.Pipeline`).
+
+    Args:
+        directory (str): Pasta do cache (criada se não existir).
+        max_bytes (int): Tamanho máximo somado das entradas.
+        flush_interval (float): Intervalo mínimo (s) entre duas gravações do índice
+                                durante o uso; ele também é gravado no `close`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 500 * 2**20, flush_interval: float = 5.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.RLock()
+        self._entries: Dict[str, dict] = {}
+        self._total_bytes = 0
+        self._pins: Dict[str, int] = {}  # entradas em uso (não podem ser despejadas)
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = 0
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._load_index()
+
+    # --- Chaves ---
+
+    @staticmethod
+    def key(kind: str, text: str, **params) -> str:
+        """
+        Chave de conteúdo: sha256 de (tipo, texto, parâmetros ordenados).
+        """
+        payload = json.dumps({"kind": kind, "text": text, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- Índice ---
+
+    def _load_index(self):
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") == INDEX_VERSION:
+                self._entries = data["entries"]
+                self._total_bytes = sum(entry["size"] for entry in self._entries.values())
+                return
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Refaz o índice a partir dos arquivos existentes (índice ausente ou corrompido)."""
+        self._entries = {}
+        objects = os.path.join(self.directory, "objects")
+        for root, _, files in os.walk(objects):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                key = name.split(".", 1)[0]
+                self._entries[key] = {
+                    "file": os.path.relpath(path, self.directory),
+                    "size": stat.st_size,
+                    "atime": stat.st_mtime,
+                }
+        self._total_bytes = sum(entry["size"] for entry in self._entries.values())
+        self._dirty = True
+        self.flush()
+
+    def flush(self):
+        """Grava o índice em disco (escrita atômica), se houve mudanças."""
+        with self._lock:
+            if not self._dirty:
+                return
+            temporary = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump({"version": INDEX_VERSION, "entries": self._entries}, file)
+            os.replace(temporary, self._index_path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "ContentCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Acesso ---
+
+    def _object_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, "objects", key[:2], key + suffix)
+
+    def get_path(self, key: str) -> Optional[str]:
+        """
+        Caminho do arquivo guardado em `key`, ou None (miss). Um acerto atualiza o LRU.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                path = os.path.join(self.directory, entry["file"])
+                if os.path.exists(path):
+                    entry["atime"] = time.time()
+                    self._dirty = True
+                    self.hits += 1
+                    return path
+                # O arquivo sumiu por fora do cache: a entrada não vale mais.
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    @contextmanager
+    def pinned(self, key: str) -> Iterator[Optional[str]]:
+        """
+        Como `get_path`, mas a entrada não é despejada (por um `put` de outra thread)
+        enquanto o contexto estiver aberto, então o arquivo pode ser lido ou copiado com
+        segurança. Produz None num miss.
+        """
+        with self._lock:
+            path = self.get_path(key)
+            if path is not None:
+                self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield path
+        finally:
+            if path is not None:
+                with self._lock:
+                    self._pins[key] -= 1
+                    if not self._pins[key]:
+                        del self._pins[key]
+
+    def put_file(self, key: str, source_path: str, suffix: str = "") -> str:
+        """
+        Copia `source_path` para o cache sob `key` e retorna o caminho guardado.
+        """
+        path = self._object_path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, temporary)
+        self._publish(key, temporary, path)
+        return path
+
+    def get_text(self, key: str) -> Optional[str]:
+        with self.pinned(key) as path:
+            if path is None:
+                return None
+            with open(path, "r", encoding="utf-8") as file:
+                return file.read()
+
+    def put_text(self, key: str, text: str) -> str:
+        path = self._object_path(key, ".txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(text)
+        self._publish(key, temporary, path)
+        return text
+
+    def _publish(self, key: str, temporary: str, path: str):
+        """
+        Move o arquivo temporário para `path` e registra a entrada. As duas coisas são
+        feitas sob o lock: um despejo em outra thread (da versão anterior da mesma
+        chave) não pode apagar o arquivo novo antes de ele entrar no índice.
+        """
+        size = os.path.getsize(temporary)
+        with self._lock:
+            os.replace(temporary, path)
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {
+                "file": os.path.relpath(path, self.directory),
+                "size": size,
+                "atime": time.time(),
+            }
+            self._total_bytes += size
+            self.puts += 1
+            self._dirty = True
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=key)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def _drop(self, key: str):
+        self._total_bytes -= self._entries.pop(key)["size"]
+        self._dirty = True
+
+    def _evict(self, keep: str):
+        # Só é chamado quando o total passa do limite, então a ordenação é rara.
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["atime"]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+            self._drop(key)
+            self.evictions += 1
+
+    # --- Estatísticas ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "puts": self.puts,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
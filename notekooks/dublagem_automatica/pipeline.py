@@ -0,0 +1,199 @@
+"""
+Execução concorrente e em pipeline das etapas da dublagem (tradução, TTS, ...).
+
+Cada etapa (`Stage`) tem seu próprio pool de threads, limitado em número de
+workers e, opcionalmente, em chamadas por segundo. Um segmento passa para a etapa
+seguinte assim que sai da anterior, então as etapas trabalham ao mesmo tempo sobre
+segmentos diferentes e o tempo total tende ao da etapa mais lenta, não à soma de
+todas as chamadas. Os resultados saem na mesma ordem da entrada.
+
+As etapas são apenas funções `segmento -> segmento`, então podem ser trocadas por
+versões locais (sem rede) em testes.
+
+Usage:
+    >>> pipeline = Pipeline([
+    ...     Stage("tradução", translate_segment, workers=4, rate_limit=5.0),
+    ...     Stage("tts", lambda s: generate_tts_for_segment(s, OUTPUT_AUDIO_DIR), workers=4),
+    ... ])
+    >>> for segment in pipeline.run(segments):
+    ...     print(segment["id"], segment["text_pt"])
+"""
+import random
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Type
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe: no máximo `rate` chamadas por segundo, com rajadas de
+    até `burst` chamadas.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver uma ficha disponível e a consome."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Stage:
+    """
+    Uma etapa do pipeline.
+
+    Args:
+        name (str): Nome da etapa (usado nos nomes das threads e nas estatísticas).
+        function (Callable): Processa um segmento e o retorna (pode alterá-lo no lugar).
+        workers (int): Máximo de chamadas simultâneas.
+        rate_limit (float, optional): Máximo de chamadas por segundo (inclui novas tentativas).
+        burst (int): Chamadas permitidas de uma vez antes do limite de taxa valer.
+        retries (int): Novas tentativas após uma falha.
+        backoff (float): Espera (s) antes da primeira nova tentativa; dobra a cada falha.
+        max_backoff (float): Espera máxima entre tentativas.
+        retry_on (Tuple[Type[BaseException]]): Exceções que justificam uma nova tentativa.
+        on_error (Callable, optional): on_error(segmento, exceção) -> segmento, chamado quando
+                                       as tentativas se esgotam. Sem ele, a exceção é
+                                       repassada a quem consome os resultados.
+    """
+
+    def __init__(self, name: str, function: Callable, workers: int = 4, rate_limit: Optional[float] = None,
+                 burst: int = 1, retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 on_error: Optional[Callable] = None):
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.limiter = RateLimiter(rate_limit, burst) if rate_limit else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.on_error = on_error
+        # Estatísticas (atualizadas pelas threads da etapa).
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, segment):
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result = self.function(segment)
+                error = None
+            except self.retry_on as exc:
+                result, error = None, exc
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.calls += 1
+                self.busy_seconds += elapsed
+                if error is not None and attempt < self.retries:
+                    self.retried += 1
+                elif error is not None:
+                    self.failures += 1
+            if error is None:
+                return result
+            if attempt >= self.retries:
+                if self.on_error is None:
+                    raise error
+                return self.on_error(segment, error)
+            # Backoff exponencial com jitter, para não sincronizar as novas tentativas.
+            time.sleep(min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+            attempt += 1
+
+    def __repr__(self):
+        return (f"Stage({self.name!r}, workers={self.workers}, chamadas={self.calls}, "
+                f"novas tentativas={self.retried}, falhas={self.failures}, ocupado={self.busy_seconds:.2f}s)")
+
+
+class Pipeline:
+    """
+    Encadeia várias `Stage`s, cada uma com seu pool de threads.
+
+    Args:
+        stages (List[Stage]): Etapas, na ordem de execução.
+        max_in_flight (int, optional): Máximo de segmentos em processamento ao mesmo tempo
+                                       (limita a memória quando a entrada é um gerador).
+                                       Default: o dobro da soma dos workers.
+    """
+
+    def __init__(self, stages: List[Stage], max_in_flight: Optional[int] = None):
+        self.stages = list(stages)
+        self.max_in_flight = max_in_flight or 2 * sum(stage.workers for stage in self.stages)
+
+    def _submit(self, item, executors: List[ThreadPoolExecutor]) -> Future:
+        final = Future()
+
+        def advance(index: int, value):
+            if index == len(self.stages):
+                final.set_result(value)
+                return
+            try:
+                future = executors[index].submit(self.stages[index], value)
+            except RuntimeError as exc:  # pool já encerrado (consumo interrompido)
+                final.set_exception(exc)
+                return
+
+            def done(f: Future):
+                if f.cancelled():
+                    final.cancel()
+                elif f.exception() is not None:
+                    final.set_exception(f.exception())
+                else:
+                    advance(index + 1, f.result())
+            future.add_done_callback(done)
+
+        advance(0, item)
+        return final
+
+    def run(self, items: Iterable) -> Iterator:
+        """
+        Processa `items` (lista ou gerador de segmentos) e os devolve, na ordem de
+        entrada, à medida que cada um sai da última etapa.
+        """
+        executors = [
+            ThreadPoolExecutor(max_workers=stage.workers, thread_name_prefix=f"stage-{stage.name}")
+            for stage in self.stages
+        ]
+        pending = deque()
+        items = iter(items)
+        try:
+            for item in items:
+                pending.append(self._submit(item, executors))
+                if len(pending) >= self.max_in_flight:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                # Janela deslizante: cada resultado entregue libera a entrada de mais um item.
+                for item in items:
+                    pending.append(self._submit(item, executors))
+                    break
+                yield result
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_all(self, items: Iterable) -> list:
+        """Como `run`, mas devolve a lista completa."""
+        return list(self.run(items))
@@ -0,0 +1,210 @@
+"""
+Renderização offline da dublagem: todos os áudios dos segmentos mixados numa única
+faixa alinhada à linha do tempo do vídeo.
+
+Cada segmento entra em `start_time_td`. Se o áudio não cabe no espaço até
+`end_time_td` (mais uma folga de `slot_margin` segundos), ele é acelerado com
+`pydub.effects.speedup`, como no `manage_speed_adjusted_audio` do notebook.
+
+A saída é codificada em streaming. Como os segmentos chegam em ordem de início, tudo
+o que vem antes do início do segmento atual já está pronto e é enviado ao encoder
+(o módulo `wave` para .wav, ou um pipe para o FFmpeg nos outros formatos). A memória
+usada fica limitada ao trecho ainda aberto da linha do tempo, não à duração do vídeo.
+A decodificação dos MP3 roda em paralelo (`pipeline.Pipeline`), alguns segmentos à
+frente da mixagem.
+
+Usage:
+    >>> stats = render_timeline(segments_with_audio, "dublagem_completa.mp3")
+    >>> print(f"{stats['duration_sec']:.0f}s renderizados em {stats['elapsed_sec']:.1f}s")
+"""
+import os
+import shutil
+import subprocess
+import time
+import wave
+
+import numpy as np
+
+from typing import Iterable, Optional
+
+from pipeline import Pipeline, Stage
+
+
+MAX_SPEED_FACTOR = 2.5  # Acima disso a fala fica ininteligível (mesmo limite do notebook)
+
+
+class _WaveWriter:
+    def __init__(self, path: str, sample_rate: int, channels: int):
+        self._file = wave.open(path, "wb")
+        self._file.setnchannels(channels)
+        self._file.setsampwidth(2)
+        self._file.setframerate(sample_rate)
+
+    def write(self, data: bytes):
+        self._file.writeframes(data)
+
+    def close(self):
+        self._file.close()
+
+
+class _FfmpegWriter:
+    """Codifica PCM de 16 bits recebido pelo stdin do FFmpeg (formato pela extensão)."""
+
+    def __init__(self, path: str, sample_rate: int, channels: int, bitrate: str):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("FFmpeg não encontrado no PATH; use uma saída .wav ou instale o FFmpeg.")
+        command = [ffmpeg, "-y", "-loglevel", "error", "-f", "s16le", "-ar", str(sample_rate),
+                   "-ac", str(channels), "-i", "pipe:0", "-b:a", bitrate, path]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, data: bytes):
+        self._process.stdin.write(data)
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"FFmpeg terminou com código {self._process.returncode}.")
+
+
+class _TimelineMixer:
+    """
+    Soma trechos de áudio numa janela da linha do tempo e envia ao `writer` a parte que
+    não pode mais receber áudio. Posições e tamanhos são em frames (amostras por canal).
+    """
+
+    def __init__(self, writer, channels: int, flush_frames: int):
+        self.writer = writer
+        self.channels = channels
+        self.flush_frames = flush_frames
+        self.flushed = 0  # frames já enviados ao writer
+        self.end = 0      # fim do áudio mixado até agora
+        self._window = np.zeros((0, channels), dtype=np.int32)
+
+    def add(self, start: int, samples: np.ndarray) -> int:
+        """Mixa `samples` (frames x canais) a partir de `start`; retorna a posição usada."""
+        start = max(start, self.flushed)  # Fora de ordem: não dá para voltar no que já foi gravado
+        end = start + len(samples)
+        needed = end - self.flushed
+        if needed > len(self._window):
+            grown = np.zeros((needed, self.channels), dtype=np.int32)
+            grown[:len(self._window)] = self._window
+            self._window = grown
+        self._window[start - self.flushed:end - self.flushed] += samples
+        self.end = max(self.end, end)
+        return start
+
+    def flush_until(self, position: int):
+        """
+        Grava tudo antes de `position` (em blocos de pelo menos `flush_frames`). Depois
+        do fim do áudio mixado, o trecho é gravado como silêncio.
+        """
+        if position - self.flushed < self.flush_frames:
+            return
+        self._write(position)
+
+    def _write(self, position: int):
+        count = position - self.flushed
+        if count <= 0:
+            return
+        block = np.zeros((count, self.channels), dtype=np.int32)
+        available = min(count, len(self._window))
+        block[:available] = self._window[:available]
+        self.writer.write(np.clip(block, -32768, 32767).astype("<i2").tobytes())
+        self._window = self._window[available:].copy()
+        self.flushed = position
+        self.end = max(self.end, position)
+
+    def close(self):
+        self._write(self.end)
+        self.writer.close()
+
+
+def _load_segment_audio(segment: dict, sample_rate: int, channels: int, slot_margin: float,
+                        max_speed: float) -> dict:
+    """
+    Decodifica o áudio do segmento no formato da saída e o acelera se ele não couber
+    no espaço do segmento. Guarda as amostras em `segment["_samples"]`.
+    """
+    from pydub import AudioSegment
+    from pydub.effects import speedup
+
+    sound = AudioSegment.from_file(segment["audio_file_path"])
+    sound = sound.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)
+    segment["speed_factor"] = 1.0
+    if segment.get("end_time_td") is not None:
+        slot = (segment["end_time_td"] - segment["start_time_td"]).total_seconds() + slot_margin
+        speed = sound.duration_seconds / slot if slot > 0 else max_speed
+        if speed > 1.0:
+            speed = min(speed, max_speed)
+            sound = speedup(sound, playback_speed=speed, chunk_size=150, crossfade=25)
+            sound = sound.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)
+            segment["speed_factor"] = speed
+    samples = np.frombuffer(sound.raw_data, dtype="<i2").reshape(-1, channels)
+    segment["_samples"] = samples.astype(np.int32)
+    return segment
+
+
+def render_timeline(segments: Iterable[dict], output_path: str, sample_rate: int = 24000, channels: int = 1,
+                    slot_margin: float = 1.5, max_speed: float = MAX_SPEED_FACTOR, bitrate: str = "64k",
+                    flush_seconds: float = 10.0, workers: int = 4, duration_sec: Optional[float] = None) -> dict:
+    """
+    Mixa o áudio dos segmentos numa única faixa alinhada aos timestamps.
+
+    Args:
+        segments (Iterable[dict]): Segmentos em ordem de início, com `audio_file_path`,
+                                   `start_time_td` e `end_time_td` (pode ser um gerador).
+        output_path (str): Arquivo de saída; `.wav` é gravado pelo módulo `wave`, os
+                           outros formatos são codificados pelo FFmpeg.
+        sample_rate (int): Taxa de amostragem da saída (o gTTS gera 24 kHz).
+        channels (int): Canais da saída.
+        slot_margin (float): Folga (s) somada ao espaço do segmento antes de acelerar.
+        max_speed (float): Aceleração máxima; o que ainda sobrar invade o próximo espaço.
+        bitrate (str): Bitrate do encoder (ignorado para .wav).
+        flush_seconds (float): Tamanho mínimo dos blocos enviados ao encoder.
+        workers (int): Threads decodificando segmentos à frente da mixagem.
+        duration_sec (float, optional): Duração total da faixa (ex: a do vídeo); o fim é
+                                        completado com silêncio.
+
+    Returns:
+        dict: Estatísticas (segmentos mixados, acelerados, ignorados, duração e tempo gasto).
+    """
+    started = time.perf_counter()
+    if output_path.lower().endswith(".wav"):
+        writer = _WaveWriter(output_path, sample_rate, channels)
+    else:
+        writer = _FfmpegWriter(output_path, sample_rate, channels, bitrate)
+    mixer = _TimelineMixer(writer, channels, int(flush_seconds * sample_rate))
+    stats = {"rendered": 0, "stretched": 0, "skipped": 0}
+
+    def skip(segment, error):
+        print(f"  AVISO: Segmento {segment['id']} ignorado na renderização: {error}")
+        segment["_samples"] = None
+        return segment
+
+    decode = Stage("decodificacao",
+                   lambda segment: _load_segment_audio(segment, sample_rate, channels, slot_margin, max_speed),
+                   workers=workers, retries=0, on_error=skip)
+    playable = (s for s in segments if s.get("audio_file_path") and os.path.exists(s["audio_file_path"]))
+    try:
+        for segment in Pipeline([decode], max_in_flight=2 * workers).run(playable):
+            samples = segment.pop("_samples")
+            if samples is None:
+                stats["skipped"] += 1
+                continue
+            start = int(round(segment["start_time_td"].total_seconds() * sample_rate))
+            # Os próximos segmentos começam depois deste: o que vem antes já está pronto.
+            mixer.flush_until(start)
+            placed = mixer.add(start, samples)
+            if placed != start:
+                print(f"  AVISO: Segmento {segment['id']} fora de ordem; deslocado para {placed / sample_rate:.2f}s.")
+            stats["rendered"] += 1
+            stats["stretched"] += segment["speed_factor"] > 1.0
+        if duration_sec is not None:
+            mixer.end = max(mixer.end, int(duration_sec * sample_rate))
+    finally:
+        mixer.close()
+
+    stats["duration_sec"] = mixer.flushed / sample_rate
+    stats["elapsed_sec"] = time.perf_counter() - started
+    return stats
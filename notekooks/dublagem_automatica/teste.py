@@ -1,11 +1,15 @@
-import re
 import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import translators as ts
 from gtts import gTTS
-from pydub import AudioSegment # <--- Adicionado para duração
-from pydub.exceptions import CouldntDecodeError # <--- Para tratar erros do pydub
+import filecmp
+import shutil
+from pipeline import Pipeline, Stage # <--- Execução concorrente de tradução e TTS
+from cache import ContentCache # <--- Cache de traduções e áudios por conteúdo
+from audio_probe import DurationIndex, mp3_duration # <--- Duração dos MP3 sem decodificar
+from renderer import render_timeline # <--- Faixa dublada completa renderizada offline
+from transcript import stream_transcript # <--- Leitura da transcrição em streaming
 try:
     from playsound3 import playsound # <--- Adicionado para tocar áudio
 except ImportError:
@@ -21,72 +25,165 @@ OUTPUT_AUDIO_DIR = "audio_dublado_pt"
 TARGET_LANGUAGE = 'pt' # Português
 SOURCE_LANGUAGE = 'en' # Inglês
 
+# Execução concorrente (ver pipeline.py): tradução e TTS rodam em paralelo, cada
+# etapa com seu próprio limite de workers e de chamadas por segundo.
+CONCURRENT_PIPELINE = True
+TRANSLATION_WORKERS = 4
+TRANSLATION_RATE_LIMIT = 5.0 # chamadas por segundo
+TTS_WORKERS = 4
+TTS_RATE_LIMIT = 3.0 # chamadas por segundo
+
+# Voz do gTTS (tld define o sotaque) e velocidade; entram na chave do cache de áudio.
+TTS_TLD = 'com'
+TTS_SLOW = False
+
+# Cache por conteúdo (hash do texto + parâmetros) de traduções e áudios (ver cache.py).
+CACHE_DIR = ".cache_dublagem"
+CACHE_MAX_BYTES = 500 * 2**20
+
+# Leitura da transcrição em blocos (ver transcript.py). Texto sem marcação de tempo é
+# dividido em segmentos de até UNTIMED_SEGMENT_CHARS caracteres, com tempos estimados.
+TRANSCRIPT_CHUNK_SIZE = 64 * 1024
+UNTIMED_SEGMENT_CHARS = 400
+UNTIMED_WORDS_PER_SECOND = 2.5
+
+# Índice com a duração de cada MP3 gerado (ver audio_probe.py), guardado junto aos áudios.
+DURATIONS_INDEX_FILE = "durations.json"
+PROBE_WORKERS = 8
+
+# Renderização offline (ver renderer.py): mixa todos os segmentos numa única faixa alinhada
+# aos timestamps, em vez da simulação em tempo real com playsound. Saídas que não são
+# .wav precisam do FFmpeg.
+RENDER_OFFLINE = True
+RENDERED_AUDIO_PATH = "dublagem_completa.mp3"
+RENDER_WORKERS = 4
+
 # --- Funções Auxiliares ---
-# (Mantenha parse_timestamp, get_transcript_content, segment_transcript, translate_segments)
-# ... (seu código anterior para essas funções) ...
+# A leitura e a segmentação da transcrição (parse_timestamp, segment_transcript,
+# stream_transcript) ficam em transcript.py.
 
-def parse_timestamp(ts_str):
-    """Converte uma string de timestamp HH:MM:SS para um objeto timedelta."""
+def get_audio_duration(audio_path, durations=None):
+    """
+    Duração (s) de um MP3 lida dos cabeçalhos (sem decodificar), via índice quando
+    houver. Retorna None, com um aviso, se o arquivo não puder ser lido.
+    """
     try:
-        h, m, s = map(int, ts_str.split(':'))
-        return timedelta(hours=h, minutes=m, seconds=s)
-    except ValueError:
-        print(f"AVISO: Timestamp inválido encontrado e ignorado: {ts_str}")
+        return durations.duration(audio_path) if durations is not None else mp3_duration(audio_path)
+    except (OSError, ValueError) as e_probe:
+        print(f"    AVISO: Não foi possível obter a duração de '{audio_path}': {e_probe}")
         return None
 
-def get_transcript_content(file_path):
-    """Lê o conteúdo do arquivo de transcrição."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except FileNotFoundError:
-        print(f"ERRO: Arquivo de transcrição não encontrado em '{file_path}'.")
-        return None
+def translate_segment(segment, cache=None):
+    """Traduz o texto de um segmento. Erros de tradução são propagados."""
+    if not segment["text_en"]:
+        segment["text_pt"] = ""
+        return segment
+    key = None
+    if cache is not None:
+        key = ContentCache.key("translation", segment["text_en"], translator='google',
+                               source=SOURCE_LANGUAGE, target=TARGET_LANGUAGE)
+        cached = cache.get_text(key)
+        if cached is not None:
+            segment["text_pt"] = cached
+            print(f"  Segmento {segment['id']} ({segment['start_time_str']}): Tradução reaproveitada do cache.")
+            return segment
+    segment["text_pt"] = ts.translate_text(
+        segment["text_en"], translator='google',
+        from_language=SOURCE_LANGUAGE, to_language=TARGET_LANGUAGE
+    )
+    if cache is not None:
+        cache.put_text(key, segment["text_pt"])
+    print(f"  Segmento {segment['id']} ({segment['start_time_str']}): Traduzido para PT.")
+    return segment
 
-def segment_transcript(transcript_content):
-    """Segmenta a transcrição."""
-    if not transcript_content:
-        return []
-    pattern = re.compile(r"(\d{2}:\d{2}:\d{2})(.*?(?=\d{2}:\d{2}:\d{2}|$))", re.DOTALL)
-    matches = pattern.findall(transcript_content)
-    segments = []
-    for i, (timestamp_str, text_en_raw) in enumerate(matches):
-        start_time_obj = parse_timestamp(timestamp_str)
-        if start_time_obj is None: continue
-        text_en = text_en_raw.strip()
-        if not text_en: continue
-        end_time_obj = None
-        if i + 1 < len(matches):
-            next_timestamp_str, _ = matches[i+1]
-            end_time_obj = parse_timestamp(next_timestamp_str)
-        segments.append({
-            "id": i, "start_time_str": timestamp_str, "start_time_td": start_time_obj,
-            "end_time_td": end_time_obj, "text_en": text_en, "text_pt": None,
-            "audio_file_path": None, "audio_duration_sec": None # <--- Adicionado audio_duration_sec
-        })
-    return segments
+def on_translation_error(segment, e):
+    """Marca o segmento cuja tradução falhou (o texto original é mantido)."""
+    print(f"  ERRO na tradução do segmento {segment['id']}: {e}")
+    segment["text_pt"] = f"[Erro na tradução: {segment['text_en']}]"
+    return segment
 
-def translate_segments(segments):
+def translate_segments(segments, cache=None):
     """Traduz o texto de cada segmento."""
     print("\n--- Iniciando Tradução ---")
     for segment in segments:
-        if segment["text_en"]:
-            try:
-                segment["text_pt"] = ts.translate_text(
-                    segment["text_en"], translator='google',
-                    from_language=SOURCE_LANGUAGE, to_language=TARGET_LANGUAGE
-                )
-                print(f"  Segmento {segment['id']} ({segment['start_time_str']}): Traduzido para PT.")
-            except Exception as e:
-                print(f"  ERRO na tradução do segmento {segment['id']}: {e}")
-                segment["text_pt"] = f"[Erro na tradução: {segment['text_en']}]"
-        else:
-            segment["text_pt"] = ""
+        try:
+            translate_segment(segment, cache)
+        except Exception as e:
+            on_translation_error(segment, e)
     print("--- Tradução Concluída ---")
     return segments
 
 
-def generate_tts_for_segments(segments, output_dir):
+def generate_tts_for_segment(segment, output_dir, cache=None, durations=None):
+    """
+    Gera (ou reaproveita) o áudio de um segmento e obtém sua duração.
+    Erros do TTS são propagados; erros ao ler a duração apenas geram um aviso.
+
+    Com `cache`, o áudio é procurado pelo hash de (texto, idioma, voz, velocidade) e o
+    arquivo do segmento só é regravado se estiver diferente do guardado (preserva a data
+    de modificação, que valida o índice de durações); sem cache, um arquivo já
+    existente com o nome do segmento é reaproveitado.
+    """
+    if not segment["text_pt"]: # Se não há texto traduzido (ex: erro na tradução ou texto original vazio)
+        print(f"  Segmento {segment['id']}: Sem texto em português para gerar áudio.")
+        segment["audio_file_path"] = None
+        segment["audio_duration_sec"] = None
+        return segment
+
+    # Define o nome esperado do arquivo de áudio
+    safe_timestamp_str = segment['start_time_str'].replace(':', '_')
+    audio_filename = f"segment_{segment['id']:03d}_{safe_timestamp_str}.mp3"
+    audio_path = os.path.join(output_dir, audio_filename)
+    segment["audio_file_path"] = audio_path # Define o caminho esperado
+
+    key, cached_path = None, None
+    if cache is not None:
+        key = ContentCache.key("tts", segment["text_pt"], lang=TARGET_LANGUAGE, tld=TTS_TLD, slow=TTS_SLOW)
+        # Fixado: outra thread não despeja a entrada entre a comparação e a cópia.
+        with cache.pinned(key) as cached_path:
+            if cached_path is not None and not (os.path.exists(audio_path) and filecmp.cmp(cached_path, audio_path)):
+                shutil.copyfile(cached_path, audio_path)
+                print(f"  Segmento {segment['id']}: Áudio reaproveitado do cache em '{audio_path}'.")
+
+    if os.path.exists(audio_path) and (cache is None or cached_path is not None):
+        print(f"  Segmento {segment['id']}: Arquivo de áudio já existe em '{audio_path}'. Pulando geração TTS.")
+        # Mesmo que o arquivo exista, tentamos obter/confirmar sua duração
+        segment["audio_duration_sec"] = get_audio_duration(audio_path, durations)
+        if segment["audio_duration_sec"] is not None:
+            print(f"    Duração do áudio existente: {segment['audio_duration_sec']:.2f}s")
+    else:
+        # Arquivo não existe, então geramos
+        print(f"  Segmento {segment['id']}: Gerando áudio para '{audio_path}'...")
+        try:
+            tts = gTTS(text=segment["text_pt"], lang=TARGET_LANGUAGE, tld=TTS_TLD, slow=TTS_SLOW)
+            tts.save(audio_path)
+        except Exception:
+            # Não deixa um arquivo incompleto para trás (ele seria reaproveitado na próxima execução).
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+            raise
+        print(f"    Áudio salvo em '{audio_path}'")
+        if cache is not None:
+            try:
+                cache.put_file(key, audio_path, suffix=".mp3")
+            except OSError as e_cache:
+                # O MP3 gerado continua válido; só não fica guardado no cache.
+                print(f"    AVISO: Não foi possível guardar o áudio no cache: {e_cache}")
+
+        # Obter duração do áudio recém-gerado
+        segment["audio_duration_sec"] = get_audio_duration(audio_path, durations)
+        if segment["audio_duration_sec"] is not None:
+            print(f"    Duração do áudio gerado: {segment['audio_duration_sec']:.2f}s")
+    return segment
+
+def on_tts_error(segment, e_tts):
+    """Marca o segmento cujo TTS falhou."""
+    print(f"  ERRO no TTS para segmento {segment['id']}: {e_tts}")
+    segment["audio_file_path"] = None # Garante que não tentará tocar um arquivo que falhou na criação
+    segment["audio_duration_sec"] = None
+    return segment
+
+def generate_tts_for_segments(segments, output_dir, cache=None, durations=None):
     """
     Gera arquivos de áudio para os textos traduzidos, pulando se já existirem.
     Sempre tenta obter a duração do áudio.
@@ -97,59 +194,35 @@ def generate_tts_for_segments(segments, output_dir):
         print(f"Diretório de áudio criado: {output_dir}")
 
     for segment in segments:
-        if not segment["text_pt"]: # Se não há texto traduzido (ex: erro na tradução ou texto original vazio)
-            print(f"  Segmento {segment['id']}: Sem texto em português para gerar áudio.")
-            segment["audio_file_path"] = None
-            segment["audio_duration_sec"] = None
-            continue
-
-        # Define o nome esperado do arquivo de áudio
-        safe_timestamp_str = segment['start_time_str'].replace(':', '_')
-        audio_filename = f"segment_{segment['id']:03d}_{safe_timestamp_str}.mp3"
-        audio_path = os.path.join(output_dir, audio_filename)
-        segment["audio_file_path"] = audio_path # Define o caminho esperado
-
-        if os.path.exists(audio_path):
-            print(f"  Segmento {segment['id']}: Arquivo de áudio já existe em '{audio_path}'. Pulando geração TTS.")
-            # Mesmo que o arquivo exista, tentamos obter/confirmar sua duração
-            try:
-                audio_segment_obj = AudioSegment.from_mp3(audio_path)
-                segment["audio_duration_sec"] = len(audio_segment_obj) / 1000.0
-                print(f"    Duração do áudio existente: {segment['audio_duration_sec']:.2f}s")
-            except CouldntDecodeError:
-                print(f"    AVISO: pydub não conseguiu decodificar o arquivo existente '{audio_path}'. Verifique FFmpeg/arquivo.")
-                segment["audio_duration_sec"] = None
-            except Exception as e_pydub:
-                print(f"    AVISO: Erro ao obter duração do áudio existente {audio_filename} (pydub): {e_pydub}")
-                segment["audio_duration_sec"] = None
-        else:
-            # Arquivo não existe, então geramos
-            print(f"  Segmento {segment['id']}: Gerando áudio para '{audio_path}'...")
-            try:
-                tts = gTTS(text=segment["text_pt"], lang=TARGET_LANGUAGE, slow=False)
-                tts.save(audio_path)
-                print(f"    Áudio salvo em '{audio_path}'")
-
-                # Obter duração do áudio recém-gerado
-                try:
-                    audio_segment_obj = AudioSegment.from_mp3(audio_path)
-                    segment["audio_duration_sec"] = len(audio_segment_obj) / 1000.0
-                    print(f"    Duração do áudio gerado: {segment['audio_duration_sec']:.2f}s")
-                except CouldntDecodeError:
-                    print(f"    AVISO: pydub não conseguiu decodificar o arquivo gerado '{audio_path}'. Verifique FFmpeg/arquivo.")
-                    segment["audio_duration_sec"] = None
-                except Exception as e_pydub:
-                    print(f"    AVISO: Erro ao obter duração do áudio gerado {audio_filename} (pydub): {e_pydub}")
-                    segment["audio_duration_sec"] = None
-
-            except Exception as e_tts:
-                print(f"  ERRO no TTS para segmento {segment['id']}: {e_tts}")
-                segment["audio_file_path"] = None # Garante que não tentará tocar um arquivo que falhou na criação
-                segment["audio_duration_sec"] = None
+        try:
+            generate_tts_for_segment(segment, output_dir, cache, durations)
+        except Exception as e_tts:
+            on_tts_error(segment, e_tts)
 
     print("--- Geração/Verificação de Áudio Concluída ---")
     return segments
 
+def translate_and_generate_tts_concurrently(segments, output_dir, cache=None, durations=None):
+    """
+    Tradução e TTS em pipeline: cada segmento segue para o TTS assim que é traduzido,
+    enquanto os próximos ainda estão sendo traduzidos. Cada etapa tem pool de threads,
+    limite de taxa e novas tentativas com backoff; os segmentos voltam na ordem original.
+    """
+    print("\n--- Iniciando Tradução + TTS (concorrente) ---")
+    os.makedirs(output_dir, exist_ok=True)
+    stages = [
+        Stage("traducao", lambda segment: translate_segment(segment, cache), workers=TRANSLATION_WORKERS,
+              rate_limit=TRANSLATION_RATE_LIMIT, on_error=on_translation_error),
+        Stage("tts", lambda segment: generate_tts_for_segment(segment, output_dir, cache, durations), workers=TTS_WORKERS,
+              rate_limit=TTS_RATE_LIMIT, on_error=on_tts_error),
+    ]
+    start = time.perf_counter()
+    results = Pipeline(stages).run_all(segments)
+    print(f"--- Tradução + TTS Concluídos em {time.perf_counter() - start:.2f}s ---")
+    for stage in stages:
+        print(f"  {stage!r}")
+    return results
+
 def simulate_synchronized_playback(segments):
     """Simula a reprodução dos áudios sincronizados com os timestamps, com lógica de tempo aprimorada."""
     print("\n--- Iniciando Simulação de Playback Sincronizado com Áudio Real ---")
@@ -234,17 +307,38 @@ def simulate_synchronized_playback(segments):
 # --- Execução Principal ---
 if __name__ == "__main__":
     print("### INICIANDO PROCESSO DE DUBLAGEM COM ÁUDIO REAL (SIMULADO) ###")
-    transcript_data = get_transcript_content(TRANSCRIPT_FILE_PATH)
-    if transcript_data:
-        parsed_segments = segment_transcript(transcript_data)
-        if not parsed_segments:
+    if os.path.exists(TRANSCRIPT_FILE_PATH):
+        # Gerador: no modo concorrente a tradução começa no primeiro segmento lido.
+        parsed_segments = stream_transcript(TRANSCRIPT_FILE_PATH, TRANSCRIPT_CHUNK_SIZE,
+                                            UNTIMED_SEGMENT_CHARS, UNTIMED_WORDS_PER_SECOND)
+        os.makedirs(OUTPUT_AUDIO_DIR, exist_ok=True)
+        durations_index = os.path.join(OUTPUT_AUDIO_DIR, DURATIONS_INDEX_FILE)
+        with ContentCache(CACHE_DIR, CACHE_MAX_BYTES) as cache, DurationIndex(durations_index, PROBE_WORKERS) as durations:
+            # Mede de uma vez (em paralelo) os áudios já existentes que ainda não estão no índice.
+            existing_audio = [os.path.join(OUTPUT_AUDIO_DIR, name) for name in os.listdir(OUTPUT_AUDIO_DIR) if name.endswith(".mp3")]
+            durations.probe_many(existing_audio)
+            if CONCURRENT_PIPELINE:
+                segments_with_audio = translate_and_generate_tts_concurrently(parsed_segments, OUTPUT_AUDIO_DIR, cache, durations)
+            else:
+                parsed_segments = list(parsed_segments)
+                translated_segments = translate_segments(parsed_segments, cache) # Tradução primeiro
+                segments_with_audio = generate_tts_for_segments(translated_segments, OUTPUT_AUDIO_DIR, cache, durations) # Depois TTS/verificação
+            print(f"Cache: {cache.stats()}")
+        if not segments_with_audio:
             print("Nenhum segmento válido encontrado na transcrição.")
         else:
-            print(f"\n{len(parsed_segments)} segmentos parseados.")
-            translated_segments = translate_segments(parsed_segments) # Tradução primeiro
-            segments_with_audio = generate_tts_for_segments(translated_segments, OUTPUT_AUDIO_DIR) # Depois TTS/verificação
-            simulate_synchronized_playback(segments_with_audio)
+            print(f"\n{len(segments_with_audio)} segmentos processados.")
+            if RENDER_OFFLINE:
+                print("\n--- Renderizando Faixa Dublada ---")
+                render_stats = render_timeline(segments_with_audio, RENDERED_AUDIO_PATH, workers=RENDER_WORKERS)
+                print(f"  {render_stats['rendered']} segmentos mixados ({render_stats['stretched']} acelerados, "
+                      f"{render_stats['skipped']} ignorados): {render_stats['duration_sec']:.1f}s de áudio "
+                      f"em {render_stats['elapsed_sec']:.1f}s.")
+                print(f"Faixa dublada salva em: '{os.path.abspath(RENDERED_AUDIO_PATH)}'")
+            else:
+                simulate_synchronized_playback(segments_with_audio)
             print("\nProcesso finalizado.")
             print(f"Os arquivos de áudio estão em: '{os.path.abspath(OUTPUT_AUDIO_DIR)}'")
     else:
+        print(f"ERRO: Arquivo de transcrição não encontrado em '{TRANSCRIPT_FILE_PATH}'.")
         print("Não foi possível carregar os dados da transcrição. Encerrando.")
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Leitura incremental (em streaming) de transcrições.
+
+O arquivo é lido em blocos e cada segmento é entregue assim que o próximo timestamp
+aparece, então a tradução do primeiro segmento começa antes de o resto do arquivo ser
+lido e a memória usada não depende do tamanho da transcrição (horas de vídeo).
+
+Dois formatos são aceitos:
+    - Com marcação de tempo ("00:00:01 texto 00:00:02 texto ..."): cada timestamp abre
+      um segmento que vai até o próximo (mesmo resultado do antigo regex com DOTALL).
+    - Sem marcação de tempo (ex: `data/transcricao_video.txt`): o texto é dividido em
+      segmentos de até `max_chars` caracteres (de preferência no fim de uma frase) e os
+      tempos são estimados pela velocidade de fala `words_per_second`.
+
+O formato é detectado pelos primeiros `DETECTION_CHARS` caracteres.
+
+Usage:
+    >>> for segment in stream_transcript("data/transcricao_video.txt"):
+    ...     print(segment["start_time_str"], segment["text_en"][:40])
+"""
+import re
+
+from datetime import timedelta
+from typing import Iterable, Iterator, Optional
+
+
+TIMESTAMP_PATTERN = re.compile(r"\d{2}:\d{2}:\d{2}")
+TIMESTAMP_LENGTH = 8
+DETECTION_CHARS = 4096
+SENTENCE_END = (".", "!", "?")
+
+
+def parse_timestamp(ts_str):
+    """Converte uma string de timestamp HH:MM:SS para um objeto timedelta."""
+    try:
+        h, m, s = map(int, ts_str.split(':'))
+        return timedelta(hours=h, minutes=m, seconds=s)
+    except ValueError:
+        print(f"AVISO: Timestamp inválido encontrado e ignorado: {ts_str}")
+        return None
+
+
+def format_timestamp(seconds: float) -> str:
+    """Formata segundos como HH:MM:SS (inverso de `parse_timestamp`)."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _segment(index, start_time_str, start_time_td, end_time_td, text_en) -> dict:
+    return {
+        "id": index, "start_time_str": start_time_str, "start_time_td": start_time_td,
+        "end_time_td": end_time_td, "text_en": text_en, "text_pt": None,
+        "audio_file_path": None, "audio_duration_sec": None
+    }
+
+
+def read_chunks(file_path: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Lê o arquivo em blocos de `chunk_size` caracteres."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _timed_segments(buffer: str, chunks: Iterator[str]) -> Iterator[dict]:
+    index = 0
+    current = None  # timestamp do segmento cujo texto está sendo lido
+    search_from = 0
+    while True:
+        position = 0
+        for match in TIMESTAMP_PATTERN.finditer(buffer, search_from):
+            if current is not None:
+                text_en = buffer[position:match.start()].strip()
+                start_time_td = parse_timestamp(current)
+                if start_time_td is not None and text_en:
+                    yield _segment(index, current, start_time_td, parse_timestamp(match.group()), text_en)
+                index += 1
+            current = match.group()
+            position = match.end()
+        # Só o texto ainda sem timestamp de fechamento fica no buffer. Um timestamp pode
+        # estar cortado entre dois blocos, então os últimos caracteres são buscados de novo.
+        buffer = buffer[position:] if current is not None else buffer[-(TIMESTAMP_LENGTH - 1):]
+        search_from = max(0, len(buffer) - (TIMESTAMP_LENGTH - 1))
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += chunk
+
+    if current is not None:
+        start_time_td = parse_timestamp(current)
+        text_en = buffer.strip()
+        if start_time_td is not None and text_en:
+            yield _segment(index, current, start_time_td, None, text_en)
+
+
+def _untimed_segments(buffer: str, chunks: Iterator[str], max_chars: int,
+                      words_per_second: float) -> Iterator[dict]:
+    index = 0
+    words_before = 0  # palavras já faladas antes do segmento atual
+    words, size = [], 0
+
+    def emit():
+        start = words_before / words_per_second
+        end = (words_before + len(words)) / words_per_second
+        return _segment(index, format_timestamp(start), timedelta(seconds=start), timedelta(seconds=end),
+                        " ".join(words))
+
+    while True:
+        chunk = next(chunks, None)
+        parts = buffer.split()
+        # A última palavra pode continuar no próximo bloco.
+        if chunk is not None and parts and not buffer[-1].isspace():
+            buffer = parts.pop()
+        else:
+            buffer = ""
+        for word in parts:
+            if words and size + 1 + len(word) > max_chars:
+                yield emit()
+                index += 1
+                words_before += len(words)
+                words, size = [], 0
+            words.append(word)
+            size += len(word) + (1 if size else 0)
+            # Prefere fechar o segmento no fim de uma frase, se ele já tiver um bom tamanho.
+            if size >= max_chars // 2 and word.endswith(SENTENCE_END):
+                yield emit()
+                index += 1
+                words_before += len(words)
+                words, size = [], 0
+        if chunk is None:
+            break
+        buffer += chunk
+
+    if words:
+        yield emit()
+
+
+def iter_segments(chunks: Iterable[str], max_chars: int = 400, words_per_second: float = 2.5) -> Iterator[dict]:
+    """
+    Segmenta uma transcrição entregue em blocos de texto, sem juntar o texto todo.
+
+    Args:
+        chunks (Iterable[str]): Blocos consecutivos da transcrição.
+        max_chars (int): Tamanho máximo de um segmento de texto sem marcação de tempo.
+        words_per_second (float): Velocidade de fala usada para estimar os tempos
+                                  do texto sem marcação de tempo.
+
+    Yields:
+        dict: Segmentos no mesmo formato de `segment_transcript`.
+    """
+    chunks = iter(chunks)
+    buffer = ""
+    while len(buffer) < DETECTION_CHARS:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += chunk
+    if TIMESTAMP_PATTERN.search(buffer):
+        return _timed_segments(buffer, chunks)
+    return _untimed_segments(buffer, chunks, max_chars, words_per_second)
+
+
+def stream_transcript(file_path: str, chunk_size: int = 64 * 1024, max_chars: int = 400,
+                      words_per_second: float = 2.5) -> Iterator[dict]:
+    """
+    Gerador de segmentos lidos do arquivo em blocos de `chunk_size` caracteres
+    (ver `iter_segments`).
+    """
+    yield from iter_segments(read_chunks(file_path, chunk_size), max_chars, words_per_second)
+
+
+def segment_transcript(transcript_content: Optional[str], **kwargs) -> list:
+    """Segmenta a transcrição já carregada em memória."""
+    if not transcript_content:
+        return []
+    return list(iter_segments([transcript_content], **kwargs))
@@ -0,0 +1,52 @@
+"""
+Benchmark do backward do engine em grafos profundos.
+
+Constrói uma cadeia de `n` nós (x = x * a + b repetidamente) e mede o tempo do
+backward com a ordem topológica iterativa e com a fita (Tape).
+
+Execute a partir de `notekooks/`:
+    python -m learn.benchmarks.bench_backward [numero_de_nos]
+"""
+import sys
+import time
+
+from learn.toolkit.engine import Tape, Value
+
+
+def build_chain(number_nodes: int) -> Value:
+    """
+    Constrói uma cadeia com aproximadamente `number_nodes` nós Value.
+    """
+    a = Value(0.5, label="a")
+    b = Value(0.1, label="b")
+    x = Value(1.0, label="x")
+    # Cada iteração cria 2 nós: a multiplicação e a soma.
+    for _ in range(number_nodes // 2):
+        x = x * a + b
+    return x
+
+
+def run(number_nodes: int = 10**6):
+    start = time.perf_counter()
+    root = build_chain(number_nodes)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root.backward()
+    backward_time = time.perf_counter() - start
+    print(f"iterativo: build {build_time:.2f}s | backward {backward_time:.2f}s")
+    del root
+
+    with Tape() as tape:
+        start = time.perf_counter()
+        root = build_chain(number_nodes)
+        build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root.backward(tape=tape)
+    backward_time = time.perf_counter() - start
+    print(f"tape:      build {build_time:.2f}s | backward {backward_time:.2f}s ({len(tape)} nós)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
@@ -0,0 +1,71 @@
+"""
+Benchmark do modo direto (números duais) contra o modo reverso (grafo de `Value`).
+
+Para cada arquitetura, mede o tempo de calcular a Jacobiana das saídas em relação
+às entradas de um MLP:
+    - reverso: um forward que monta o grafo + um backward por saída;
+    - direto (jvp): um forward de `Dual` por entrada;
+    - direto (vetorizado): um único forward com tangentes np.ndarray.
+
+Execute a partir de `notekooks/`:
+    python -m learn.benchmarks.bench_forward_ad [repeticoes]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from learn.toolkit.forward_ad import Dual, mlp_forward, mlp_input_jacobian
+from learn.toolkit.functional import jacobian as reverse_jacobian
+from learn.toolkit.nn import MLP
+
+
+ARCHITECTURES = [
+    (2, [3, 3, 1]),
+    (2, [16, 16, 1]),
+    (4, [32, 32, 8]),
+    (64, [32, 32, 1]),
+]
+
+
+def _forward_jvp_jacobian(mlp: MLP, x):
+    columns = []
+    for i in range(len(x)):
+        outputs = mlp_forward(mlp, [Dual(xj, 1.0 if j == i else 0.0) for j, xj in enumerate(x)])
+        outputs = outputs if isinstance(outputs, list) else [outputs]
+        columns.append([o.tangent for o in outputs])
+    return np.array(columns).T
+
+
+def _best(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(repeats: int = 5):
+    random.seed(0)
+    print(f"{'arquitetura':<20} {'reverso ms':>12} {'jvp ms':>12} {'vetorizado ms':>14} {'erro máx':>10}")
+    for number_inputs, outputs in ARCHITECTURES:
+        mlp = MLP(number_inputs, outputs)
+        x = list(np.random.default_rng(0).standard_normal(number_inputs))
+
+        reverse = reverse_jacobian(lambda inputs: mlp(inputs), x)
+        forward = mlp_input_jacobian(mlp, x)
+        error = float(np.max(np.abs(reverse - forward)))
+        assert np.allclose(_forward_jvp_jacobian(mlp, x), forward)
+
+        reverse_time = _best(lambda: reverse_jacobian(lambda inputs: mlp(inputs), x), repeats)
+        jvp_time = _best(lambda: _forward_jvp_jacobian(mlp, x), repeats)
+        vectorized_time = _best(lambda: mlp_input_jacobian(mlp, x), repeats)
+        name = f"{number_inputs}x" + "x".join(map(str, outputs))
+        print(f"{name:<20} {reverse_time * 1000:>12.3f} {jvp_time * 1000:>12.3f} "
+              f"{vectorized_time * 1000:>14.3f} {error:>10.2e}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,73 @@
+"""
+Benchmark de memória por nó do grafo.
+
+Compara o `Value` atual (slots, filhos em tupla, backward por código de operação)
+com uma reprodução do layout anterior (`__dict__`, `set` de filhos, rótulo em
+f-string e uma closure por nó), medindo bytes alocados por nó com tracemalloc.
+
+Execute a partir de `notekooks/`:
+    python -m learn.benchmarks.bench_memory [numero_de_nos]
+"""
+import sys
+import tracemalloc
+
+from learn.toolkit.engine import Value
+
+
+class LegacyValue:
+    """
+    Layout de nó anterior ao uso de `__slots__`, mantido apenas para comparação.
+    """
+
+    def __init__(self, data, _children=(), _op='', label=''):
+        self.data = data
+        self.grad = 0.0
+        self._backward = lambda: None
+        self._prev = set(_children)
+        self._op = _op
+        self.label = label
+
+    def __add__(self, other):
+        out = LegacyValue(self.data + other.data, (self, other), '+', label=f"add {len(self._prev)}")
+
+        def _backward():
+            self.grad += out.grad
+            other.grad += out.grad
+        out._backward = _backward
+        return out
+
+    def __mul__(self, other):
+        out = LegacyValue(self.data * other.data, (self, other), '*', label=f"mul {len(self._prev)}")
+
+        def _backward():
+            self.grad += other.data * out.grad
+            other.grad += self.data * out.grad
+        out._backward = _backward
+        return out
+
+
+def bytes_per_node(value_class, number_nodes: int) -> float:
+    """
+    Constrói uma cadeia de `number_nodes` nós e retorna a memória alocada por nó.
+    """
+    a = value_class(0.5)
+    b = value_class(0.1)
+    tracemalloc.start()
+    x = value_class(1.0)
+    for _ in range(number_nodes // 2):
+        x = x * a + b
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / number_nodes
+
+
+def run(number_nodes: int = 10**5):
+    before = bytes_per_node(LegacyValue, number_nodes)
+    after = bytes_per_node(Value, number_nodes)
+    print(f"antes (dict + set + closure): {before:.1f} bytes/nó")
+    print(f"depois (slots + tupla + opcode): {after:.1f} bytes/nó")
+    print(f"redução: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10**5)
@@ -0,0 +1,41 @@
+"""
+Benchmark de escalabilidade do DataParallelTrainer.
+
+Treina o mesmo MLP com 1, 2, 4 e 8 processos e reporta amostras por segundo.
+O ganho depende do número de núcleos da máquina.
+
+Execute a partir de `notekooks/`:
+    python -m learn.benchmarks.bench_parallel [tamanho_do_lote] [passos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from learn.toolkit.nn import MLP
+from learn.toolkit.optim import SGD
+from learn.toolkit.parallel import DataParallelTrainer
+
+
+def run(batch_size: int = 8192, steps: int = 10, list_workers=(1, 2, 4, 8)):
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((batch_size, 64))
+    y = rng.integers(0, 10, size=batch_size)
+
+    for number_workers in list_workers:
+        mlp = MLP(64, [256, 256, 10], flat=True)
+        with DataParallelTrainer(mlp, SGD(mlp, learning_rate=0.01), loss="cross_entropy",
+                                 number_workers=number_workers) as trainer:
+            trainer.step(x, y)  # aquecimento (inicialização dos processos)
+            start = time.perf_counter()
+            for _ in range(steps):
+                loss = trainer.step(x, y)
+            elapsed = time.perf_counter() - start
+        print(f"{number_workers} processo(s): {steps * batch_size / elapsed:10.0f} amostras/s | perda {loss:.4f}")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8192,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,278 @@
+"""
+Suíte de benchmarks dos caminhos críticos do toolkit (engine, nn e utils).
+
+Cada caso é medido várias vezes (guarda-se o melhor tempo) e uma vez com
+tracemalloc (pico de memória). Casos rápidos rodam em laço até cada medição durar
+`--min-time` segundos, para que o ruído do timer não apareça como regressão. O
+resultado é acrescentado a um histórico JSON e comparado com um baseline salvo;
+casos mais lentos que o limite são sinalizados e o processo termina com código 1.
+
+Execute a partir de `notekooks/`:
+    python -m learn.benchmarks.suite                    # roda e compara com o baseline
+    python -m learn.benchmarks.suite --save-baseline    # roda e grava como novo baseline
+    python -m learn.benchmarks.suite --quick --only mlp # subconjunto rápido
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from learn.toolkit.codegen import compile_graph
+from learn.toolkit.engine import Value
+from learn.toolkit.losses import mse_loss
+from learn.toolkit.nn import MLP
+from learn.toolkit.utils import draw_dot, update_mlp
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, "history.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# Um caso é (nome, preparação); a preparação retorna a função medida (sem argumentos).
+Case = Tuple[str, Callable[[], Callable[[], object]]]
+
+# Sob tracemalloc, cada alocação procura a linha do código, o que fica caro numa função
+# gerada de dezenas de milhares de linhas (o caso codegen do maior formato levaria uma
+# hora). Esses casos só alocam floats temporários, então o pico de memória não é medido.
+UNTRACED_PREFIXES = ("codegen/",)
+
+
+def _graph_construction(number_nodes: int):
+    def run():
+        x = Value(1.0)
+        a = Value(0.5)
+        for _ in range(number_nodes // 2):
+            x = x * a + 0.1
+        return x
+    return run
+
+
+def _backward_deep(number_nodes: int):
+    root = _graph_construction(number_nodes)()
+    return root.backward
+
+
+def _backward_wide(width: int):
+    xs = [Value(random.uniform(-1, 1)) for _ in range(width)]
+    ws = [Value(random.uniform(-1, 1)) for _ in range(width)]
+    root = sum((w * x for w, x in zip(ws, xs)), Value(0.0)).tanh()
+    return root.backward
+
+
+def _mlp_scalar(shape: List[int], batch_size: int):
+    random.seed(0)
+    mlp = MLP(shape[0], shape[1:])
+    x = np.random.default_rng(0).standard_normal((batch_size, shape[0]))
+    rows = [list(row) for row in x]
+
+    def run():
+        # Com várias saídas, o MLP retorna uma lista; o alvo é 1.0 em todas elas.
+        outputs = [out if isinstance(out, list) else [out] for out in map(mlp, rows)]
+        loss = sum((o - 1.0) ** 2 for out in outputs for o in out)
+        loss.backward()
+        mlp.zero_grad()
+    return run
+
+
+def _mlp_batched(shape: List[int], batch_size: int, flat: bool):
+    random.seed(0)
+    mlp = MLP(shape[0], shape[1:], flat=flat)
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((batch_size, shape[0]))
+    y = rng.standard_normal((batch_size, shape[-1]))
+
+    def run():
+        loss = mse_loss(mlp(x), y)
+        loss.backward()
+        mlp.zero_grad()
+    return run
+
+
+_COMPILED: Dict[Tuple[int, ...], tuple] = {}
+
+
+def _codegen_forward(shape: List[int], batch_size: int):
+    # A compilação (segundos no maior formato) não faz parte da medição e a preparação
+    # roda a cada repetição, então a função gerada é reaproveitada por formato.
+    if tuple(shape) not in _COMPILED:
+        random.seed(0)
+        mlp = MLP(shape[0], shape[1:])
+        inputs = [Value(0.0) for _ in range(shape[0])]
+        fn = compile_graph(mlp(inputs), inputs, mlp.parameters(), cache_dir=None)
+        _COMPILED[tuple(shape)] = (fn, [p.data for p in mlp.parameters()])
+    fn, params = _COMPILED[tuple(shape)]
+    rows = np.random.default_rng(0).standard_normal((batch_size, shape[0])).tolist()
+
+    def run():
+        for row in rows:
+            fn(row, params)
+    return run
+
+
+def _update(shape: List[int], flat: bool):
+    mlp = MLP(shape[0], shape[1:], flat=flat)
+    return lambda: update_mlp(mlp, 0.01)
+
+
+def _draw_dot(width: int):
+    root = _backward_wide(width).__self__
+    return lambda: draw_dot(root).source
+
+
+def build_cases(quick: bool) -> List[Case]:
+    scale = 1 if quick else 10
+    shapes = [[2, 16, 16, 1], [16, 64, 64, 1]] if quick else [[2, 16, 16, 1], [16, 64, 64, 1], [64, 128, 128, 10]]
+    cases: List[Case] = [
+        (f"engine/construction/{10_000 * scale}", lambda: _graph_construction(10_000 * scale)),
+        (f"engine/backward_deep/{10_000 * scale}", lambda: _backward_deep(10_000 * scale)),
+        (f"engine/backward_wide/{5_000 * scale}", lambda: _backward_wide(5_000 * scale)),
+    ]
+    for shape in shapes:
+        name = "x".join(map(str, shape))
+        cases.append((f"mlp/scalar/{name}/batch8", lambda shape=shape: _mlp_scalar(shape, 8)))
+        for batch_size in (32, 256 * scale):
+            cases.append((f"mlp/batched/{name}/batch{batch_size}",
+                          lambda shape=shape, b=batch_size: _mlp_batched(shape, b, flat=False)))
+            cases.append((f"mlp/batched_flat/{name}/batch{batch_size}",
+                          lambda shape=shape, b=batch_size: _mlp_batched(shape, b, flat=True)))
+        cases.append((f"codegen/forward/{name}/batch256", lambda shape=shape: _codegen_forward(shape, 256)))
+        cases.append((f"utils/update_mlp/{name}", lambda shape=shape: _update(shape, flat=False)))
+        cases.append((f"utils/update_mlp_flat/{name}", lambda shape=shape: _update(shape, flat=True)))
+    try:
+        import graphviz  # noqa: F401
+        cases.append((f"utils/draw_dot/{200 * scale}", lambda: _draw_dot(200 * scale)))
+    except ImportError:
+        print("AVISO: 'graphviz' não instalado; o caso draw_dot será ignorado.")
+    return cases
+
+
+def measure(setup: Callable[[], Callable[[], object]], repeats: int, min_time: float = 0.0,
+            trace_memory: bool = True) -> Dict[str, float]:
+    """
+    Retorna o melhor tempo (s) por execução entre `repeats` medições e o pico de
+    memória (bytes) de uma execução extra sob tracemalloc (0 se `trace_memory` é False).
+
+    Cada medição roda a função `loops` vezes seguidas, com `loops` escolhido para que
+    a medição dure pelo menos `min_time` segundos, e com o coletor de lixo desligado
+    (como no `timeit`), para que uma coleta não caia dentro de uma medição só.
+    """
+    fn = setup()
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    loops = max(1, math.ceil(min_time / first)) if first > 0 else 1
+
+    times = []
+    for _ in range(repeats):
+        fn = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            times.append((time.perf_counter() - start) / loops)
+        finally:
+            gc.enable()
+    if not trace_memory:
+        return {"time_s": min(times), "peak_bytes": 0}
+
+    fn = setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time_s": min(times), "peak_bytes": peak}
+
+
+def _load(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _dump(path: str, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """
+    Lista os casos cujo tempo ou pico de memória pioraram mais que `threshold` (ex: 0.2 = 20%).
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ("time_s", "peak_bytes"):
+            if reference[metric] > 0 and result[metric] > reference[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {reference[metric]:.4g} -> {result[metric]:.4g} "
+                                   f"({result[metric] / reference[metric]:.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="tamanhos menores, para uma checagem rápida")
+    parser.add_argument("--only", default="", help="roda apenas os casos cujo nome contém este texto")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="duração mínima (s) de cada medição; casos rápidos rodam em laço")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora tolerada antes de sinalizar (0.2 = 20%%)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup in build_cases(args.quick):
+        if args.only not in name:
+            continue
+        results[name] = measure(setup, args.repeats, args.min_time,
+                                trace_memory=not name.startswith(UNTRACED_PREFIXES))
+        print(f"{name:<45} {results[name]['time_s'] * 1000:>10.2f} ms {results[name]['peak_bytes'] / 2**20:>9.2f} MiB")
+
+    run = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": results,
+    }
+    history = _load(args.history) or []
+    history.append(run)
+    _dump(args.history, history)
+
+    if args.save_baseline:
+        _dump(args.baseline, results)
+        print(f"Baseline salvo em '{args.baseline}'.")
+        return 0
+
+    baseline = _load(args.baseline)
+    if baseline is None:
+        print("Nenhum baseline encontrado; use --save-baseline para criar um.")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\nREGRESSÕES:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNenhuma regressão em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
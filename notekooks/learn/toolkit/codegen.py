@@ -0,0 +1,327 @@
+import hashlib
+import importlib.util
+import math
+import os
+import sys
+
+from typing import Dict, List, Optional, Sequence, Union
+
+from learn.toolkit.engine import (
+    Value, is_constant, topological_order,
+    OP_LEAF, OP_ADD, OP_MUL, OP_POW, OP_RELU, OP_TANH, OP_EXP, OP_LOG, OP_LINEAR, OP_SUB, OP_DIV,
+)
+from learn.toolkit.simplify import simplify
+
+
+# Versão do gerador: entra na chave do cache, invalidando o código gerado antigo.
+CODEGEN_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "learn-toolkit", "codegen")
+
+BACKENDS = ('python', 'numpy')
+
+
+class CompiledFunction:
+    """
+    Função gerada a partir de um grafo de `Value`: código Python em linha reta
+    (uma atribuição por nó), sem nenhum objeto `Value` na execução.
+
+    As entradas são passadas a cada chamada; os parâmetros (ex: pesos de um MLP)
+    têm o `.data` relido a cada chamada, então o código continua válido depois de
+    um passo de treino. As demais folhas são constantes embutidas no código.
+
+    Usage:
+        >>> fn = compile_graph(loss, inputs=xs, parameters=mlp.parameters())
+        >>> (y,) = fn([0.5, -1.0])
+        >>> outputs, grad_x, grad_p = fn.gradient([0.5, -1.0])
+    """
+
+    def __init__(self, module, parameters: Sequence[Value], key: str, path: Optional[str]):
+        self._forward = module.forward
+        self._gradient = module.gradient
+        self.source = module.SOURCE
+        self.number_outputs = module.NUMBER_OUTPUTS
+        self.parameters = list(parameters)
+        self.key = key
+        self.path = path
+
+    def _params(self, params):
+        return [p.data for p in self.parameters] if params is None else params
+
+    def __call__(self, x: Sequence, params: Optional[Sequence] = None) -> tuple:
+        """
+        Calcula as saídas para as entradas `x`.
+
+        Args:
+            x (Sequence): Um valor por entrada (floats; no backend 'numpy', também arrays
+                          de mesmo formato, ex: uma coluna de um lote).
+            params (Sequence, optional): Valores dos parâmetros (default: o `.data` atual).
+        """
+        return self._forward(x, self._params(params))
+
+    def gradient(self, x: Sequence, seeds: Union[float, Sequence] = 1.0, params: Optional[Sequence] = None):
+        """
+        Calcula as saídas e os gradientes de sum_k seeds[k] * saída[k] em relação às
+        entradas e aos parâmetros. No backend 'numpy' com entradas em lote, os
+        gradientes são por amostra (some no eixo do lote para o gradiente do lote).
+
+        Returns:
+            (tuple, list, list): saídas, gradientes das entradas e dos parâmetros.
+        """
+        if isinstance(seeds, (int, float)):
+            seeds = [seeds] * self.number_outputs
+        return self._gradient(x, self._params(params), seeds)
+
+
+def _graph_order(outputs: List[Value]) -> List[Value]:
+    order, seen = [], set()
+    for out in outputs:
+        for node in topological_order(out):
+            if id(node) not in seen:
+                seen.add(id(node))
+                order.append(node)
+    return order
+
+
+def _graph_key(order: List[Value], outputs: List[Value], inputs: Sequence[Value],
+               parameters: Sequence[Value], backend: str) -> str:
+    """
+    Hash estrutural do grafo: operações, ligações, argumentos e constantes (mas não
+    os valores de entradas e parâmetros, que chegam a cada chamada).
+
+    O código gerado tem um slot de gradiente por entrada e por parâmetro, então a
+    assinatura entra no hash inteira: quantidades e a posição de cada um no grafo
+    (None para os que o grafo não usa).
+    """
+    slots = {id(node): i for i, node in enumerate(order)}
+    roles = {id(x): ('x', k) for k, x in enumerate(inputs)}
+    roles.update({id(p): ('p', k) for k, p in enumerate(parameters)})
+    digest = hashlib.sha256(f"{CODEGEN_VERSION}|{backend}|{len(inputs)}|{len(parameters)}|".encode())
+    digest.update(repr([slots.get(id(x)) for x in inputs]).encode())
+    digest.update(repr([slots.get(id(p)) for p in parameters]).encode())
+    for node in order:
+        if node._code == OP_LEAF:
+            entry = roles.get(id(node), ('c', repr(float(node.data))))
+        else:
+            arg = node._arg[:2] if node._code == OP_LINEAR else node._arg
+            entry = (node._code, tuple(slots[id(c)] for c in node._prev), repr(arg))
+        digest.update(repr(entry).encode())
+    digest.update(repr([slots[id(out)] for out in outputs]).encode())
+    return digest.hexdigest()[:32]
+
+
+def _generate(order: List[Value], outputs: List[Value], inputs: Sequence[Value],
+              parameters: Sequence[Value], backend: str) -> str:
+    """
+    Gera o código-fonte de `forward(x, p)` e `gradient(x, p, seeds)`.
+    """
+    numpy = backend == 'numpy'
+    slots = {id(node): i for i, node in enumerate(order)}
+    input_index = {id(x): k for k, x in enumerate(inputs)}
+    param_index = {id(p): k for k, p in enumerate(parameters)}
+
+    forward: List[str] = []
+    for i, node in enumerate(order):
+        code = node._code
+        c = [slots[id(child)] for child in node._prev]
+        if code == OP_LEAF:
+            if id(node) in input_index:
+                forward.append(f"v{i} = x[{input_index[id(node)]}]")
+            elif id(node) in param_index:
+                forward.append(f"v{i} = p[{param_index[id(node)]}]")
+            else:
+                forward.append(f"v{i} = {float(node.data)!r}")
+        elif code == OP_ADD:
+            forward.append(f"v{i} = v{c[0]} + v{c[1]}")
+        elif code == OP_SUB:
+            forward.append(f"v{i} = v{c[0]} - v{c[1]}")
+        elif code == OP_MUL:
+            forward.append(f"v{i} = v{c[0]} * v{c[1]}")
+        elif code == OP_DIV:
+            forward.append(f"v{i} = v{c[0]} / v{c[1]}")
+        elif code == OP_POW:
+            forward.append(f"v{i} = v{c[0]} ** {node._arg!r}")
+        elif code == OP_RELU:
+            forward.append(f"v{i} = _np.maximum(v{c[0]}, 0.0)" if numpy else f"v{i} = v{c[0]} if v{c[0]} > 0 else 0.0")
+        elif code == OP_TANH:
+            forward.append(f"v{i} = {'_np' if numpy else '_math'}.tanh(v{c[0]})")
+        elif code == OP_EXP:
+            forward.append(f"v{i} = {'_np' if numpy else '_math'}.exp(v{c[0]})")
+        elif code == OP_LOG:
+            scale = "" if node._arg == math.e else f" / {math.log(node._arg)!r}"
+            forward.append(f"v{i} = {'_np' if numpy else '_math'}.log(v{c[0]}){scale}")
+        elif code == OP_LINEAR:
+            n, activation = node._arg[:2]
+            terms = " + ".join(f"v{c[k]} * v{c[n + k]}" for k in range(1, n + 1))
+            forward.append(f"s{i} = v{c[0]} + {terms}" if n else f"s{i} = v{c[0]}")
+            if activation == 'relu':
+                forward.append(f"v{i} = _np.maximum(s{i}, 0.0)" if numpy else f"v{i} = s{i} if s{i} > 0 else 0.0")
+            elif activation == 'tanh':
+                forward.append(f"v{i} = {'_np' if numpy else '_math'}.tanh(s{i})")
+            else:
+                forward.append(f"v{i} = s{i}")
+        else:
+            raise ValueError(f"Operação '{node._op}' não suportada pelo gerador de código.")
+
+    out_slots = [slots[id(out)] for out in outputs]
+    outputs_tuple = "(" + "".join(f"v{s}, " for s in out_slots) + ")"
+
+    # Backward em linha reta: cada gradiente é atribuído na primeira contribuição
+    # e acumulado nas seguintes; nós que não recebem gradiente não geram código.
+    backward: List[str] = []
+    assigned = set()
+    constants = {slots[id(node)] for node in order if is_constant(node) or
+                 (node._code == OP_LEAF and id(node) not in input_index and id(node) not in param_index)}
+
+    def accumulate(slot: int, expression: str):
+        if slot in constants:
+            return
+        if slot in assigned:
+            backward.append(f"g{slot} = g{slot} + {expression}")
+        else:
+            backward.append(f"g{slot} = {expression}")
+            assigned.add(slot)
+
+    for k, slot in enumerate(out_slots):
+        accumulate(slot, f"seeds[{k}]")
+    for i in range(len(order) - 1, -1, -1):
+        node = order[i]
+        if node._code == OP_LEAF or i not in assigned:
+            continue
+        code = node._code
+        c = [slots[id(child)] for child in node._prev]
+        g = f"g{i}"
+        if code == OP_ADD:
+            accumulate(c[0], g)
+            accumulate(c[1], g)
+        elif code == OP_SUB:
+            accumulate(c[0], g)
+            accumulate(c[1], f"-{g}")
+        elif code == OP_MUL:
+            accumulate(c[0], f"{g} * v{c[1]}")
+            accumulate(c[1], f"{g} * v{c[0]}")
+        elif code == OP_DIV:
+            accumulate(c[0], f"{g} / v{c[1]}")
+            accumulate(c[1], f"-{g} * v{c[0]} / v{c[1]} ** 2")
+        elif code == OP_POW:
+            n = node._arg
+            accumulate(c[0], f"{g} * {n!r} * v{c[0]} ** {n - 1!r}")
+        elif code == OP_RELU:
+            accumulate(c[0], f"{g} * (v{c[0]} >= 0)" if numpy else f"({g} if v{c[0]} >= 0 else 0.0)")
+        elif code == OP_TANH:
+            accumulate(c[0], f"{g} * (1 - v{i} ** 2)")
+        elif code == OP_EXP:
+            accumulate(c[0], f"{g} * v{i}")
+        elif code == OP_LOG:
+            accumulate(c[0], f"{g} / (v{c[0]} * {math.log(node._arg)!r})")
+        elif code == OP_LINEAR:
+            n, activation = node._arg[:2]
+            if activation == 'relu':
+                backward.append(f"t{i} = {g} * (s{i} >= 0)" if numpy else f"t{i} = {g} if s{i} >= 0 else 0.0")
+            elif activation == 'tanh':
+                backward.append(f"t{i} = {g} * (1 - v{i} ** 2)")
+            else:
+                backward.append(f"t{i} = {g}")
+            accumulate(c[0], f"t{i}")
+            for k in range(1, n + 1):
+                accumulate(c[k], f"t{i} * v{c[n + k]}")
+                accumulate(c[n + k], f"t{i} * v{c[k]}")
+
+    def grads_of(leaves: Sequence[Value]) -> str:
+        items = [f"g{slots[id(v)]}" if id(v) in slots and slots[id(v)] in assigned else "0.0" for v in leaves]
+        return "[" + ", ".join(items) + "]"
+
+    indent = "\n    "
+    lines = [
+        "# Código gerado por learn.toolkit.codegen; não edite.",
+        "import math as _math",
+        "import numpy as _np",
+        "",
+        f"NUMBER_OUTPUTS = {len(out_slots)}",
+        "",
+        "def forward(x, p):",
+        "    " + indent.join(forward),
+        f"    return {outputs_tuple}",
+        "",
+        "",
+        "def gradient(x, p, seeds):",
+        "    " + indent.join(forward),
+        "    " + indent.join(backward) if backward else "    pass",
+        f"    return {outputs_tuple}, {grads_of(inputs)}, {grads_of(parameters)}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _load(source: str, key: str, cache_dir: Optional[str]):
+    """
+    Carrega o módulo gerado. Com cache, o fonte fica em `<cache_dir>/<chave>.py` e o
+    bytecode é guardado pelo próprio Python em `__pycache__`.
+    """
+    name = f"learn_codegen_{key}"
+    if cache_dir is None:
+        module = type(sys)(name)
+        exec(compile(source, f"<codegen {key}>", "exec"), module.__dict__)
+        module.SOURCE = source
+        return module, None
+
+    path = os.path.join(cache_dir, f"{key}.py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with open(path, "r", encoding="utf-8") as file:
+        module.SOURCE = file.read()
+    return module, path
+
+
+# Funções já carregadas nesta sessão, por chave.
+_loaded: Dict[str, object] = {}
+
+
+def compile_graph(outputs: Union[Value, Sequence[Value]], inputs: Sequence[Value], parameters: Sequence[Value] = (),
+            backend: str = 'python', optimize: bool = True,
+            cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> CompiledFunction:
+    """
+    Gera (ou reaproveita do cache) o código Python/NumPy do forward e do gradiente
+    de um grafo de `Value` já traçado.
+
+    Args:
+        outputs (Value | Sequence[Value]): Saída(s) do grafo traçado.
+        inputs (Sequence[Value]): Folhas que viram argumentos da função.
+        parameters (Sequence[Value]): Folhas cujo `.data` é lido a cada chamada (pesos).
+        backend (str): 'python' (floats, módulo math) ou 'numpy' (aceita arrays).
+        optimize (bool): Passa o grafo por `simplify` antes de gerar o código.
+        cache_dir (str, optional): Pasta do cache em disco, com os fontes indexados pelo
+                                   hash do grafo. None desliga o cache em disco.
+
+    Usage:
+        >>> xs = [Value(0.0), Value(0.0)]
+        >>> fn = compile_graph(mlp(xs), inputs=xs, parameters=mlp.parameters())
+        >>> fn([0.5, -1.0])
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido '{backend}'. Opções: {BACKENDS}.")
+    outputs = [outputs] if isinstance(outputs, Value) else list(outputs)
+    if optimize:
+        outputs = simplify(outputs)
+    order = _graph_order(outputs)
+    key = _graph_key(order, outputs, inputs, parameters, backend)
+
+    module = _loaded.get(key)
+    path = None
+    if module is None:
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"{key}.py")
+            if not os.path.exists(path):
+                os.makedirs(cache_dir, exist_ok=True)
+                source = _generate(order, outputs, inputs, parameters, backend)
+                # Escrita atômica: outro processo pode estar lendo o mesmo cache.
+                temporary = f"{path}.{os.getpid()}.tmp"
+                with open(temporary, "w", encoding="utf-8") as file:
+                    file.write(source)
+                os.replace(temporary, path)
+            module, path = _load(None, key, cache_dir)
+        else:
+            module, _ = _load(_generate(order, outputs, inputs, parameters, backend), key, None)
+        _loaded[key] = module
+    return CompiledFunction(module, parameters, key, path or getattr(module, "__file__", None))
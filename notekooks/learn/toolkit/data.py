@@ -0,0 +1,293 @@
+import multiprocessing
+import os
+import queue
+import threading
+import weakref
+import numpy as np
+
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+Batch = Tuple[np.ndarray, Optional[np.ndarray]]
+
+
+class ArrayDataset:
+    """
+    Conjunto de dados em arrays NumPy: entradas `x` (uma amostra por linha) e rótulos `y`.
+
+    `x` e `y` podem ser arrays em memória ou caminhos para arquivos `.npy`; nesse caso
+    os arquivos são abertos com memmap e só as linhas de cada lote são lidas do disco.
+    Ao ser enviado para outro processo, um dataset baseado em arquivos leva apenas os
+    caminhos (cada processo reabre o memmap).
+
+    Args:
+        x (np.ndarray | str): Entradas, formato (amostras, ...), ou caminho de um `.npy`.
+        y (np.ndarray | str, optional): Rótulos, formato (amostras, ...), ou caminho de um `.npy`.
+    """
+
+    def __init__(self, x: Union[np.ndarray, str], y: Union[np.ndarray, str, None] = None):
+        self._x_source, self._y_source = x, y
+        self._x = self._y = None
+
+    @staticmethod
+    def _open(source):
+        if source is None or isinstance(source, np.ndarray):
+            return source
+        return np.load(source, mmap_mode="r")
+
+    @property
+    def x(self) -> np.ndarray:
+        if self._x is None:
+            self._x = self._open(self._x_source)
+        return self._x
+
+    @property
+    def y(self) -> Optional[np.ndarray]:
+        if self._y is None:
+            self._y = self._open(self._y_source)
+        return self._y
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def get_batch(self, indices: np.ndarray) -> Batch:
+        """
+        Retorna (x, y) para as amostras em `indices`, como arrays em memória.
+        """
+        # Ler em ordem crescente é bem mais rápido num memmap; depois restauramos a ordem pedida.
+        order = np.argsort(indices, kind="stable")
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(order.size)
+        sorted_indices = indices[order]
+        x = np.asarray(self.x[sorted_indices], dtype=np.float64)[inverse]
+        y = None if self.y is None else np.asarray(self.y[sorted_indices])[inverse]
+        return x, y
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Memmaps são reabertos no destino em vez de serem copiados.
+        if not isinstance(self._x_source, np.ndarray):
+            state["_x"] = None
+        if not isinstance(self._y_source, np.ndarray):
+            state["_y"] = None
+        return state
+
+
+class ImageFolderDataset:
+    """
+    Imagens organizadas em subpastas, uma por classe (ex: `raiz/gato/1.jpg`, `raiz/cão/2.png`).
+    As imagens são lidas com OpenCV só quando o lote é pedido, redimensionadas para
+    `size`, normalizadas para [0, 1] e achatadas num vetor (entrada do MLP).
+
+    Args:
+        root (str): Pasta raiz.
+        size (Tuple[int, int]): (largura, altura) após o redimensionamento.
+        grayscale (bool): Se True, lê as imagens em tons de cinza.
+    """
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, root: str, size: Tuple[int, int] = (28, 28), grayscale: bool = True):
+        self.root = root
+        self.size = size
+        self.grayscale = grayscale
+        self.classes = sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+        self.paths: List[str] = []
+        labels = []
+        for label, name in enumerate(self.classes):
+            folder = os.path.join(root, name)
+            for filename in sorted(os.listdir(folder)):
+                if filename.lower().endswith(self.EXTENSIONS):
+                    self.paths.append(os.path.join(folder, filename))
+                    labels.append(label)
+        self.labels = np.array(labels, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def get_batch(self, indices: np.ndarray) -> Batch:
+        import cv2
+
+        flag = cv2.IMREAD_GRAYSCALE if self.grayscale else cv2.IMREAD_COLOR
+        images = []
+        for i in indices:
+            image = cv2.imread(self.paths[i], flag)
+            if image is None:
+                raise ValueError(f"Não foi possível ler a imagem '{self.paths[i]}'.")
+            images.append(cv2.resize(image, self.size).reshape(-1))
+        return np.stack(images).astype(np.float64) / 255.0, self.labels[indices]
+
+
+# Dataset e transformação de cada processo de trabalho (preenchidos por `_init_worker`).
+_worker = {}
+
+
+def _init_worker(dataset, transform):
+    _worker.update(dataset=dataset, transform=transform)
+
+
+def _load_batch(dataset, transform, indices: np.ndarray) -> Batch:
+    x, y = dataset.get_batch(indices)
+    if transform is not None:
+        x, y = transform(x, y)
+    return x, y
+
+
+def _worker_load(indices: np.ndarray) -> Batch:
+    return _load_batch(_worker["dataset"], _worker["transform"], indices)
+
+
+class DataLoader:
+    """
+    Gera mini-lotes (x, y) de um dataset sob demanda, de modo que a memória usada
+    depende do tamanho do lote e não do tamanho do dataset.
+
+    Args:
+        dataset: `ArrayDataset`, `ImageFolderDataset` ou qualquer objeto com `__len__`
+                 e `get_batch(indices) -> (x, y)`. Arrays NumPy (x, y) também são aceitos.
+        batch_size (int): Amostras por lote.
+        shuffle (bool): Embaralha a ordem das amostras a cada época.
+        drop_last (bool): Descarta o último lote se ele estiver incompleto.
+        prefetch (int): Quantos lotes preparar antecipadamente (0 desliga o prefetch).
+        num_workers (int): Se > 0, os lotes são preparados num pool de processos (criado
+                           na primeira época e reaproveitado nas seguintes); caso
+                           contrário, numa thread em segundo plano.
+        transform (Callable, optional): Aumento de dados aplicado a cada lote, dentro do
+                                        processo/thread que o prepara: transform(x, y) -> (x, y).
+                                        Com num_workers > 0, precisa ser serializável (pickle).
+        seed (int, optional): Semente do embaralhamento.
+
+    Com `num_workers > 0`, use o loader num bloco `with` (ou chame `close()`) para
+    encerrar os processos assim que ele não for mais necessário; sem isso, eles só são
+    encerrados quando o loader for coletado pelo garbage collector.
+
+    Usage:
+        >>> loader = DataLoader(ArrayDataset("x_train.npy", "y_train.npy"), batch_size=256, shuffle=True)
+        >>> for x, y in loader:
+        ...     loss = mse_loss(mlp(x), y)
+        >>> with DataLoader(dataset, batch_size=256, num_workers=4) as loader:
+        ...     for x, y in loader:
+        ...         loss = mse_loss(mlp(x), y)
+    """
+
+    def __init__(self, dataset, batch_size: int = 32, shuffle: bool = False, drop_last: bool = False,
+                 prefetch: int = 2, num_workers: int = 0,
+                 transform: Optional[Callable[[np.ndarray, Optional[np.ndarray]], Batch]] = None,
+                 seed: Optional[int] = None):
+        if isinstance(dataset, tuple):
+            dataset = ArrayDataset(*dataset)
+        elif isinstance(dataset, np.ndarray):
+            dataset = ArrayDataset(dataset)
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self.num_workers = num_workers
+        self.transform = transform
+        self._rng = np.random.default_rng(seed)
+        self._pool = None
+        self._pool_finalizer = None
+
+    def __len__(self) -> int:
+        count = len(self.dataset)
+        if self.drop_last:
+            return count // self.batch_size
+        return -(-count // self.batch_size)
+
+    def _batch_indices(self) -> List[np.ndarray]:
+        count = len(self.dataset)
+        order = self._rng.permutation(count) if self.shuffle else np.arange(count)
+        batches = [order[i:i + self.batch_size] for i in range(0, count, self.batch_size)]
+        if self.drop_last and batches and batches[-1].size < self.batch_size:
+            batches.pop()
+        return batches
+
+    def __iter__(self) -> Iterator[Batch]:
+        batches = self._batch_indices()
+        if self.num_workers > 0:
+            return self._iter_processes(batches)
+        if self.prefetch > 0:
+            return self._iter_thread(batches)
+        return (_load_batch(self.dataset, self.transform, idx) for idx in batches)
+
+    def _iter_thread(self, batches: Sequence[np.ndarray]) -> Iterator[Batch]:
+        # A thread produtora fica no máximo `prefetch` lotes à frente do consumo.
+        ready = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for idx in batches:
+                    if stop.is_set():
+                        return
+                    ready.put(_load_batch(self.dataset, self.transform, idx))
+                ready.put(done)
+            except BaseException as error:
+                ready.put(error)
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Se o consumidor parar antes do fim, libera a produtora e espera por ela.
+            stop.set()
+            while thread.is_alive():
+                try:
+                    ready.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            thread.join()
+
+    def _iter_processes(self, batches: Sequence[np.ndarray]) -> Iterator[Batch]:
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                self.num_workers, initializer=_init_worker, initargs=(self.dataset, self.transform)
+            )
+            # Se o loader for coletado sem `close()`, os processos são encerrados mesmo assim.
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        # Janela deslizante: no máximo `num_workers + prefetch` lotes em preparação.
+        window = self.num_workers + max(self.prefetch, 0)
+        pending = []
+        batches = iter(batches)
+        try:
+            for idx in batches:
+                pending.append(self._pool.apply_async(_worker_load, (idx,)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                result = pending.pop(0).get()
+                for idx in batches:
+                    pending.append(self._pool.apply_async(_worker_load, (idx,)))
+                    break
+                yield result
+        finally:
+            # Se o consumidor parar antes do fim (break, exceção), espera os lotes já
+            # enviados: eles não ficam ocupando o pool na próxima época.
+            for result in pending:
+                result.wait()
+
+    def close(self):
+        """
+        Encerra o pool de processos (se houver).
+        """
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_finalizer = None
+
+    def __enter__(self) -> "DataLoader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -3,7 +3,345 @@ import math
 import numpy as np 
 
 import math  # Para funções matemáticas como exp, log, tanh
-from typing import List, Union
+from typing import List, Tuple, Union
+
+
+# Fita (tape) ativa, se houver. Quando definida, cada Value criado é anexado a ela
+# na ordem de criação, que já é uma ordem topológica válida do grafo.
+_active_tape = None
+
+# Quando False (dentro de `no_grad`), as operações não registram filhos nem backward.
+_grad_enabled = True
+
+
+def is_grad_enabled() -> bool:
+    """
+    Indica se as operações estão gravando o grafo para o backpropagation.
+    """
+    return _grad_enabled
+
+
+class no_grad:
+    """
+    Context manager que desliga a construção do grafo: dentro dele, as operações
+    produzem `Value`s sem filhos e sem backward, úteis apenas para inferência.
+
+    Usage:
+        >>> x = Value(2)
+        >>> with no_grad():
+        ...     z = x * 3
+        >>> z._prev
+        ()
+    """
+
+    def __init__(self):
+        self._previous = True
+
+    def __enter__(self) -> "no_grad":
+        global _grad_enabled
+        self._previous = _grad_enabled
+        _grad_enabled = False
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _grad_enabled
+        _grad_enabled = self._previous
+
+
+class Tape:
+    """
+    Grava os nós Value na ordem em que são criados, para que o backpropagation
+    seja uma única passada linear (sem reconstruir a ordem topológica).
+
+    Como um nó só pode ser criado depois dos seus operandos, a ordem de criação
+    já é topológica. Use uma fita nova (ou `reset()`) a cada passo de treino:
+    todos os nós gravados até `root` participam do backward.
+
+    Usage:
+        >>> with Tape() as tape:
+        ...     x = Value(2)
+        ...     z = x * 3 + 1
+        >>> tape.backward(z)
+        >>> x.grad
+        3.0
+    """
+
+    def __init__(self):
+        self.nodes: List["Value"] = []
+        self._previous = None
+
+    def __enter__(self) -> "Tape":
+        global _active_tape
+        self._previous = _active_tape
+        _active_tape = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_tape
+        _active_tape = self._previous
+        self._previous = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def reset(self):
+        """
+        Descarta os nós gravados (e as referências que mantinham o grafo vivo).
+        """
+        self.nodes = []
+
+    def backward(self, root: "Value", free_graph: bool = False):
+        """
+        Propaga os gradientes a partir de `root` percorrendo a fita de trás para frente.
+
+        Args:
+            root (Value): O nó de saída (geralmente a perda). Deve ter sido gravado nesta fita.
+            free_graph (bool): Libera o grafo durante o backward (ver `Value.backward`) e
+                               remove da fita os nós já consumidos.
+        """
+        # Nós criados depois de root não podem fazer parte do seu grafo.
+        end = len(self.nodes) - 1
+        while end >= 0 and self.nodes[end] is not root:
+            end -= 1
+        if end < 0:
+            raise ValueError("O nó raiz não foi gravado nesta fita.")
+
+        root.grad = 1.0
+        nodes = self.nodes
+        if not free_graph:
+            for idx in range(end, -1, -1):
+                node = nodes[idx]
+                _BACKWARD[node._code](node)
+            return
+
+        for idx in range(end, -1, -1):
+            node = nodes[idx]
+            _BACKWARD[node._code](node)
+            node._prev, node._code, node._arg = (), OP_LEAF, None
+        del nodes[:end + 1]
+
+
+def topological_order(root: "Value") -> List["Value"]:
+    """
+    Retorna os nós do grafo de `root` em ordem topológica (filhos antes dos pais).
+
+    Implementação iterativa (pilha explícita), portanto não depende do limite de
+    recursão do Python e funciona com grafos de milhões de nós.
+    """
+    topo = []
+    visited = {id(root)}
+    # Cada entrada da pilha é (nó, iterador sobre seus filhos ainda não visitados).
+    stack = [(root, iter(root._prev))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if id(child) not in visited:
+                visited.add(id(child))
+                stack.append((child, iter(child._prev)))
+                break
+        else:
+            # Todos os filhos já foram visitados: o nó pode entrar na ordem.
+            stack.pop()
+            topo.append(node)
+    return topo
+
+
+# --- Códigos de operação ---
+# Cada nó guarda apenas um inteiro indicando a operação que o gerou. O backward é
+# despachado por esse código para uma função compartilhada, em vez de cada nó
+# carregar sua própria closure.
+(OP_LEAF, OP_ADD, OP_MUL, OP_POW, OP_RELU, OP_TANH, OP_EXP, OP_LOG, OP_LINEAR,
+ OP_CHECKPOINT, OP_CHECKPOINT_OUTPUT, OP_SUB, OP_DIV) = range(13)
+
+# Marca (no `_arg` de uma folha) os Values criados para embrulhar constantes do
+# Python (ex: o 2 de `x * 2`), permitindo que `simplify` as dobre.
+CONSTANT = 'const'
+
+
+def is_constant(node: "Value") -> bool:
+    """
+    Indica se `node` é uma folha criada para embrulhar um número do Python.
+    """
+    return node._code == OP_LEAF and node._arg is CONSTANT
+
+
+def _leaf_backward(out: "Value"):
+    pass
+
+
+def _add_backward(out: "Value"):
+    # Local gradient:
+    # x = a + b
+    # dx/da = 1
+    # dx/db = 1
+    # Global gradient with chain rule:
+    # dy/da = dy/dx . dx/da = dy/dx . 1
+    # dy/db = dy/dx . dx/db = dy/dx . 1
+    a, b = out._prev
+    a.grad += out.grad
+    b.grad += out.grad
+
+
+def _mul_backward(out: "Value"):
+    # Local gradient:
+    # x = a * b
+    # dx/da = b
+    # dx/db = a
+    # Global gradient with chain rule:
+    # dy/da = dy/dx . dx/da = dy/dx . b
+    # dy/db = dy/dx . dx/db = dy/dx . a
+    a, b = out._prev
+    a.grad += b.data * out.grad
+    b.grad += a.data * out.grad
+
+
+def _pow_backward(out: "Value"):
+    # Derivada de x^n = n * x^(n-1)
+    (a,) = out._prev
+    n = out._arg
+    a.grad += (n * (a.data ** (n - 1))) * out.grad
+
+
+def _relu_backward(out: "Value"):
+    # x = relu(a)
+    # dx/da = 0 if a < 0 else 1
+    # Global gradient:
+    # dy/da = dy/dx . dx/da = dy/dx . (0 if a < 0 else 1)
+    (a,) = out._prev
+    if a.data >= 0:
+        a.grad += out.grad
+
+
+def _tanh_backward(out: "Value"):
+    # Derivada de tanh(x) = 1 - tanh(x)^2 = 1 - t^2
+    (a,) = out._prev
+    a.grad += (1 - out.data ** 2) * out.grad
+
+
+def _exp_backward(out: "Value"):
+    # Derivada de e^x = e^x (out.data é e^x)
+    (a,) = out._prev
+    a.grad += out.data * out.grad
+
+
+def _log_backward(out: "Value"):
+    # Derivada de log_b(x) = 1 / (x * ln(b))
+    # Para log natural (ln(x), base=e), a derivada é 1/x.
+    (a,) = out._prev
+    a.grad += (1 / (a.data * math.log(out._arg))) * out.grad
+
+
+def _linear_backward(out: "Value"):
+    # out = act(b + sum_i w_i * x_i), com filhos (b, w_1..w_n, x_1..x_n)
+    # d(out)/d(b)   = act'(pre)
+    # d(out)/d(w_i) = act'(pre) * x_i
+    # d(out)/d(x_i) = act'(pre) * w_i
+    n, activation, pre, flat = out._arg
+    g = out.grad
+    if activation == 'relu':
+        if pre < 0:
+            return
+    elif activation == 'tanh':
+        g *= 1 - out.data ** 2
+    children = out._prev
+    if flat is not None:
+        # Pesos e bias num buffer plano: os valores lidos no forward são reaproveitados
+        # e o gradiente dos parâmetros é acumulado no buffer com uma operação só.
+        values, grad = flat
+        inputs = children[n + 1:]
+        grad[:n] += np.multiply([x.data for x in inputs], g)
+        grad[n] += g
+        for w, x in zip(values, inputs):
+            x.grad += w * g
+        return
+    children[0].grad += g
+    for i in range(1, n + 1):
+        w, x = children[i], children[n + i]
+        w.grad += x.data * g
+        x.grad += w.data * g
+
+
+def _sub_backward(out: "Value"):
+    # x = a - b: dx/da = 1, dx/db = -1
+    # (OP_SUB e OP_DIV só aparecem em grafos reescritos por `simplify`.)
+    a, b = out._prev
+    a.grad += out.grad
+    b.grad -= out.grad
+
+
+def _div_backward(out: "Value"):
+    # x = a / b: dx/da = 1 / b, dx/db = -a / b^2
+    a, b = out._prev
+    a.grad += out.grad / b.data
+    b.grad -= out.grad * a.data / b.data ** 2
+
+
+class _Segment:
+    """
+    Estado compartilhado de um trecho com checkpoint: a função que o recalcula e
+    os gradientes acumulados em cada uma das suas saídas.
+    """
+
+    __slots__ = ('function', 'grads')
+
+    def __init__(self, function, number_outputs: int):
+        self.function = function
+        self.grads = [0.0] * number_outputs
+
+
+def _checkpoint_output_backward(out: "Value"):
+    # Cada saída apenas entrega seu gradiente ao trecho; como todas as saídas são
+    # pais do nó do trecho, elas são processadas antes dele.
+    segment, index = out._arg
+    segment.grads[index] += out.grad
+
+
+def _checkpoint_backward(out: "Value"):
+    # Recalcula o trecho com o grafo ligado, a partir de cópias folha das entradas,
+    # e propaga os gradientes das saídas até as entradas (e os parâmetros usados).
+    global _grad_enabled, _active_tape
+    segment = out._arg
+    inputs = out._prev
+    previous = _grad_enabled, _active_tape
+    _grad_enabled, _active_tape = True, None
+    try:
+        with Tape() as tape:
+            leaves = [Value(x.data) for x in inputs]
+            outputs = segment.function(leaves)
+    finally:
+        _grad_enabled, _active_tape = previous
+
+    if not isinstance(outputs, (list, tuple)):
+        outputs = [outputs]
+    for node, grad in zip(outputs, segment.grads):
+        node.grad += grad
+    for node in reversed(tape.nodes):
+        _BACKWARD[node._code](node)
+    for x, leaf in zip(inputs, leaves):
+        x.grad += leaf.grad
+    segment.grads = [0.0] * len(segment.grads)
+
+
+# Nome legível de cada código de operação (usado por profiler e exportações).
+OP_NAMES = ['leaf', '+', '*', '**', 'relu', 'tanh', 'exp', 'log', 'linear', 'checkpoint', 'checkpoint_out', '-', '/']
+
+# Tabela de despacho indexada pelo código de operação.
+_BACKWARD = [
+    _leaf_backward,
+    _add_backward,
+    _mul_backward,
+    _pow_backward,
+    _relu_backward,
+    _tanh_backward,
+    _exp_backward,
+    _log_backward,
+    _linear_backward,
+    _checkpoint_backward,
+    _checkpoint_output_backward,
+    _sub_backward,
+    _div_backward,
+]
+
 
 class Value:
     """
@@ -13,9 +351,15 @@ class Value:
     Attributes:
         data (float): The data for the Value node.
         _children (Tuple): The children of the current node.
+
+    Para reduzir a memória por nó, a classe usa `__slots__` (sem `__dict__`), guarda
+    os filhos numa tupla e o backward como um código de operação.
     """
-    
-    def __init__(self, data: float, _children: tuple = (), _op: str = '', label: str = ''):
+
+    __slots__ = ('data', 'grad', '_prev', '_op', '_code', '_arg', '_label')
+
+    def __init__(self, data: float, _children: tuple = (), _op: str = '', label: Union[str, tuple] = '',
+                 _code: int = OP_LEAF, _arg=None):
         """
         Inicializa um objeto Value.
 
@@ -24,7 +368,11 @@ class Value:
             _children (tuple, optional): Uma tupla de objetos Value que são os "filhos"
                                          (operandos) que geraram este Value. Default é ().
             _op (str, optional): A operação que gerou este Value (ex: '+', '*'). Default é ''.
-            label (str, optional): Um rótulo opcional para este Value, útil para depuração. Default é ''.
+            label (str | tuple, optional): Um rótulo opcional para este Value, útil para depuração.
+                                           Pode ser uma tupla (formato, *args), formatada só quando
+                                           o rótulo for lido. Default é ''.
+            _code (int, optional): Código da operação (OP_*) usado para despachar o backward.
+            _arg (optional): Argumento extra da operação (ex: o expoente de `**`).
         """
         self.data = data
 
@@ -37,20 +385,27 @@ class Value:
 
         self.grad = 0.0  # Gradiente da saída final da expressão em relação a este Value.]
         
-        # The function that derives the gradient of the children nodes
-        # of the current node. It is easier this way, because each node
-        # is built from children nodes and an operation. Upon back-propagation
-        # the current node can easily fill in the gradients of the children.
+        # The code of the operation that derives the gradient of the children
+        # nodes of the current node. Upon back-propagation the function
+        # registered for this code in `_BACKWARD` fills in the gradients of
+        # the children.
         # Note: The global gradient is the multiplication of the local gradient
         # and the flowing gradient from the parent.
         # Atributos internos para o backpropagation e construção do grafo:
-        self._backward = lambda: None  # Função que propaga o gradiente para os filhos.]
-                                      # Será sobrescrita por cada operação.
-        
-        # Define the children of this node.
-        self._prev = set(_children)   # Conjunto dos nós filhos (operandos).]
+        self._arg = _arg              # Argumento extra da operação (expoente, base do log).]
         self._op = _op                # Operação que criou este nó.]
-        self.label = label            # Rótulo para identificação.]
+        self._label = label           # Rótulo para identificação (formatado sob demanda).]
+
+        if _grad_enabled:
+            self._code = _code            # Código da operação (OP_*).]
+            # Define the children of this node.
+            self._prev = tuple(_children) # Tupla dos nós filhos (operandos).]
+            if _active_tape is not None:
+                _active_tape.nodes.append(self)
+        else:
+            # Inferência (no_grad): o nó não guarda referências ao grafo.
+            self._code = OP_LEAF
+            self._prev = ()
 
         # try:
         #     # FrameInfo(frame, filename, lineno, function, code_context, index)
@@ -59,6 +414,28 @@ class Value:
         #     # Caso seja instanciado no escopo global ou de forma inesperada
         #     self.func = "<escopo global ou desconhecido>"
 
+    @property
+    def label(self) -> str:
+        """
+        Rótulo do nó. Rótulos passados como tupla (formato, *args) são formatados
+        apenas na primeira leitura.
+        """
+        label = self._label
+        if label.__class__ is tuple:
+            label = label[0].format(*label[1:])
+            self._label = label
+        return label
+
+    @label.setter
+    def label(self, value: Union[str, tuple]):
+        self._label = value
+
+    def _backward(self):
+        """
+        Propaga o gradiente deste nó para os filhos, usando a função da sua operação.
+        """
+        _BACKWARD[self._code](self)
+
     def custom_addition(self, other: Union["Value", float]) -> "Value":
         """
         The addition operation for the Value class.
@@ -74,19 +451,8 @@ class Value:
         # If the other value is not a Value, then we need to wrap it.
         other = other if isinstance(other, Value) else Value(other)
         # Create a new Value node that will be the output of the addition.
-        out = Value(data=self.data + other.data, _children=(self, other), label=f"add")
-        def _backward():
-            # Local gradient:
-            # x = a + b
-            # dx/da = 1
-            # dx/db = 1
-            # Global gradient with chain rule:
-            # dy/da = dy/dx . dx/da = dy/dx . 1
-            # dy/db = dy/dx . dx/db = dy/dx . 1
-            self.grad += out.grad * 1.0
-            other.grad += out.grad * 1.0
-        # Set the backward function on the output node.
-        out._backward = _backward
+        # The backward function is selected by the operation code.
+        out = Value(data=self.data + other.data, _children=(self, other), label="add", _code=OP_ADD)
         return out
     def custom_reverse_addition(self, other):
         """
@@ -119,19 +485,8 @@ class Value:
         other = other if isinstance(other, Value) else Value(other)
         # Create a new Value node that will be the output of
         # the multiplication.
-        out = Value(data=self.data * other.data, _children=(self, other), label=f"multi")
-        def _backward():
-            # Local gradient:
-            # x = a * b
-            # dx/da = b
-            # dx/db = a
-            # Global gradient with chain rule:
-            # dy/da = dy/dx . dx/da = dy/dx . b
-            # dy/db = dy/dx . dx/db = dy/dx . a
-            self.grad += out.grad * other.data
-            other.grad += out.grad * self.data
-        # Set the backward function on the output node.
-        out._backward = _backward
+        # The backward function is selected by the operation code.
+        out = Value(data=self.data * other.data, _children=(self, other), label="multi", _code=OP_MUL)
         return out
 
     def custom_reverse_multiplication(self, other):
@@ -164,16 +519,8 @@ class Value:
             other, (int, float)
         ), "only supporting int/float powers for now"
         # Create a new Value node that will be the output of the power.
-        out = Value(data=self.data ** other, _children=(self,), label=f"power")
-        def _backward():
-            # Local gradient:
-            # x = a ** b
-            # dx/da = b * a ** (b - 1)
-            # Global gradient:
-            # dy/da = dy/dx . dx/da = dy/dx . b * a ** (b - 1)
-            self.grad += out.grad * (other * self.data ** (other - 1))
-        # Set the backward function on the output node.
-        out._backward = _backward
+        # The backward function is selected by the operation code.
+        out = Value(data=self.data ** other, _children=(self,), label="power", _code=OP_POW, _arg=other)
         return out
     
     def custom_negation(self):
@@ -271,7 +618,7 @@ class Value:
         Garante que o 'other' operando seja também um objeto Value.
         Se for um número (int ou float), ele é convertido para Value.
         """
-        return other if isinstance(other, Value) else Value(other)
+        return other if isinstance(other, Value) else Value(other, _arg=CONSTANT)
 
     # --- Operações Aritméticas e Métodos Especiais ---
 
@@ -280,45 +627,24 @@ class Value:
         Implementa a adição: self + other.
         """
         other = self._ensure_value(other) # Garante que 'other' seja um Value]
-        out = Value(self.data + other.data, (self, other), '+', label="Calculation Result")
-        
-        def _backward():
-            # Derivada da soma: d(out)/d(self) = 1, d(out)/d(other) = 1
-            # Aplicando a regra da cadeia: dL/d(self) = dL/d(out) * d(out)/d(self)
-            self.grad += 1.0 * out.grad
-            other.grad += 1.0 * out.grad
-        out._backward = _backward
-        
-        return out
+        # Derivada da soma: d(out)/d(self) = 1, d(out)/d(other) = 1 (ver _add_backward)
+        return Value(self.data + other.data, (self, other), '+', "Calculation Result", OP_ADD)
 
     def __mul__(self, other) -> 'Value':
         """
         Implementa a multiplicação: self * other.
         """
         other = self._ensure_value(other) # Garante que 'other' seja um Value]
-        out = Value(self.data * other.data, (self, other), '*', label="Calculation Result")
-        
-        def _backward():
-            # Derivada do produto: d(out)/d(self) = other.data, d(out)/d(other) = self.data
-            self.grad += other.data * out.grad
-            other.grad += self.data * out.grad
-        out._backward = _backward
-          
-        return out
+        # Derivada do produto: d(out)/d(self) = other.data, d(out)/d(other) = self.data (ver _mul_backward)
+        return Value(self.data * other.data, (self, other), '*', "Calculation Result", OP_MUL)
 
     def __pow__(self, other: float) -> 'Value':
         """
         Implementa a potenciação: self ** other (onde 'other' é um escalar int ou float).
         """
         assert isinstance(other, (int, float)), "Apenas potências escalares (int/float) são suportadas por enquanto."
-        out = Value(self.data ** other, (self,), f'**{other}', label="Calculation Result")
-
-        def _backward():
-            # Derivada de x^n = n * x^(n-1)
-            self.grad += (other * (self.data ** (other - 1))) * out.grad #]
-        out._backward = _backward
-
-        return out
+        # Derivada de x^n = n * x^(n-1) (ver _pow_backward)
+        return Value(self.data ** other, (self,), f'**{other}', "Calculation Result", OP_POW, other)
         
     def __neg__(self) -> 'Value': # -self
         """
@@ -368,30 +694,14 @@ class Value:
             >>> print(y.data)  # Saída: 0
         """
         # Computa a saída: se self.data for negativo, o resultado é 0; caso contrário, mantém o próprio self.data.
-        out = Value(
+        # A derivada local (0 se self.data for negativo, 1 caso contrário) é
+        # aplicada por _relu_backward, selecionada pelo código da operação.
+        return Value(
             data=0 if self.data < 0 else self.data,
             _children=(self,),
-            label="ReLU"
+            label="ReLU",
+            _code=OP_RELU
         )
-
-        def _backward():
-            # Cálculo da derivada local de ReLU:
-            # Se self.data for negativo, a derivada é 0;
-            # caso contrário, a derivada é 1.
-            #---
-            # x = relu(a)
-            # dx/da = 0 if a < 0 else 1
-            # Global gradient:
-            # dy/da = dy/dx . dx/da = dy/dx . (0 if a < 0 else 1)
-            gradiente_local = 0 if self.data < 0 else 1
-
-            # Atualiza o gradiente de self propagando o gradiente global
-            # do resultado multiplicado pela derivada local.
-            self.grad += out.grad * gradiente_local
-
-        # Atribui a função _backward ao nó de saída para que a retropropagação ocorra corretamente.
-        out._backward = _backward
-        return out
     
 
     def tanh(self) -> 'Value':
@@ -401,27 +711,15 @@ class Value:
         """
         x = self.data
         t = (math.exp(2*x) - 1) / (math.exp(2*x) + 1) #]
-        out = Value(t, (self, ), 'tanh', label=f"tanh")
-        
-        def _backward():
-            # Derivada de tanh(x) = 1 - tanh(x)^2 = 1 - t^2
-            self.grad += (1 - t**2) * out.grad #]
-        out._backward = _backward
-        
-        return out
+        # Derivada de tanh(x) = 1 - tanh(x)^2 = 1 - t^2 (ver _tanh_backward)
+        return Value(t, (self, ), 'tanh', "tanh", OP_TANH)
 
     def exp(self) -> 'Value':
         """
         Implementa a função exponencial: e ** self.data
         """
-        x = self.data
-        out = Value(math.exp(x), (self,), 'exp', label=f"exp") #]
-        
-        def _backward():
-            # Derivada de e^x = e^x
-            self.grad += out.data * out.grad # out.data é e^x]
-        out._backward = _backward
-        return out
+        # Derivada de e^x = e^x (ver _exp_backward)
+        return Value(math.exp(self.data), (self,), 'exp', "exp", OP_EXP)
 
     def log(self, base: float = math.e) -> 'Value':
         """
@@ -433,22 +731,75 @@ class Value:
         
         # Logaritmo na base desejada
         log_val = math.log(x, base)
-        out = Value(log_val, (self,), f'log_base{base:.2f}', label=f"log")
-        
-        def _backward():
-            # Derivada de log_b(x) = 1 / (x * ln(b))
-            # Para log natural (ln(x), base=e), a derivada é 1/x.
-            self.grad += (1 / (x * math.log(base))) * out.grad
-        out._backward = _backward
-        return out
+        # Derivada de log_b(x) = 1 / (x * ln(b)) (ver _log_backward)
+        return Value(log_val, (self,), f'log_base{base:.2f}', "log", OP_LOG, base)
     
 
+    @staticmethod
+    def linear(weights: List["Value"], x: List["Value"], bias: "Value", activation: str = None, label='',
+               buffers: Tuple[np.ndarray, np.ndarray] = None) -> "Value":
+        """
+        Neurônio fundido: act(bias + sum(w_i * x_i)) como um único nó do grafo.
+
+        Em vez de 2n nós intermediários (uma multiplicação e uma soma por entrada),
+        o resultado é um só nó cujo backward calcula analiticamente os gradientes
+        de todos os pesos, entradas e do bias de uma vez.
+
+        Args:
+            weights (List[Value]): Pesos w_1..w_n.
+            x (List[Value]): Entradas x_1..x_n (números são convertidos em Value).
+            bias (Value): O bias.
+            activation (str, optional): 'relu', 'tanh' ou None (linear).
+            label (str | tuple, optional): Rótulo do nó de saída.
+            buffers (Tuple[np.ndarray, np.ndarray], optional): Visões (valores, gradientes)
+                do buffer plano onde moram w_1..w_n seguidos do bias (ver `Parameter`). Com
+                elas, os pesos são lidos de uma vez em vez de um `Parameter` por vez.
+
+        Usage:
+            >>> w = [Value(2), Value(-1)]
+            >>> z = Value.linear(w, [Value(3), Value(1)], Value(0.5), activation='relu')
+            >>> z.data
+            5.5
+        """
+        assert activation in (None, 'relu', 'tanh'), "Ativações suportadas: 'relu', 'tanh' ou None."
+        x = tuple(xi if isinstance(xi, Value) else Value(xi) for xi in x)
+        n = len(weights)
+        assert len(x) == n, "O número de entradas deve ser igual ao número de pesos."
+        flat = None
+        if buffers is not None:
+            values = buffers[0].tolist()
+            flat = (values, buffers[1])
+            pre = values[n]
+            for wi, xi in zip(values, x):
+                pre += wi * xi.data
+        else:
+            pre = bias.data
+            for wi, xi in zip(weights, x):
+                pre += wi.data * xi.data
+
+        if activation == 'relu':
+            data = 0 if pre < 0 else pre
+        elif activation == 'tanh':
+            data = math.tanh(pre)
+        else:
+            data = pre
+        return Value(data, (bias, *weights, *x), 'linear', label, OP_LINEAR, (n, activation, pre, flat))
+
     # --- Backpropagation ---
-    def backward(self):
+    def backward(self, tape: "Tape" = None, free_graph: bool = False):
         """
         Realiza o backpropagation a partir deste Value (geralmente o nó de perda).
         Calcula os gradientes para todos os Values no grafo que levaram a este.
 
+        Args:
+            tape (Tape, optional): Fita que gravou o grafo. Se fornecida, a ordem
+                                   gravada é usada diretamente em vez de ser reconstruída.
+            free_graph (bool): Se True, cada nó solta seus filhos e o argumento da sua
+                               operação assim que propaga o gradiente, de modo que os
+                               intermediários são liberados durante o próprio backward
+                               (em vez de esperarem o grafo inteiro sair de escopo).
+                               Depois disso, o grafo não pode passar por outro backward.
+
         Usage:
             >>> x = Value(2)
             >>> y = Value(3)
@@ -459,32 +810,110 @@ class Value:
             >>> y.grad
             2
         """
-        # Build an empty list which will hold the
-        # topologically sorted graph
-        topo = []
-        # Build a set of all the visited nodes
-        visited = set()
-        # A closure to help build the topologically sorted graph
-        def build_topo(node: "Value"):
-            if node not in visited:
-                # If node is not visited add the node to the
-                # visited set.
-                visited.add(node)
-                # Iterate over the children of the node that
-                # is being visited
-                for child in node._prev:
-                    # Apply recursion to build the topologically sorted
-                    # graph of the children
-                    build_topo(child)
-                
-                # Only append node to the topologically sorted list
-                # if all its children are visited.
-                topo.append(node)
-        # Call the `build_topo` method on self
-        build_topo(self)
+        if tape is not None:
+            tape.backward(self, free_graph=free_graph)
+            return
+        # Topologically sorted graph, built iteratively so that deep graphs
+        # do not hit Python's recursion limit.
+        topo = topological_order(self)
         # Go one node at a time and apply the chain rule
         # to get its gradient
         self.grad = 1.0
-        for node in reversed(topo):
-            node._backward()
-    
\ No newline at end of file
+        if not free_graph:
+            for node in reversed(topo):
+                _BACKWARD[node._code](node)
+            return
+
+        # Consome a ordem topológica do fim para o começo: cada nó sai da lista e
+        # solta seus filhos logo depois de propagar o gradiente.
+        while topo:
+            node = topo.pop()
+            _BACKWARD[node._code](node)
+            node._prev, node._code, node._arg = (), OP_LEAF, None
+
+
+def checkpoint(function, inputs: List[Union["Value", float]], label: Union[str, tuple] = 'checkpoint'):
+    """
+    Activation checkpointing: executa `function(inputs)` sem gravar o grafo interno
+    e o recalcula durante o backward.
+
+    O grafo guarda apenas um nó para o trecho (ligado às entradas) e um nó por saída,
+    então a memória dos intermediários do trecho só existe enquanto o seu backward
+    roda. Os parâmetros usados por `function` (folhas, como os pesos de um `Layer`)
+    recebem os gradientes normalmente. Eles precisam ter os mesmos valores no forward
+    e no backward.
+
+    Args:
+        function (Callable[[List[Value]], Value | List[Value]]): O trecho a recalcular.
+        inputs (List[Value | float]): As entradas do trecho.
+        label (str | tuple, optional): Rótulo do nó do trecho.
+
+    Usage:
+        >>> x = [Value(1.0), Value(2.0)]
+        >>> y = checkpoint(lambda v: (v[0] * v[1]).tanh(), x)
+        >>> y.backward()
+    """
+    inputs = tuple(x if isinstance(x, Value) else Value(x) for x in inputs)
+    if not _grad_enabled:
+        return function(list(inputs))
+
+    with no_grad():
+        outputs = function(list(inputs))
+    single = not isinstance(outputs, (list, tuple))
+    if single:
+        outputs = [outputs]
+
+    segment = _Segment(function, len(outputs))
+    node = Value(0.0, inputs, 'checkpoint', label, OP_CHECKPOINT, segment)
+    results = [
+        Value(out.data, (node,), 'checkpoint_out', out._label, OP_CHECKPOINT_OUTPUT, (segment, idx))
+        for idx, out in enumerate(outputs)
+    ]
+    return results[0] if single else results
+
+
+class Parameter(Value):
+    """
+    Um `Value` folha cujo `data` e `grad` são posições de dois buffers contíguos
+    (np.ndarray float64) pertencentes a um `Module`.
+
+    Do ponto de vista do grafo, é um Value comum; mas como os números moram nos
+    buffers, o módulo pode zerar gradientes, atualizar pesos ou salvá-los com uma
+    única operação vetorizada sobre o buffer inteiro.
+    """
+
+    __slots__ = ('_data_buffer', '_grad_buffer', '_index')
+
+    def __init__(self, data_buffer: np.ndarray, grad_buffer: np.ndarray, index: int, label: Union[str, tuple] = ''):
+        """
+        Args:
+            data_buffer (np.ndarray): Buffer com os valores dos parâmetros.
+            grad_buffer (np.ndarray): Buffer com os gradientes (mesmo tamanho de data_buffer).
+            index (int): Posição deste parâmetro nos buffers.
+            label (str | tuple, optional): Rótulo do parâmetro.
+        """
+        # Não chama Value.__init__: o valor já está no buffer (que pode ser somente leitura).
+        self._data_buffer = data_buffer
+        self._grad_buffer = grad_buffer
+        self._index = index
+        self._prev = ()
+        self._op = ''
+        self._code = OP_LEAF
+        self._arg = None
+        self._label = label
+
+    @property
+    def data(self) -> float:
+        return float(self._data_buffer[self._index])
+
+    @data.setter
+    def data(self, value: float):
+        self._data_buffer[self._index] = value
+
+    @property
+    def grad(self) -> float:
+        return float(self._grad_buffer[self._index])
+
+    @grad.setter
+    def grad(self, value: float):
+        self._grad_buffer[self._index] = value
@@ -0,0 +1,173 @@
+import math
+import numpy as np
+
+from typing import Callable, List, Sequence, Union
+
+
+Number = Union[float, int]
+
+
+class Dual:
+    """
+    Número dual a + b·ε (com ε² = 0) para diferenciação em modo direto (forward mode).
+
+    `data` é o valor e `tangent` é a derivada direcional, propagada junto com o valor
+    a cada operação. Nenhum grafo é guardado: ao fim do forward, a derivada já está
+    pronta na saída. Compensa quando há poucas entradas (ou uma só direção de interesse)
+    e muitas saídas; para uma perda escalar com muitos parâmetros, o modo reverso
+    (`Value.backward`) continua sendo o adequado.
+
+    A tangente pode ser um float ou um np.ndarray: com um vetor, várias direções são
+    propagadas num único forward (ex: a matriz identidade dá a Jacobiana inteira).
+
+    Usage:
+        >>> x = Dual(3.0, 1.0)      # dx/dx = 1
+        >>> y = x ** 2 + 2 * x
+        >>> y.data, y.tangent       # (15.0, 8.0)
+    """
+
+    __slots__ = ('data', 'tangent')
+
+    def __init__(self, data: Number, tangent=0.0):
+        self.data = data
+        self.tangent = tangent
+
+    def __repr__(self) -> str:
+        return f"Dual(data={self.data:.4f}, tangent={self.tangent})"
+
+    # --- Operações Aritméticas ---
+
+    def __add__(self, other) -> "Dual":
+        if isinstance(other, Dual):
+            return Dual(self.data + other.data, self.tangent + other.tangent)
+        return Dual(self.data + other, self.tangent)
+
+    def __mul__(self, other) -> "Dual":
+        # (a + a'ε)(b + b'ε) = ab + (a'b + ab')ε
+        if isinstance(other, Dual):
+            return Dual(self.data * other.data, self.tangent * other.data + self.data * other.tangent)
+        return Dual(self.data * other, self.tangent * other)
+
+    def __pow__(self, other: Number) -> "Dual":
+        assert isinstance(other, (int, float)), "Apenas potências escalares (int/float) são suportadas por enquanto."
+        # Derivada de x^n = n * x^(n-1)
+        return Dual(self.data ** other, (other * self.data ** (other - 1)) * self.tangent)
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.data, -self.tangent)
+
+    def __sub__(self, other) -> "Dual":
+        return self + (-other)
+
+    def __truediv__(self, other) -> "Dual":
+        if isinstance(other, Dual):
+            return self * other ** -1
+        return Dual(self.data / other, self.tangent / other)
+
+    def __radd__(self, other) -> "Dual":
+        return self + other
+
+    def __rsub__(self, other) -> "Dual":
+        return (-self) + other
+
+    def __rmul__(self, other) -> "Dual":
+        return self * other
+
+    def __rtruediv__(self, other) -> "Dual":
+        return (self ** -1) * other
+
+    # --- Funções de Ativação e Outras Funções Matemáticas ---
+
+    def relu(self) -> "Dual":
+        if self.data < 0:
+            return Dual(0, self.tangent * 0.0)
+        return Dual(self.data, self.tangent)
+
+    def tanh(self) -> "Dual":
+        # Derivada de tanh(x) = 1 - tanh(x)^2
+        t = math.tanh(self.data)
+        return Dual(t, (1 - t ** 2) * self.tangent)
+
+    def exp(self) -> "Dual":
+        e = math.exp(self.data)
+        return Dual(e, e * self.tangent)
+
+    def log(self, base: float = math.e) -> "Dual":
+        if self.data <= 0:
+            raise ValueError("Logaritmo indefinido ou complexo para data <= 0.")
+        # Derivada de log_b(x) = 1 / (x * ln(b))
+        return Dual(math.log(self.data, base), self.tangent / (self.data * math.log(base)))
+
+    @staticmethod
+    def linear(weights: Sequence[float], x: Sequence["Dual"], bias: float, activation: str = None) -> "Dual":
+        """
+        Neurônio em modo direto: act(bias + sum(w_i * x_i)) com pesos constantes
+        (floats), acumulando valor e tangente sem criar Duals intermediários.
+        """
+        data, tangent = bias, 0.0
+        for wi, xi in zip(weights, x):
+            data += wi * xi.data
+            tangent = tangent + wi * xi.tangent
+        out = Dual(data, tangent)
+        if activation == 'relu':
+            return out.relu()
+        if activation == 'tanh':
+            return out.tanh()
+        return out
+
+
+def _as_list(outputs) -> list:
+    return list(outputs) if isinstance(outputs, (list, tuple)) else [outputs]
+
+
+def jvp(function: Callable[[List[Dual]], Union[Dual, List[Dual]]], inputs: Sequence[Number], v: Sequence[Number]):
+    """
+    Produto Jacobiana-vetor J v de `function` em `inputs`, num único forward.
+
+    `function` recebe uma lista de `Dual` e deve usar apenas as operações suportadas
+    (+, -, *, /, **, relu, tanh, exp, log), as mesmas do `Value`.
+
+    Returns:
+        (List[float], List[float]): As saídas e as derivadas direcionais J v.
+
+    Usage:
+        >>> outputs, directional = jvp(lambda x: x[0] * x[1] + x[0].tanh(), [0.5, 2.0], [1.0, 0.0])
+    """
+    outputs = _as_list(function([Dual(float(x), float(vi)) for x, vi in zip(inputs, v)]))
+    return [o.data for o in outputs], [o.tangent for o in outputs]
+
+
+def jacobian(function: Callable[[List[Dual]], Union[Dual, List[Dual]]], inputs: Sequence[Number]) -> np.ndarray:
+    """
+    Jacobiana (saídas x entradas) num único forward, propagando como tangente a
+    linha correspondente da matriz identidade para cada entrada.
+    """
+    identity = np.eye(len(inputs))
+    outputs = _as_list(function([Dual(float(x), identity[i]) for i, x in enumerate(inputs)]))
+    rows = [np.broadcast_to(np.asarray(o.tangent, dtype=np.float64), (len(inputs),)) for o in outputs]
+    return np.array(rows, dtype=np.float64).reshape(len(outputs), len(inputs))
+
+
+def mlp_forward(mlp, x: Sequence[Dual]) -> Union[Dual, List[Dual]]:
+    """
+    Forward de um `MLP` sobre entradas `Dual`, com os pesos tratados como constantes
+    (derivadas em relação às entradas). Nenhum `Value` é criado.
+    """
+    current = list(x)
+    for layer in mlp.layers:
+        current = [
+            Dual.linear([w.data for w in n.weights], current, n.bias.data, 'relu' if n.is_nonlinear else None)
+            for n in layer.neurons
+        ]
+    return current if len(current) != 1 else current[0]
+
+
+def mlp_input_jacobian(mlp, x: Sequence[Number]) -> np.ndarray:
+    """
+    Sensibilidade de cada saída do `mlp` a cada entrada (d saída / d entrada), num forward.
+
+    Usage:
+        >>> mlp = MLP(2, [3, 3, 1])
+        >>> mlp_input_jacobian(mlp, [0.5, -1.0])   # formato (1, 2)
+    """
+    return jacobian(lambda inputs: mlp_forward(mlp, inputs), x)
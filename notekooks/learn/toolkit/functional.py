@@ -0,0 +1,245 @@
+import math
+import numpy as np
+
+from typing import Callable, List, Optional, Sequence, Union
+
+from learn.toolkit.engine import (
+    CONSTANT, Value, no_grad, topological_order,
+    OP_LEAF, OP_ADD, OP_MUL, OP_POW, OP_RELU, OP_TANH, OP_EXP, OP_LOG, OP_LINEAR, OP_SUB, OP_DIV,
+)
+
+
+Number = Union[float, int]
+
+
+def _as_list(outputs) -> List[Value]:
+    return list(outputs) if isinstance(outputs, (list, tuple)) else [outputs]
+
+
+def _contributions(node: Value, g, val):
+    """
+    Regras de backward simbólicas: retorna pares (filho, gradiente) para o nó `node`
+    dado o gradiente `g` da sua saída.
+
+    `val(nó)` devolve o próprio Value (create_graph=True, as regras montam um novo
+    grafo com as operações do `Value`) ou o seu float (create_graph=False).
+    """
+    code = node._code
+    children = node._prev
+    if code == OP_ADD:
+        a, b = children
+        return ((a, g), (b, g))
+    if code == OP_MUL:
+        a, b = children
+        return ((a, g * val(b)), (b, g * val(a)))
+    if code == OP_SUB:
+        a, b = children
+        return ((a, g), (b, -g))
+    if code == OP_DIV:
+        a, b = children
+        return ((a, g / val(b)), (b, -g * val(a) / val(b) ** 2))
+    if code == OP_POW:
+        (a,) = children
+        n = node._arg
+        return ((a, g * (n * val(a) ** (n - 1))),)
+    if code == OP_RELU:
+        (a,) = children
+        return ((a, g),) if a.data >= 0 else ()
+    if code == OP_TANH:
+        (a,) = children
+        return ((a, g * (1 - val(node) ** 2)),)
+    if code == OP_EXP:
+        (a,) = children
+        return ((a, g * val(node)),)
+    if code == OP_LOG:
+        (a,) = children
+        return ((a, g * (val(a) * math.log(node._arg)) ** -1),)
+    if code == OP_LINEAR:
+        n, activation, pre, _ = node._arg
+        if activation == 'relu':
+            if pre < 0:
+                return ()
+        elif activation == 'tanh':
+            g = g * (1 - val(node) ** 2)
+        pairs = [(children[0], g)]
+        for i in range(1, n + 1):
+            w, x = children[i], children[n + i]
+            pairs.append((w, g * val(x)))
+            pairs.append((x, g * val(w)))
+        return pairs
+    raise ValueError(f"Operação '{node._op}' não suporta derivadas via `functional.grad` "
+                     f"(grafos com checkpoint devem ser construídos sem checkpoint).")
+
+
+def grad(outputs: Union[Value, Sequence[Value]], inputs: Sequence[Value],
+         grad_outputs: Optional[Sequence[Union[Value, Number]]] = None,
+         create_graph: bool = False) -> List[Union[Value, float]]:
+    """
+    Calcula sum_k grad_outputs[k] * d(outputs[k])/d(inputs) sem tocar no `.grad`
+    de nenhum nó.
+
+    Com `create_graph=True`, os gradientes retornados são `Value`s construídos com as
+    operações do próprio engine: eles podem passar por outro `backward`/`grad`, o que
+    permite derivadas de ordem superior (Hessiana-vetor, etc.).
+
+    Args:
+        outputs (Value | Sequence[Value]): Saídas a derivar.
+        inputs (Sequence[Value]): Nós em relação aos quais derivar.
+        grad_outputs (Sequence[Value | float], optional): Pesos de cada saída (o vetor `v`
+                                                          de um produto vetor-Jacobiana).
+                                                          Default: 1 para todas.
+        create_graph (bool): Retorna `Value`s diferenciáveis em vez de floats.
+
+    Usage:
+        >>> x = Value(3.0)
+        >>> (dy,) = grad(x ** 3, [x], create_graph=True)   # 3x^2 = 27
+        >>> (d2y,) = grad(dy, [x])                         # 6x = 18
+        >>> d2y
+        18.0
+    """
+    outputs = _as_list(outputs)
+    if grad_outputs is None:
+        grad_outputs = [1.0] * len(outputs)
+    val = (lambda node: node) if create_graph else (lambda node: node.data)
+
+    # Ordem topológica conjunta de todas as saídas.
+    order, seen = [], set()
+    for out in outputs:
+        for node in topological_order(out):
+            if id(node) not in seen:
+                seen.add(id(node))
+                order.append(node)
+
+    grads = {}
+    for out, g in zip(outputs, grad_outputs):
+        if not create_graph and isinstance(g, Value):
+            g = g.data
+        elif create_graph and not isinstance(g, Value):
+            # Pesos numéricos viram constantes: sem isso, entradas que só passam por
+            # somas (ou a própria saída) receberiam floats em vez de `Value`s.
+            g = Value(float(g), _arg=CONSTANT)
+        grads[id(out)] = grads[id(out)] + g if id(out) in grads else g
+
+    def run():
+        for node in reversed(order):
+            g = grads.get(id(node))
+            if g is None or node._code == OP_LEAF:
+                continue
+            for child, contribution in _contributions(node, g, val):
+                key = id(child)
+                grads[key] = grads[key] + contribution if key in grads else contribution
+
+    if create_graph:
+        run()
+    else:
+        # Sem create_graph, as regras operam só sobre floats; no_grad garante que
+        # nenhum Value criado por acidente grave filhos.
+        with no_grad():
+            run()
+
+    if not create_graph:
+        return [grads.get(id(x), 0.0) for x in inputs]
+    return [grads[id(x)] if id(x) in grads else Value(0.0, _arg=CONSTANT) for x in inputs]
+
+
+def _leaves(inputs: Sequence[Union[Value, Number]]) -> List[Value]:
+    # Values são usados como estão (ex: `mlp.parameters()`); números viram folhas novas.
+    return [x if isinstance(x, Value) else Value(float(x)) for x in inputs]
+
+
+def _floats(values) -> List[float]:
+    return [v.data if isinstance(v, Value) else float(v) for v in values]
+
+
+def vjp(function: Callable[[List[Value]], Union[Value, List[Value]]], inputs: Sequence[Union[Value, Number]],
+        v: Sequence[Number]):
+    """
+    Produto vetor-Jacobiana v^T J de `function` em `inputs`, com um único backward.
+
+    Returns:
+        (List[float], List[float]): As saídas de `function` e v^T J (um valor por entrada).
+
+    Usage:
+        >>> outputs, vj = vjp(lambda x: [x[0] * x[1], x[0] + x[1]], [2.0, 3.0], [1.0, 1.0])
+        >>> vj
+        [4.0, 3.0]
+    """
+    leaves = _leaves(inputs)
+    outputs = _as_list(function(leaves))
+    return _floats(outputs), _floats(grad(outputs, leaves, grad_outputs=v))
+
+
+def jvp(function: Callable[[List[Value]], Union[Value, List[Value]]], inputs: Sequence[Union[Value, Number]],
+        v: Sequence[Number]):
+    """
+    Produto Jacobiana-vetor J v de `function` em `inputs` (derivada direcional).
+
+    Usa o truque do duplo backward: u -> J^T u é linear em u, então o gradiente de
+    (J^T u) . v em relação a u é J v. Custa dois backward, independentemente do
+    número de entradas (em vez de um forward por entrada com diferenças finitas).
+
+    Returns:
+        (List[float], List[float]): As saídas de `function` e J v (um valor por saída).
+    """
+    leaves = _leaves(inputs)
+    outputs = _as_list(function(leaves))
+    dummies = [Value(0.0) for _ in outputs]
+    vjps = grad(outputs, leaves, grad_outputs=dummies, create_graph=True)
+    directional = sum((g * vi for g, vi in zip(vjps, v)), Value(0.0))
+    return _floats(outputs), _floats(grad(directional, dummies))
+
+
+def hvp(function: Callable[[List[Value]], Value], inputs: Sequence[Union[Value, Number]], v: Sequence[Number]):
+    """
+    Produto Hessiana-vetor H v de uma função escalar, sem montar a Hessiana:
+    H v é o gradiente de (grad f) . v, ou seja, um backward sobre o grafo do gradiente.
+
+    Returns:
+        (float, List[float]): O valor de `function` e H v (um valor por entrada).
+
+    Usage:
+        >>> params = mlp.parameters()
+        >>> loss_value, hv = hvp(lambda p: mse(mlp, xs, ys), params, direction)
+    """
+    leaves = _leaves(inputs)
+    out = function(leaves)
+    gradient = grad(out, leaves, create_graph=True)
+    directional = sum((g * vi for g, vi in zip(gradient, v)), Value(0.0))
+    return out.data, _floats(grad(directional, leaves))
+
+
+def jacobian(function: Callable[[List[Value]], Union[Value, List[Value]]],
+             inputs: Sequence[Union[Value, Number]]) -> np.ndarray:
+    """
+    Jacobiana completa (saídas x entradas): um forward e um backward por saída.
+    """
+    leaves = _leaves(inputs)
+    outputs = _as_list(function(leaves))
+    return np.array([_floats(grad(out, leaves)) for out in outputs], dtype=np.float64).reshape(len(outputs), len(leaves))
+
+
+def hessian(function: Callable[[List[Value]], Value], inputs: Sequence[Union[Value, Number]]) -> np.ndarray:
+    """
+    Hessiana completa de uma função escalar: o grafo do gradiente é montado uma vez
+    e cada linha é um backward sobre ele. Use `hvp` quando só os produtos forem necessários.
+
+    Usage:
+        >>> hessian(lambda p: p[0] + p[1] ** 3, [1.0, 2.0])   # termo linear: linha de zeros
+        array([[ 0.,  0.],
+               [ 0., 12.]])
+    """
+    leaves = _leaves(inputs)
+    gradient = grad(function(leaves), leaves, create_graph=True)
+    return np.array([_floats(grad(g, leaves)) for g in gradient], dtype=np.float64).reshape(len(leaves), len(leaves))
+
+
+def per_example_jacobians(mlp, xs: Sequence[Sequence[Number]]) -> np.ndarray:
+    """
+    Jacobiana das saídas do `mlp` em relação aos parâmetros, para cada amostra.
+
+    Returns:
+        np.ndarray: Formato (amostras, saídas, parâmetros).
+    """
+    params = mlp.parameters()
+    rows = [jacobian(lambda _, x=x: mlp(list(x)), params) for x in xs]
+    return np.stack(rows) if rows else np.zeros((0, 0, len(params)))
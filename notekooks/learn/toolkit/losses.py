@@ -0,0 +1,68 @@
+import numpy as np
+
+from learn.toolkit.tensor import Tensor
+
+
+def mse_loss(y_pred: "Tensor", y_true) -> "Tensor":
+    """
+    Erro quadrático médio fundido num único nó: mean((y_pred - y_true) ** 2).
+
+    Em vez de criar os nós de subtração, potência e média, o gradiente é calculado
+    analiticamente: d(loss)/d(y_pred) = 2 * (y_pred - y_true) / N.
+
+    Args:
+        y_pred (Tensor): Predições do modelo (ex: saída de `MLP` para um lote).
+        y_true (array_like): Valores alvo, com o mesmo formato de y_pred.
+    """
+    y_true = np.asarray(y_true.data if isinstance(y_true, Tensor) else y_true, dtype=np.float64)
+    diff = y_pred.data - y_true.reshape(y_pred.data.shape)
+    out = Tensor(np.mean(diff ** 2), (y_pred,), 'mse')
+
+    def _backward():
+        y_pred.grad += (2.0 / diff.size) * diff * out.grad
+    out._backward = _backward
+    return out
+
+
+def cross_entropy_loss(logits: "Tensor", y_true) -> "Tensor":
+    """
+    Softmax + entropia cruzada média fundidas num único nó.
+
+    O softmax é calculado de forma numericamente estável (subtraindo o máximo de cada
+    linha) e o gradiente em relação aos logits é simplesmente (softmax - one_hot) / N.
+
+    Args:
+        logits (Tensor): Saídas não normalizadas, formato (lote, classes) ou (classes,)
+                         para uma única amostra.
+        y_true (array_like): Índices das classes, formato (lote,) ou escalar, ou one-hot
+                             com o mesmo formato de `logits`.
+
+    Usage:
+        >>> round(float(cross_entropy_loss(Tensor([1.0, 2.0, 3.0]), [0, 0, 1]).data), 3)   # one-hot
+        0.408
+        >>> round(float(cross_entropy_loss(Tensor([1.0, 2.0, 3.0]), 2).data), 3)           # índice
+        0.408
+    """
+    y_true = np.asarray(y_true)
+    # One-hot ou índices é decidido pelo formato original dos logits, antes do reshape:
+    # com logits 1-D, um one-hot (classes,) também é 1-D.
+    is_one_hot = y_true.shape == logits.data.shape
+    z = logits.data
+    if z.ndim == 1:
+        z = z.reshape(1, -1)
+    if is_one_hot:
+        one_hot = y_true.astype(np.float64).reshape(z.shape)
+    else:
+        one_hot = np.zeros_like(z)
+        one_hot[np.arange(z.shape[0]), y_true.astype(int).reshape(-1)] = 1.0
+
+    shifted = z - z.max(axis=1, keepdims=True)
+    log_probs = shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+    batch_size = z.shape[0]
+    out = Tensor(-(one_hot * log_probs).sum() / batch_size, (logits,), 'cross_entropy')
+
+    def _backward():
+        grad = (np.exp(log_probs) - one_hot) / batch_size
+        logits.grad += grad.reshape(logits.data.shape) * out.grad
+    out._backward = _backward
+    return out
@@ -1,18 +1,43 @@
-from learn.toolkit.engine import Value
+from learn.toolkit.engine import Parameter, Value, checkpoint
+from learn.toolkit.tensor import Tensor
+import json
 import random
+import struct
+import numpy as np
+from contextlib import contextmanager
 from typing import List
-from typing import List, Union
+from typing import Callable, List, Optional, Union
+
+
+# Formato binário dos checkpoints de MLP:
+#   magic (4 bytes) | versão (uint32) | tamanho do cabeçalho (uint32) | cabeçalho JSON
+#   | preenchimento até múltiplo de 8 | pesos float64 little-endian (ordem de parameters()).
+_CHECKPOINT_MAGIC = b"MLPW"
+_CHECKPOINT_VERSION = 1
+_CHECKPOINT_PREFIX = struct.Struct("<4sII")
 
 
 class Module(object):
     """
     the parent class for all neutal network
+
+    Depois de `flatten_parameters()`, o módulo é dono de dois buffers contíguos
+    (float64), um para os valores e outro para os gradientes, e todos os parâmetros
+    (inclusive os dos submódulos) são `Parameter`s que apontam para esses buffers.
     """
 
+    # Buffers planos e lista de parâmetros em cache (None enquanto não achatado).
+    _flat_data = None
+    _flat_grad = None
+    _flat_parameters = None
+
     def zero_grad(self):
         """
         This is used to zero out all the gradients of the parameters.
         """
+        if self._flat_grad is not None:
+            self._flat_grad.fill(0.0)
+            return
         for p in self.parameters():
             p.grad = 0
 
@@ -23,6 +48,110 @@ class Module(object):
         """
         return []
 
+    # --- Buffer plano de parâmetros ---
+
+    @property
+    def is_flat(self) -> bool:
+        """True se os parâmetros moram num buffer plano (ver `flatten_parameters`)."""
+        return self._flat_data is not None
+
+    @property
+    def flat_data(self) -> Optional[np.ndarray]:
+        """Buffer plano com os valores dos parâmetros (None se o módulo não foi achatado)."""
+        return self._flat_data
+
+    @property
+    def flat_grad(self) -> Optional[np.ndarray]:
+        """Buffer plano com os gradientes dos parâmetros (None se o módulo não foi achatado)."""
+        return self._flat_grad
+
+    def flatten_parameters(self) -> "Module":
+        """
+        Copia todos os parâmetros para um buffer contíguo de valores e outro de
+        gradientes, e troca cada peso por um `Parameter` que é uma visão desses buffers.
+
+        Depois disso, `parameters()` é O(1) (lista em cache) e `zero_grad`,
+        `clip_grad_norm`, `state_dict` e os otimizadores operam sobre o buffer inteiro.
+        Chame antes de criar otimizadores: os objetos dos parâmetros são substituídos.
+        """
+        params = self.parameters()
+        count = len(params)
+        data = np.fromiter((p.data for p in params), dtype=np.float64, count=count)
+        grad = np.fromiter((p.grad for p in params), dtype=np.float64, count=count)
+        self._bind(data, grad, 0)
+        return self
+
+    def move_to_buffers(self, data: np.ndarray, grad: np.ndarray) -> "Module":
+        """
+        Copia os valores e gradientes atuais para `data`/`grad` (arrays float64 do tamanho
+        do modelo, ex: visões de memória compartilhada) e passa a usá-los como buffer plano.
+
+        Como em `flatten_parameters`, os objetos dos parâmetros são substituídos; os
+        otimizadores criados sobre o módulo acompanham a troca.
+        """
+        data[:] = self.state_dict()
+        grad[:] = self._flat_grad if self._flat_grad is not None else [p.grad for p in self.parameters()]
+        self._bind(data, grad, 0)
+        return self
+
+    def _bind(self, data: np.ndarray, grad: np.ndarray, offset: int) -> int:
+        """
+        Passa a usar `data[offset:]`/`grad[offset:]` como armazenamento dos parâmetros
+        e retorna a posição seguinte ao último parâmetro deste módulo.
+        """
+        end = self._bind_parameters(data, grad, offset)
+        # A lista de parâmetros é montada (e guardada) só no primeiro `parameters()`:
+        # um modelo carregado para inferência nunca precisa dela.
+        self._flat_parameters = None
+        self._flat_data = data[offset:end]
+        self._flat_grad = grad[offset:end]
+        return end
+
+    def _bind_parameters(self, data: np.ndarray, grad: np.ndarray, offset: int) -> int:
+        """
+        This function is built to be overwritten: each module binds its own parameters (or its submodules).
+        """
+        return offset
+
+    def clip_grad_norm(self, max_norm: float) -> float:
+        """
+        Reescala os gradientes para que a norma L2 total não passe de `max_norm`.
+        Retorna a norma antes do corte.
+        """
+        if self._flat_grad is not None:
+            norm = float(np.linalg.norm(self._flat_grad))
+            if norm > max_norm:
+                self._flat_grad *= max_norm / (norm + 1e-12)
+            return norm
+
+        params = self.parameters()
+        norm = sum(p.grad ** 2 for p in params) ** 0.5
+        if norm > max_norm:
+            scale = max_norm / (norm + 1e-12)
+            for p in params:
+                p.grad *= scale
+        return norm
+
+    def state_dict(self) -> np.ndarray:
+        """
+        Retorna uma cópia dos valores de todos os parâmetros (na ordem de `parameters()`).
+        """
+        if self._flat_data is not None:
+            return self._flat_data.copy()
+        params = self.parameters()
+        return np.fromiter((p.data for p in params), dtype=np.float64, count=len(params))
+
+    def load_state_dict(self, state: np.ndarray):
+        """
+        Restaura os valores dos parâmetros a partir de um array gerado por `state_dict()`.
+        """
+        state = np.asarray(state, dtype=np.float64)
+        if self._flat_data is not None:
+            self._flat_data[:] = state
+            return
+        for p, value in zip(self.parameters(), state.tolist()):
+            p.data = value
+
 class Neuron(Module):
     """
     A single neuron.
@@ -34,30 +163,62 @@ class Neuron(Module):
     """
     def __init__(self, number_inputs: int, neuron_id:str, is_nonlinear: bool = True):
         # Create weights for the neuron. The weights are initialized from a random uniform distribution.
-        self.weights = [Value(data=random.uniform(-1, 1), label=f"w_n{neuron_id}_i{idx}") for idx, _ in enumerate(range(number_inputs), start=1)]
+        self.weights = [Value(data=random.uniform(-1, 1), label=("w_n{}_i{}", neuron_id, idx)) for idx, _ in enumerate(range(number_inputs), start=1)]
         # Create bias for the neuron.
-        self.bias = Value(data=0.0, label=f"b_n{neuron_id}")
+        self.bias = Value(data=0.0, label=("b_n{}", neuron_id))
         self.is_nonlinear = is_nonlinear
         self.neuron_id = neuron_id
 
     def __call__(self, x: List["Value"]) -> "Value":
         # Calcula a soma ponderada + bias
             # w.x + b
-        # Compute the dot product of the input and the weights. 
-        # Add the bias to the dot product.
-
-        act = sum(
-            ((wi * xi) for wi, xi in zip(self.weights, x)),
-            self.bias
+        # O produto escalar, o bias e a ReLU formam um único nó fundido
+        # (Value.linear), em vez de uma multiplicação e uma soma por entrada.
+        return Value.linear(
+            self.weights, x, self.bias,
+            activation='relu' if self.is_nonlinear else None, # Aplica ReLU ou retorna linear
+            label=("act_n{}", self.neuron_id),
+            # Com buffer plano, os pesos são lidos do buffer de uma vez (não Parameter a Parameter).
+            buffers=None if self._flat_data is None else (self._flat_data, self._flat_grad)
         )
-        # If activation is mentioned, apply ReLU to it.
-        act.label = f"act_n{self.neuron_id}"
-        return act.relu() if self.is_nonlinear else act # Aplica tanh ou retorna linear
+
+    def predict(self, x: List[float]) -> float:
+        # Inferência sem grafo: opera diretamente sobre floats.
+        act = self.bias.data
+        for wi, xi in zip(self.weights, x):
+            act += wi.data * xi
+        return (act if act > 0 else 0.0) if self.is_nonlinear else act
+
+    @classmethod
+    def _from_buffer(cls, number_inputs: int, neuron_id: str, is_nonlinear: bool,
+                     data: np.ndarray, grad: np.ndarray, offset: int) -> "Neuron":
+        # Neurônio cujos parâmetros já estão no buffer plano (sem inicialização aleatória).
+        neuron = cls.__new__(cls)
+        neuron.weights = [Parameter(data, grad, offset + idx, label=("w_n{}_i{}", neuron_id, idx + 1))
+                          for idx in range(number_inputs)]
+        neuron.bias = Parameter(data, grad, offset + number_inputs, label=("b_n{}", neuron_id))
+        neuron.is_nonlinear = is_nonlinear
+        neuron.neuron_id = neuron_id
+        neuron._flat_data = data[offset:offset + number_inputs + 1]
+        neuron._flat_grad = grad[offset:offset + number_inputs + 1]
+        return neuron
 
     def parameters(self):
+        if self._flat_parameters is not None:
+            return self._flat_parameters
         # Get the parameters of the neuron. The parameters of a neuron
         # is its weights and bias.
-        return self.weights + [self.bias]
+        params = self.weights + [self.bias]
+        if self._flat_data is not None:
+            self._flat_parameters = params
+        return params
+
+    def _bind_parameters(self, data: np.ndarray, grad: np.ndarray, offset: int) -> int:
+        # Pesos em data[offset:offset+n] e bias logo em seguida.
+        number_inputs = len(self.weights)
+        self.weights = [Parameter(data, grad, offset + idx, label=w._label) for idx, w in enumerate(self.weights)]
+        self.bias = Parameter(data, grad, offset + number_inputs, label=self.bias._label)
+        return offset + number_inputs + 1
 
     def __repr__(self):
         # Print a better representation of the neuron.
@@ -73,27 +234,130 @@ class Layer(Module):
         number_inputs (int): number of inputs
         number_outputs (int): number of outputs
         layer_id (int): um identificador único para esta camada (ex: "l1").
+        checkpoint (bool): se True, o caminho escalar não guarda o grafo da camada;
+                           ele é recalculado no backward (ver `engine.checkpoint`).
+        initialize (bool): se False, os neurônios não são criados (nem sorteados): a camada
+                           espera um buffer plano (`_bind`) e os neurônios, com `Parameter`s
+                           apontando para ele, só são criados se o caminho escalar for usado.
 
     """
-    def __init__(self, number_inputs: int, number_outputs: int, layer_id: int, **kwargs):
+    def __init__(self, number_inputs: int, number_outputs: int, layer_id: int, checkpoint: bool = False,
+                 initialize: bool = True, **kwargs):
         # A layer is a list of neurons.
-        self.neurons = [
+        self._neurons = [
             Neuron(number_inputs=number_inputs, 
                    neuron_id=str(idx), 
                    **kwargs) for idx in range(number_outputs)
-        ]
+        ] if initialize else None
+        self._buffer = None  # (data, grad, offset) dos neurônios ainda não criados
         self.layer_id = layer_id
+        self.number_inputs = number_inputs
         self.number_outputs = number_outputs
+        self.is_nonlinear = kwargs.get("is_nonlinear", True)
+        self.checkpoint = checkpoint
+        # Visões (neurônios, entradas) e (neurônios,) do buffer plano, quando existir.
+        self.weight_data = self.weight_grad = None
+        self.bias_data = self.bias_grad = None
 
-    def __call__(self, x: List["Value"]) -> Union[List["Value"], "Value"]:
-        # Iterate over all the neurons and compute the output of each.
-        outs = [n(x) for n in self.neurons]
+    @property
+    def neurons(self) -> List["Neuron"]:
+        if self._neurons is None:
+            data, grad, offset = self._buffer
+            step = self.number_inputs + 1
+            self._neurons = [
+                Neuron._from_buffer(self.number_inputs, str(idx), self.is_nonlinear, data, grad, offset + idx * step)
+                for idx in range(self.number_outputs)
+            ]
+        return self._neurons
+
+    def __call__(self, x: Union[List["Value"], "Tensor"]) -> Union[List["Value"], "Value", "Tensor"]:
+        if isinstance(x, Tensor):
+            return self._call_tensor(x)
+
+        # Entradas numéricas viram Value uma única vez, compartilhadas por todos os neurônios.
+        x = [xi if isinstance(xi, Value) else Value(xi) for xi in x]
+        if self.checkpoint:
+            # O grafo guarda só as entradas e as saídas da camada: cada neurônio
+            # (com referências a todas as entradas e pesos) é refeito no backward.
+            outs = checkpoint(self._call_neurons, x, label=("ckpt_{}", self.layer_id))
+        else:
+            outs = self._call_neurons(x)
 
         return outs if self.number_outputs != 1 else outs[0] # Retorna único valor ou lista
 
+    def _call_neurons(self, x: List["Value"]) -> List["Value"]:
+        # Iterate over all the neurons and compute the output of each.
+        return [n(x) for n in self.neurons]
+
+    def _call_tensor(self, x: "Tensor") -> "Tensor":
+        # Caminho vetorizado: a camada inteira vira um único matmul (x @ W + b),
+        # em vez de O(entradas x neurônios) nós escalares.
+        # W tem formato (entradas, neurônios): a coluna j são os pesos do neurônio j.
+        if self.weight_data is not None:
+            # Sem cópia: o Tensor lê os pesos e acumula os gradientes direto no buffer plano.
+            weights = Tensor(self.weight_data.T, label=f"W_{self.layer_id}")
+            weights.grad = self.weight_grad.T
+            bias = Tensor(self.bias_data, label=f"b_{self.layer_id}")
+            bias.grad = self.bias_grad
+            return self._apply_tensor(x, weights, bias)
+
+        number_inputs = self.number_inputs
+        weights = Tensor.from_values(
+            (n.weights[i] for i in range(number_inputs) for n in self.neurons),
+            (number_inputs, self.number_outputs),
+            label=f"W_{self.layer_id}"
+        )
+        bias = Tensor.from_values((n.bias for n in self.neurons), (self.number_outputs,), label=f"b_{self.layer_id}")
+        return self._apply_tensor(x, weights, bias)
+
+    def _apply_tensor(self, x: "Tensor", weights: "Tensor", bias: "Tensor") -> "Tensor":
+        act = x @ weights + bias
+        out = act.relu() if self.is_nonlinear else act
+        # Mesmo contrato do caminho escalar: uma única saída dispensa a última dimensão.
+        return out if self.number_outputs != 1 else out.reshape(out.shape[:-1])
+
+    def predict(self, x: Union[List[float], np.ndarray]) -> Union[List[float], float, np.ndarray]:
+        # Inferência sem grafo. Arrays (uma amostra ou um lote por linha) usam um
+        # único matmul; listas de floats usam o caminho escalar dos neurônios.
+        if isinstance(x, np.ndarray):
+            if self.weight_data is not None:
+                weights, bias = self.weight_data.T, self.bias_data
+            else:
+                weights = np.array([[w.data for w in n.weights] for n in self.neurons]).T
+                bias = np.array([n.bias.data for n in self.neurons])
+            act = x @ weights + bias
+            out = np.maximum(act, 0.0) if self.is_nonlinear else act
+            return out if self.number_outputs != 1 else out[..., 0]
+
+        outs = [n.predict(x) for n in self.neurons]
+        return outs if self.number_outputs != 1 else outs[0]
+
     def parameters(self):
+        if self._flat_parameters is not None:
+            return self._flat_parameters
         # The parameters of a layer is the parameters of all the neurons.
-        return [p for n in self.neurons for p in n.parameters()]
+        params = [p for n in self.neurons for p in n.parameters()]
+        if self._flat_data is not None:
+            self._flat_parameters = params
+        return params
+
+    def _bind_parameters(self, data: np.ndarray, grad: np.ndarray, offset: int) -> int:
+        start = offset
+        number_inputs = self.number_inputs
+        if self._neurons is not None:
+            for n in self._neurons:
+                offset = n._bind(data, grad, offset)
+        else:
+            # Neurônios ainda não criados: serão montados sobre o buffer quando necessários.
+            self._buffer = (data, grad, start)
+            offset = start + self.number_outputs * (number_inputs + 1)
+        # Cada neurônio ocupa (entradas + 1) posições: a matriz (neurônios, entradas + 1)
+        # tem os pesos nas primeiras colunas e o bias na última.
+        data_block = data[start:offset].reshape(self.number_outputs, number_inputs + 1)
+        grad_block = grad[start:offset].reshape(self.number_outputs, number_inputs + 1)
+        self.weight_data, self.bias_data = data_block[:, :number_inputs], data_block[:, number_inputs]
+        self.weight_grad, self.bias_grad = grad_block[:, :number_inputs], grad_block[:, number_inputs]
+        return offset
     
     def __repr__(self):
         # Print a better representation of the layer.
@@ -106,8 +370,20 @@ class MLP(Module):
     Parameters:
         number_inputs (int): number of inputs.
         list_number_outputs (List[int]): number of outputs in each layer.
+        flat (bool): guarda todos os parâmetros num único buffer contíguo.
+        checkpoint (bool | List[int]): ativa o activation checkpointing em todas as
+                                       camadas (True) ou só nas de índice listado.
     """
-    def __init__(self, number_inputs: int, list_number_outputs: List[int]):
+    def __init__(self, number_inputs: int, list_number_outputs: List[int], flat: bool = False,
+                 checkpoint: Union[bool, List[int]] = False):
+        self._build(number_inputs, list_number_outputs, checkpoint, initialize=True)
+
+        # Opcionalmente, todos os parâmetros passam a morar num único buffer contíguo.
+        if flat:
+            self.flatten_parameters()
+
+    def _build(self, number_inputs: int, list_number_outputs: List[int], checkpoint: Union[bool, List[int]],
+               initialize: bool):
         # Get the number of inputs and all the number of outputs in a single list.
 
         # Tamanhos das camadas: [n_inputs, n_hidden1, n_hidden2, ..., n_output]
@@ -119,7 +395,8 @@ class MLP(Module):
                 number_inputs=total_size[i],          # Entradas para a camada atual
                 number_outputs=total_size[i + 1],     # Neurônios (saídas) na camada atual
                 layer_id=f"l{idx}",                   # ID da camada (ex: "l0", "l1")
-                is_nonlinear= (i != len(list_number_outputs) - 1) # Não linearidade, exceto na última camada
+                is_nonlinear= (i != len(list_number_outputs) - 1), # Não linearidade, exceto na última camada
+                initialize=initialize
             )
             for idx, i in enumerate(range(len(list_number_outputs)))
         ]
@@ -128,7 +405,18 @@ class MLP(Module):
         # ou a não-linearidade é parte da função de loss (ex: Softmax com CrossEntropy)
         # No micrograd, é comum aplicar tanh até na última camada se for uma saída genérica.
 
-    def __call__(self, x: List["Value"]) -> List["Value"]:
+        self.number_inputs = number_inputs
+        self.list_number_outputs = list(list_number_outputs)
+
+        for idx, layer in enumerate(self.layers):
+            layer.checkpoint = checkpoint is True or (checkpoint is not False and idx in checkpoint)
+
+    def __call__(self, x: Union[List["Value"], "Tensor", np.ndarray]) -> Union[List["Value"], "Tensor"]:
+        # Um array 2-D é tratado como um lote (uma amostra por linha) e
+        # processado inteiro de forma vetorizada.
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            x = Tensor(x, label="batch")
+
         # Iterate over the layers and compute the output of
         # each sequentially.
         current_input = x
@@ -137,21 +425,169 @@ class MLP(Module):
             
         return current_input
     
+    def predict(self, x: Union[List[float], List["Value"], np.ndarray]) -> Union[List[float], float, np.ndarray]:
+        """
+        Calcula as predições sem construir o grafo de autograd (nenhum `Value`,
+        filho ou backward é criado). Retorna floats para uma amostra em lista, ou
+        um np.ndarray para um array (1-D para uma amostra, 2-D para um lote).
+        """
+        if not isinstance(x, np.ndarray):
+            x = [xi.data if isinstance(xi, Value) else xi for xi in x]
+        elif x.dtype != np.float64:
+            x = x.astype(np.float64)
+
+        current_input = x
+        for layer in self.layers:
+            current_input = layer.predict(current_input)
+        return current_input
+
     def parameters(self):
+        if self._flat_parameters is not None:
+            return self._flat_parameters
         # Get the parameters of the MLP
         # return [layer for layer in self.layers for layer in layer.parameters()]
-        return [p for layer_obj in self.layers for p in layer_obj.parameters()]
+        params = [p for layer_obj in self.layers for p in layer_obj.parameters()]
+        if self._flat_data is not None:
+            self._flat_parameters = params
+        return params
     
     
     def __repr__(self):
         # Print a better representation of the MLP.
-        layer_reprs = [f"  - Layer {layer.layer_id} ({len(layer.neurons[0].weights)} inputs, {len(layer.neurons)} neurons)" for layer in self.layers]
+        layer_reprs = [f"  - Layer {layer.layer_id} ({layer.number_inputs} inputs, {layer.number_outputs} neurons)" for layer in self.layers]
         return f"MLP of {len(self.layers)} layers:\n" + "\n".join(layer_reprs)
 
+    def save(self, path: str):
+        """
+        Salva o MLP num arquivo binário compacto: um cabeçalho com a arquitetura
+        seguido dos pesos como um array float64 bruto (sem pickle de objetos Value).
+        """
+        weights = self.state_dict().astype("<f8", copy=False)
+        header = json.dumps({
+            "number_inputs": self.number_inputs,
+            "list_number_outputs": self.list_number_outputs,
+            "dtype": "<f8",
+            "count": int(weights.size),
+        }).encode("utf-8")
+        prefix = _CHECKPOINT_PREFIX.pack(_CHECKPOINT_MAGIC, _CHECKPOINT_VERSION, len(header))
+        # Os pesos começam num offset alinhado a 8 bytes, para permitir o memmap.
+        padding = -(len(prefix) + len(header)) % 8
+        with open(path, "wb") as file:
+            file.write(prefix)
+            file.write(header)
+            file.write(b"\0" * padding)
+            file.write(weights.tobytes())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "MLP":
+        """
+        Carrega um MLP salvo com `save`. O modelo retornado já tem buffer plano.
+
+        Nenhum peso é sorteado nem copiado: as camadas leem as matrizes direto do buffer
+        (`predict` com arrays e o caminho em lote não criam nenhum objeto por peso), e os
+        `Parameter`s só são criados se o caminho escalar ou `parameters()` forem usados.
+
+        Args:
+            path (str): Caminho do arquivo.
+            mmap (bool): Se True, os pesos são mapeados em memória (somente leitura) em vez
+                         de lidos: a carga é imediata e vários processos compartilham as mesmas
+                         páginas. Use para inferência; atualizar os pesos gera erro.
+        """
+        with open(path, "rb") as file:
+            magic, version, header_size = _CHECKPOINT_PREFIX.unpack(file.read(_CHECKPOINT_PREFIX.size))
+            if magic != _CHECKPOINT_MAGIC:
+                raise ValueError(f"'{path}' não é um checkpoint de MLP.")
+            if version != _CHECKPOINT_VERSION:
+                raise ValueError(f"Versão de checkpoint não suportada: {version}.")
+            header = json.loads(file.read(header_size).decode("utf-8"))
+        offset = _CHECKPOINT_PREFIX.size + header_size
+        offset += -offset % 8
+
+        if mmap:
+            data = np.memmap(path, dtype=header["dtype"], mode="r", offset=offset, shape=(header["count"],))
+        else:
+            data = np.fromfile(path, dtype=header["dtype"], count=header["count"], offset=offset).astype(np.float64)
+
+        sizes = [header["number_inputs"]] + header["list_number_outputs"]
+        expected = sum((n_in + 1) * n_out for n_in, n_out in zip(sizes, sizes[1:]))
+        if expected != header["count"] or data.size != header["count"]:
+            raise ValueError(f"Checkpoint corrompido: {header['count']} pesos para a arquitetura salva.")
+        return cls.from_buffers(header["number_inputs"], header["list_number_outputs"], data)
+
+    @classmethod
+    def from_buffers(cls, number_inputs: int, list_number_outputs: List[int], data: np.ndarray,
+                     grad: Optional[np.ndarray] = None) -> "MLP":
+        """
+        Monta um MLP cujos pesos são o próprio `data` (sem sorteio nem cópia), na ordem
+        de `parameters()`. É o que `load` e as réplicas do `DataParallelTrainer` usam.
+
+        Args:
+            number_inputs (int): Número de entradas.
+            list_number_outputs (List[int]): Número de saídas de cada camada.
+            data (np.ndarray): Buffer float64 com os pesos (pode ser somente leitura).
+            grad (np.ndarray, optional): Buffer dos gradientes; se omitido, é criado zerado.
+        """
+        sizes = [number_inputs] + list(list_number_outputs)
+        expected = sum((n_in + 1) * n_out for n_in, n_out in zip(sizes, sizes[1:]))
+        if data.size != expected:
+            raise ValueError(f"O buffer tem {data.size} pesos, mas a arquitetura precisa de {expected}.")
+        mlp = cls.__new__(cls)
+        mlp._build(number_inputs, list_number_outputs, checkpoint=False, initialize=False)
+        mlp._bind(data, np.zeros(data.size) if grad is None else grad, 0)
+        return mlp
+
+    def _bind_parameters(self, data: np.ndarray, grad: np.ndarray, offset: int) -> int:
+        for layer in self.layers:
+            offset = layer._bind(data, grad, offset)
+        return offset
+
     def zero_grad(self):
+        if self._flat_grad is not None:
+            self._flat_grad.fill(0.0)
+            return
         for p in self.parameters():
             p.grad = 0.0
 
+
+@contextmanager
+def instrument_modules(on_call: Callable[[str, Callable[[], object]], object]):
+    """
+    Instrumenta as chamadas de `Layer` e `Neuron` enquanto o contexto está ativo; fora
+    dele, as classes voltam ao código original (sem custo nenhum).
+
+    Cada chamada vira `on_call(scope, call)`, onde `scope` é o caminho do módulo
+    ("l0" para a camada, "l0/n3" para um neurônio dentro dela) e `call()` executa a
+    chamada original. É o gancho comum de `utils.record_scopes` e do `profiler.Profiler`.
+
+    Usage:
+        >>> def on_call(scope, call):
+        ...     print(scope)
+        ...     return call()
+        >>> with instrument_modules(on_call):
+        ...     mlp(x)
+    """
+    stack: List[str] = []
+    originals = {Neuron: Neuron.__dict__['__call__'], Layer: Layer.__dict__['__call__']}
+    names = {Neuron: lambda neuron: f"n{neuron.neuron_id}", Layer: lambda layer: str(layer.layer_id)}
+
+    def instrument(original, name_of):
+        def call(module, x):
+            scope = f"{stack[-1]}/{name_of(module)}" if stack else name_of(module)
+            stack.append(scope)
+            try:
+                return on_call(scope, lambda: original(module, x))
+            finally:
+                stack.pop()
+        return call
+
+    try:
+        for cls, original in originals.items():
+            cls.__call__ = instrument(original, names[cls])
+        yield
+    finally:
+        for cls, original in originals.items():
+            cls.__call__ = original
+
 # x = [2.0, 3.0]
 # mlp = MLP(number_inputs=2, list_number_outputs=[3, 3, 1])
 # print(mlp)
@@ -0,0 +1,132 @@
+import numpy as np
+
+from typing import Iterable, Tuple, Union
+
+from learn.toolkit.engine import Value
+from learn.toolkit.nn import Module
+
+
+class Optimizer:
+    """
+    Classe base dos otimizadores. O estado (momento, médias móveis etc.) fica em
+    arrays NumPy contíguos que espelham a lista de parâmetros, de modo que cada
+    `step` é um punhado de operações vetorizadas sobre todos os pesos de uma vez.
+
+    Se receber um `Module` com buffer plano (`flatten_parameters()`), o otimizador
+    atua diretamente sobre esse buffer, sem copiar nada a cada passo.
+
+    Args:
+        parameters (Module | Iterable[Value]): O modelo ou a lista de parâmetros a otimizar.
+        learning_rate (float): Taxa de aprendizado.
+        weight_decay (float): Penalidade L2 somada ao gradiente (weight_decay * p.data).
+    """
+
+    def __init__(self, parameters: Union["Module", Iterable["Value"]], learning_rate: float, weight_decay: float = 0.0):
+        # Com um módulo de buffer plano, os buffers são lidos a cada passo (e não guardados
+        # aqui), então o otimizador acompanha o módulo se o buffer mudar de lugar
+        # (ex: `Module.move_to_buffers`, usado pelo `DataParallelTrainer`).
+        self.module = None
+        if isinstance(parameters, Module):
+            self.module = parameters if parameters.is_flat else None
+            parameters = parameters.parameters()
+        self.parameters = list(parameters)
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+
+    def _gather(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copia data e grad de todos os parâmetros para dois arrays contíguos.
+        """
+        if self.module is not None:
+            return self.module.flat_data, self.module.flat_grad
+        count = len(self.parameters)
+        data = np.fromiter((p.data for p in self.parameters), dtype=np.float64, count=count)
+        grad = np.fromiter((p.grad for p in self.parameters), dtype=np.float64, count=count)
+        return data, grad
+
+    def _scatter(self, data: np.ndarray):
+        """
+        Escreve os novos valores de volta nos parâmetros.
+        """
+        if self.module is not None:
+            return
+        for p, value in zip(self.parameters, data.tolist()):
+            p.data = value
+
+    def zero_grad(self):
+        """
+        Zera o gradiente de todos os parâmetros.
+        """
+        if self.module is not None:
+            self.module.flat_grad.fill(0.0)
+            return
+        for p in self.parameters:
+            p.grad = 0.0
+
+    def step(self):
+        """
+        Aplica um passo de atualização com os gradientes atuais.
+        """
+        data, grad = self._gather()
+        if self.weight_decay:
+            grad = grad + self.weight_decay * data
+        self._update(data, grad)
+        self._scatter(data)
+
+    def _update(self, data: np.ndarray, grad: np.ndarray):
+        """
+        Atualiza `data` no lugar. Deve ser sobrescrito por cada otimizador.
+        """
+        raise NotImplementedError
+
+
+class SGD(Optimizer):
+    """
+    Gradiente descendente estocástico, com momento opcional.
+
+        v = momentum * v + grad
+        p = p - learning_rate * v
+    """
+
+    def __init__(self, parameters: Union["Module", Iterable["Value"]], learning_rate: float = 0.01,
+                 momentum: float = 0.0, weight_decay: float = 0.0):
+        super().__init__(parameters, learning_rate, weight_decay)
+        self.momentum = momentum
+        self.velocity = np.zeros(len(self.parameters))
+
+    def _update(self, data: np.ndarray, grad: np.ndarray):
+        if self.momentum:
+            self.velocity *= self.momentum
+            self.velocity += grad
+            grad = self.velocity
+        data -= self.learning_rate * grad
+
+
+class Adam(Optimizer):
+    """
+    Adam (Kingma & Ba): médias móveis do gradiente e do seu quadrado, com correção de viés.
+
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad ** 2
+        p = p - learning_rate * m_hat / (sqrt(v_hat) + eps)
+    """
+
+    def __init__(self, parameters: Union["Module", Iterable["Value"]], learning_rate: float = 0.001,
+                 betas: Tuple[float, float] = (0.9, 0.999), eps: float = 1e-8, weight_decay: float = 0.0):
+        super().__init__(parameters, learning_rate, weight_decay)
+        self.beta1, self.beta2 = betas
+        self.eps = eps
+        self.step_count = 0
+        self.m = np.zeros(len(self.parameters))
+        self.v = np.zeros(len(self.parameters))
+
+    def _update(self, data: np.ndarray, grad: np.ndarray):
+        self.step_count += 1
+        self.m *= self.beta1
+        self.m += (1 - self.beta1) * grad
+        self.v *= self.beta2
+        self.v += (1 - self.beta2) * grad ** 2
+
+        m_hat = self.m / (1 - self.beta1 ** self.step_count)
+        v_hat = self.v / (1 - self.beta2 ** self.step_count)
+        data -= self.learning_rate * m_hat / (np.sqrt(v_hat) + self.eps)
@@ -0,0 +1,161 @@
+import multiprocessing
+import numpy as np
+
+from multiprocessing import shared_memory
+from typing import Iterable, List, Tuple
+
+from learn.toolkit.losses import cross_entropy_loss, mse_loss
+from learn.toolkit.nn import MLP
+from learn.toolkit.optim import Optimizer
+
+
+LOSSES = {
+    "mse": mse_loss,
+    "cross_entropy": cross_entropy_loss,
+}
+
+# Estado de cada processo de trabalho (preenchido por `_init_worker`).
+_worker = {}
+
+
+def _init_worker(architecture: dict, params_name: str, grads_name: str, number_shards: int, loss: str):
+    """
+    Inicializa um processo de trabalho: conecta-se à memória compartilhada e monta
+    uma réplica do MLP cujos pesos são uma visão dos pesos compartilhados (sem sortear
+    nem copiar nenhum peso).
+    """
+    params_shm = shared_memory.SharedMemory(name=params_name)
+    grads_shm = shared_memory.SharedMemory(name=grads_name)
+    count = architecture["count"]
+    params = np.ndarray((count,), dtype=np.float64, buffer=params_shm.buf)
+    grads = np.ndarray((number_shards, count), dtype=np.float64, buffer=grads_shm.buf)
+
+    replica = MLP.from_buffers(architecture["number_inputs"], architecture["list_number_outputs"], params)
+
+    # As referências aos SharedMemory mantêm o mapeamento vivo enquanto o processo existir.
+    _worker.update(params_shm=params_shm, grads_shm=grads_shm, grads=grads, replica=replica, loss=LOSSES[loss])
+
+
+def _worker_step(task) -> float:
+    """
+    Calcula o gradiente de um shard do lote e o escreve na linha `shard` da matriz
+    compartilhada de gradientes. Retorna a contribuição do shard para a perda.
+    """
+    shard, x, y, weight = task
+    replica = _worker["replica"]
+    replica.zero_grad()
+    loss = _worker["loss"](replica(x), y)
+    loss.backward()
+    # O peso (tamanho do shard / tamanho do lote) faz a soma dos shards igualar a média do lote.
+    np.multiply(replica.flat_grad, weight, out=_worker["grads"][shard])
+    return float(loss.data) * weight
+
+
+class DataParallelTrainer:
+    """
+    Treinamento paralelo em dados: cada lote é dividido em shards processados por
+    um pool de processos (fugindo do GIL). Cada processo calcula o gradiente do seu
+    shard numa réplica do MLP e o escreve em memória compartilhada; o processo
+    principal soma os gradientes e aplica um único passo do otimizador.
+
+    O buffer de pesos do próprio `mlp` passa a morar em memória compartilhada (até o
+    `close`), então o passo do otimizador já atualiza as réplicas: por passo, só os
+    dados do lote e os gradientes dos shards trafegam entre processos.
+
+    Args:
+        mlp (MLP): Modelo com buffer plano (`MLP(..., flat=True)` ou `flatten_parameters()`).
+        optimizer (Optimizer): Otimizador criado sobre o `mlp`.
+        loss (str): 'mse' ou 'cross_entropy' (ver `learn.toolkit.losses`).
+        number_workers (int): Número de processos (e de shards por lote).
+
+    Usage:
+        >>> mlp = MLP(2, [16, 16, 1], flat=True)
+        >>> with DataParallelTrainer(mlp, SGD(mlp, learning_rate=0.05), number_workers=4) as trainer:
+        ...     for epoch in range(10):
+        ...         loss = trainer.step(X, y)
+    """
+
+    def __init__(self, mlp: "MLP", optimizer: "Optimizer", loss: str = "mse", number_workers: int = 2):
+        if not mlp.is_flat:
+            raise ValueError("O MLP precisa de buffer plano: use MLP(..., flat=True) antes de criar o otimizador.")
+        if loss not in LOSSES:
+            raise ValueError(f"Perda desconhecida '{loss}'. Opções: {sorted(LOSSES)}.")
+        self.mlp = mlp
+        self.optimizer = optimizer
+        self.number_workers = number_workers
+
+        count = mlp.flat_data.size
+        self._params_shm = shared_memory.SharedMemory(create=True, size=count * 8)
+        self._grads_shm = shared_memory.SharedMemory(create=True, size=number_workers * count * 8)
+        self._params = np.ndarray((count,), dtype=np.float64, buffer=self._params_shm.buf)
+        self._grads = np.ndarray((number_workers, count), dtype=np.float64, buffer=self._grads_shm.buf)
+        # Única cópia dos pesos: daqui em diante o modelo (e o otimizador) usa a memória compartilhada.
+        mlp.move_to_buffers(self._params, np.zeros(count))
+
+        architecture = {
+            "number_inputs": mlp.number_inputs,
+            "list_number_outputs": mlp.list_number_outputs,
+            "count": count,
+        }
+        self._pool = multiprocessing.Pool(
+            number_workers,
+            initializer=_init_worker,
+            initargs=(architecture, self._params_shm.name, self._grads_shm.name, number_workers, loss),
+        )
+
+    def step(self, x: np.ndarray, y: np.ndarray) -> float:
+        """
+        Um passo de treino sobre o lote (x, y). Retorna a perda média do lote.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y)
+        shards: List[np.ndarray] = [s for s in np.array_split(np.arange(len(x)), self.number_workers) if s.size]
+        tasks = [(k, x[idx], y[idx], idx.size / len(x)) for k, idx in enumerate(shards)]
+        losses = self._pool.map(_worker_step, tasks)
+
+        np.sum(self._grads[:len(shards)], axis=0, out=self.mlp.flat_grad)
+        self.optimizer.step()
+        return sum(losses)
+
+    def fit(self, loader: Iterable[Tuple[np.ndarray, np.ndarray]], epochs: int = 1) -> List[float]:
+        """
+        Treina por `epochs` épocas sobre os lotes de `loader` (ex: um `DataLoader`).
+        Retorna a perda média de cada época.
+        """
+        history = []
+        for _ in range(epochs):
+            total, count = 0.0, 0
+            for x, y in loader:
+                total += self.step(x, y) * len(x)
+                count += len(x)
+            history.append(total / max(count, 1))
+        return history
+
+    def close(self):
+        """
+        Encerra os processos e libera a memória compartilhada. Os pesos do `mlp` voltam
+        para um buffer próprio do processo.
+        """
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        count = self._params.size
+        self.mlp.move_to_buffers(np.empty(count), np.empty(count))
+        del self._params, self._grads
+        try:
+            self._params_shm.close()
+        except BufferError:
+            # Algum `Parameter` antigo (ex: de um `mlp.parameters()` guardado durante o
+            # treino) ainda aponta para o bloco; o mapeamento é liberado junto com ele.
+            pass
+        self._params_shm.unlink()
+        self._grads_shm.close()
+        self._grads_shm.unlink()
+
+    def __enter__(self) -> "DataParallelTrainer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,228 @@
+import math
+
+from typing import List, Sequence, Union
+
+from learn.toolkit.engine import (
+    Value, topological_order,
+    OP_LEAF, OP_ADD, OP_MUL, OP_POW, OP_RELU, OP_TANH, OP_EXP, OP_LOG, OP_LINEAR,
+    OP_CHECKPOINT, OP_CHECKPOINT_OUTPUT, OP_SUB, OP_DIV,
+)
+from learn.toolkit.nn import MLP
+from learn.toolkit.simplify import simplify
+
+
+class ExecutionPlan:
+    """
+    Plano de execução estático: uma lista plana de instruções gravada a partir de um
+    grafo de `Value`, com buffers de valores e gradientes pré-alocados.
+
+    Como a arquitetura de um `MLP` não muda depois de construída, o grafo de cada
+    passo de treino é sempre o mesmo. Em vez de recriar milhares de nós por amostra,
+    o plano repete as mesmas instruções sobre os buffers (índices inteiros).
+
+    Cada instrução é uma tupla (código, saída, operando_a, operando_b, argumento),
+    com os códigos OP_* de `engine` e os operandos como índices nos buffers. No nó
+    fundido OP_LINEAR, operando_a é a tupla de índices (bias, pesos..., entradas...)
+    e o argumento é (n, ativação).
+    """
+
+    def __init__(self, outputs: Sequence[Value], inputs: Sequence[Value], parameters: Sequence[Value],
+                 optimize: bool = False):
+        """
+        Grava o plano a partir de um grafo já construído.
+
+        Args:
+            outputs (Sequence[Value]): Nós de saída do grafo gravado.
+            inputs (Sequence[Value]): Folhas que recebem novos dados a cada chamada.
+            parameters (Sequence[Value]): Folhas cujo `data` é relido a cada chamada
+                                          e que recebem os gradientes no backward.
+            optimize (bool): Passa o grafo por `simplify` (dobra de constantes, CSE e
+                             sub/div primitivos) antes de gravar as instruções.
+        """
+        if optimize:
+            outputs = simplify(list(outputs))
+        # Ordem topológica conjunta de todas as saídas (sem repetir nós compartilhados).
+        order, slots = [], {}
+        for out in outputs:
+            for node in topological_order(out):
+                if id(node) not in slots:
+                    slots[id(node)] = len(order)
+                    order.append(node)
+
+        self.input_slots = [slots[id(v)] for v in inputs]
+        self.parameters = [p for p in parameters if id(p) in slots]
+        self.parameter_slots = [slots[id(p)] for p in self.parameters]
+        self.output_slots = [slots[id(v)] for v in outputs]
+
+        # Buffers pré-alocados. Folhas que não são entradas nem parâmetros são
+        # constantes, e o valor gravado no traço fica no buffer para sempre.
+        self.values = [node.data for node in order]
+        self.grads = [0.0] * len(order)
+        self._zeros = [0.0] * len(order)
+        # Pré-ativações dos nós OP_LINEAR, necessárias no backward.
+        self.pre_activations = [0.0] * len(order)
+
+        self.instructions = []
+        for node in order:
+            if node._code == OP_LEAF:
+                continue
+            if node._code in (OP_CHECKPOINT, OP_CHECKPOINT_OUTPUT):
+                raise ValueError("Grafos com checkpoint não podem ser compilados; desligue o checkpoint antes.")
+            children = [slots[id(child)] for child in node._prev]
+            if node._code == OP_LINEAR:
+                n, activation = node._arg[:2]
+                self.instructions.append((OP_LINEAR, slots[id(node)], tuple(children), -1, (n, activation)))
+                continue
+            a = children[0]
+            b = children[1] if len(children) > 1 else -1
+            self.instructions.append((node._code, slots[id(node)], a, b, node._arg))
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    def forward(self, x: Sequence[float]) -> List[float]:
+        """
+        Executa o plano para a entrada `x` e retorna os valores das saídas.
+        """
+        values, pre_activations = self.values, self.pre_activations
+        for slot, xi in zip(self.input_slots, x):
+            values[slot] = xi.data if isinstance(xi, Value) else xi
+        for slot, p in zip(self.parameter_slots, self.parameters):
+            values[slot] = p.data
+
+        for code, out, a, b, arg in self.instructions:
+            if code == OP_LINEAR:
+                n, activation = arg
+                pre = values[a[0]]
+                for i in range(1, n + 1):
+                    pre += values[a[i]] * values[a[n + i]]
+                pre_activations[out] = pre
+                if activation == 'relu':
+                    values[out] = 0 if pre < 0 else pre
+                elif activation == 'tanh':
+                    values[out] = math.tanh(pre)
+                else:
+                    values[out] = pre
+            elif code == OP_MUL:
+                values[out] = values[a] * values[b]
+            elif code == OP_ADD:
+                values[out] = values[a] + values[b]
+            elif code == OP_SUB:
+                values[out] = values[a] - values[b]
+            elif code == OP_DIV:
+                values[out] = values[a] / values[b]
+            elif code == OP_RELU:
+                values[out] = 0 if values[a] < 0 else values[a]
+            elif code == OP_TANH:
+                values[out] = math.tanh(values[a])
+            elif code == OP_POW:
+                values[out] = values[a] ** arg
+            elif code == OP_EXP:
+                values[out] = math.exp(values[a])
+            elif code == OP_LOG:
+                values[out] = math.log(values[a], arg)
+        return [values[slot] for slot in self.output_slots]
+
+    def backward(self, output_grads: Union[float, Sequence[float]] = 1.0):
+        """
+        Propaga os gradientes da última chamada de `forward` e os acumula no `grad`
+        de cada parâmetro (como faria `Value.backward`).
+
+        Args:
+            output_grads (float | Sequence[float]): d(perda)/d(saída) para cada saída.
+        """
+        if isinstance(output_grads, (int, float)):
+            output_grads = [output_grads] * len(self.output_slots)
+
+        values, grads = self.values, self.grads
+        grads[:] = self._zeros
+        for slot, g in zip(self.output_slots, output_grads):
+            grads[slot] += g
+
+        for code, out, a, b, arg in reversed(self.instructions):
+            g = grads[out]
+            if g == 0.0:
+                continue
+            if code == OP_LINEAR:
+                n, activation = arg
+                if activation == 'relu':
+                    if self.pre_activations[out] < 0:
+                        continue
+                elif activation == 'tanh':
+                    g *= 1 - values[out] ** 2
+                grads[a[0]] += g
+                for i in range(1, n + 1):
+                    w, xi = a[i], a[n + i]
+                    grads[w] += values[xi] * g
+                    grads[xi] += values[w] * g
+            elif code == OP_MUL:
+                grads[a] += values[b] * g
+                grads[b] += values[a] * g
+            elif code == OP_ADD:
+                grads[a] += g
+                grads[b] += g
+            elif code == OP_SUB:
+                grads[a] += g
+                grads[b] -= g
+            elif code == OP_DIV:
+                grads[a] += g / values[b]
+                grads[b] -= g * values[a] / values[b] ** 2
+            elif code == OP_RELU:
+                if values[a] >= 0:
+                    grads[a] += g
+            elif code == OP_TANH:
+                grads[a] += (1 - values[out] ** 2) * g
+            elif code == OP_POW:
+                grads[a] += (arg * values[a] ** (arg - 1)) * g
+            elif code == OP_EXP:
+                grads[a] += values[out] * g
+            elif code == OP_LOG:
+                grads[a] += g / (values[a] * math.log(arg))
+
+        for slot, p in zip(self.parameter_slots, self.parameters):
+            p.grad += grads[slot]
+
+
+class CompiledMLP:
+    """
+    Um `MLP` compilado num `ExecutionPlan`. Os pesos continuam sendo os `Value` do
+    MLP original: o plano relê `p.data` a cada chamada e acumula em `p.grad`, então
+    `zero_grad`, `update_mlp` e os otimizadores funcionam sem mudanças.
+
+    Usage:
+        >>> compiled = compile_mlp(mlp)
+        >>> for x, y in zip(xs, ys):
+        ...     (y_pred,) = compiled(x)
+        ...     compiled.backward(2 * (y_pred - y))   # d/dy_pred de (y_pred - y) ** 2
+        >>> update_mlp(mlp, learning_rate=0.01)
+    """
+
+    def __init__(self, mlp: "MLP", optimize: bool = False):
+        self.mlp = mlp
+        number_inputs = len(mlp.layers[0].neurons[0].weights)
+        inputs = [Value(0.0, label=("x{}", i)) for i in range(number_inputs)]
+        # O plano não guarda grafo entre chamadas, então o traço é feito sem checkpoint.
+        checkpointed = [layer.checkpoint for layer in mlp.layers]
+        for layer in mlp.layers:
+            layer.checkpoint = False
+        try:
+            out = mlp(inputs)
+        finally:
+            for layer, flag in zip(mlp.layers, checkpointed):
+                layer.checkpoint = flag
+        outputs = out if isinstance(out, list) else [out]
+        self.plan = ExecutionPlan(outputs, inputs, mlp.parameters(), optimize=optimize)
+
+    def __call__(self, x: Sequence[float]) -> List[float]:
+        return self.plan.forward(x)
+
+    def backward(self, output_grads: Union[float, Sequence[float]] = 1.0):
+        self.plan.backward(output_grads)
+
+
+def compile_mlp(mlp: "MLP", optimize: bool = False) -> "CompiledMLP":
+    """
+    Faz o traço de um forward do `mlp` e o compila num plano de execução estático
+    (opcionalmente simplificado, ver `ExecutionPlan`).
+    """
+    return CompiledMLP(mlp, optimize=optimize)
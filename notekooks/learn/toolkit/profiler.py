@@ -0,0 +1,314 @@
+import json
+import sys
+import time
+
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+from learn.toolkit import engine
+from learn.toolkit.engine import Value
+from learn.toolkit.nn import instrument_modules
+
+
+# Operações primitivas do Value instrumentadas pelo profiler. As compostas
+# (-, /, neg, ...) são contadas através das primitivas que chamam.
+PROFILED_OPS = {
+    '__add__': '+',
+    '__mul__': '*',
+    '__pow__': '**',
+    'relu': 'relu',
+    'tanh': 'tanh',
+    'exp': 'exp',
+    'log': 'log',
+    'linear': 'linear',
+}
+
+
+# Forwards pendentes (sem backward) guardados antes da primeira poda dos escopos.
+_MIN_PENDING_FORWARDS = 8
+
+
+class OpStats:
+    """
+    Estatísticas acumuladas de uma operação ou de um módulo.
+    """
+
+    __slots__ = ('calls', 'forward_ns', 'backward_ns', 'nodes')
+
+    def __init__(self):
+        self.calls = 0
+        self.forward_ns = 0
+        self.backward_ns = 0
+        self.nodes = 0
+
+
+class _NodeCounter:
+    """
+    Substitui a fita ativa do engine enquanto o profiler está ligado: conta cada
+    `Value` criado e anota o escopo (camada/neurônio) em que ele nasceu.
+    """
+
+    def __init__(self, profiler: "Profiler", previous_tape):
+        self.nodes = self
+        self.count = 0
+        self._profiler = profiler
+        self._previous = previous_tape
+
+    def append(self, node: "Value"):
+        self.count += 1
+        stack = self._profiler._scope_stack
+        if stack:
+            self._profiler._node_scopes[id(node)] = stack[-1]
+            self._profiler._forward_keys.append(id(node))
+        if self._previous is not None:
+            self._previous.nodes.append(node)
+
+
+class Profiler:
+    """
+    Profiler opcional do engine de autograd. Registra, por tipo de operação e por
+    módulo do `nn` (camada e neurônio), o número de chamadas, o tempo de forward e
+    de backward e quantos nós foram alocados.
+
+    Todas as instrumentações são instaladas ao entrar no contexto e removidas ao
+    sair; com o profiler desligado, o engine roda exatamente o código original.
+
+    Args:
+        record_ops (bool): Também grava um evento por operação no trace do Chrome
+                           (por padrão, apenas chamadas de módulos e backward).
+        max_events (int): Limite de eventos guardados para o trace.
+
+    Usage:
+        >>> with Profiler() as prof:
+        ...     loss = sum((mlp(x) - y) ** 2 for x, y in zip(xs, ys))
+        ...     loss.backward()
+        >>> print(prof.table())
+        >>> prof.export_chrome_trace("trace.json")  # abrir em chrome://tracing ou Perfetto
+    """
+
+    def __init__(self, record_ops: bool = False, max_events: int = 1_000_000):
+        self.record_ops = record_ops
+        self.max_events = max_events
+        self.op_stats: Dict[str, OpStats] = {}
+        self.module_stats: Dict[str, OpStats] = {}
+        self.events: List[dict] = []
+        self._scope_stack: List[str] = []
+        self._node_scopes: Dict[int, str] = {}
+        # Saídas e ids dos nós de cada chamada de primeiro nível desde o último backward.
+        self._forwards: List[tuple] = []
+        self._forward_keys: List[int] = []
+        self._prune_at = _MIN_PENDING_FORWARDS
+        self._originals = []
+        self._modules: Optional[ExitStack] = None
+        self._counter: Optional[_NodeCounter] = None
+        self._origin_ns = 0
+
+    # --- Instrumentação ---
+
+    def _stat(self, table: Dict[str, OpStats], name: str) -> OpStats:
+        stat = table.get(name)
+        if stat is None:
+            stat = table[name] = OpStats()
+        return stat
+
+    def _event(self, name: str, category: str, start_ns: int, elapsed_ns: int):
+        if len(self.events) < self.max_events:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "pid": 0, "tid": 0,
+                "ts": (start_ns - self._origin_ns) / 1000, "dur": elapsed_ns / 1000,
+            })
+
+    def _patch(self, owner, attribute: str, replacement):
+        # Guarda o descritor original (ex: staticmethod) para restaurá-lo intacto.
+        original = owner.__dict__[attribute]
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(replacement)
+        self._originals.append((owner, attribute, original))
+        setattr(owner, attribute, replacement)
+
+    def _wrap_op(self, name: str, original):
+        profiler, counter = self, self._counter
+        stat = self._stat(self.op_stats, name)
+
+        def op(*args, **kwargs):
+            nodes_before = counter.count
+            start = time.perf_counter_ns()
+            out = original(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            stat.calls += 1
+            stat.forward_ns += elapsed
+            stat.nodes += counter.count - nodes_before
+            if profiler.record_ops:
+                profiler._event(name, "op", start, elapsed)
+            return out
+        return op
+
+    def _wrap_backward(self, name: str, original):
+        profiler = self
+        stat = self._stat(self.op_stats, name)
+
+        def backward_fn(node):
+            start = time.perf_counter_ns()
+            original(node)
+            elapsed = time.perf_counter_ns() - start
+            stat.backward_ns += elapsed
+            scope = profiler._node_scopes.get(id(node))
+            if scope is not None:
+                # Atribui ao neurônio e também à camada que o contém.
+                profiler._stat(profiler.module_stats, scope).backward_ns += elapsed
+                if '/' in scope:
+                    profiler._stat(profiler.module_stats, scope.split('/')[0]).backward_ns += elapsed
+        return backward_fn
+
+    def _module_call(self, scope: str, call):
+        # Gancho de `instrument_modules`: `scope` é "l0" ou "l0/n3".
+        counter, stack = self._counter, self._scope_stack
+        top_level = not stack
+        if top_level:
+            if len(self._forwards) >= self._prune_at:
+                self._prune_forwards()
+            self._forward_keys = []
+        stack.append(scope)
+        nodes_before = counter.count
+        start = time.perf_counter_ns()
+        try:
+            out = call()
+            if top_level:
+                outputs = tuple(out) if isinstance(out, list) else (out,)
+                self._forwards.append((outputs, self._forward_keys))
+            return out
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            stack.pop()
+            stat = self._stat(self.module_stats, scope)
+            stat.calls += 1
+            stat.forward_ns += elapsed
+            stat.nodes += counter.count - nodes_before
+            self._event(scope, "module", start, elapsed)
+
+    def _prune_forwards(self):
+        """
+        Descarta os escopos dos forwards cujas saídas ninguém mais referencia (ex:
+        inferência com o grafo ligado, sem backward). Sem isso, `_node_scopes` cresceria
+        sem limite e um id reaproveitado por um nó novo herdaria um escopo antigo.
+        Enquanto um forward está pendente, suas saídas (e, por `_prev`, seus nós) ficam
+        vivas, então os ids guardados nunca são reaproveitados.
+        """
+        pending, alive = self._forwards, []
+        self._forwards = []
+        # Do mais novo para o mais antigo: descartar um forward (ex: a camada l1) solta
+        # as referências que ele tinha às saídas dos anteriores (as da camada l0).
+        while pending:
+            outputs, keys = pending.pop()
+            # Referências à saída: a tupla `outputs`, a variável `node` e o argumento.
+            if any(sys.getrefcount(node) > 3 for node in outputs):
+                alive.append((outputs, keys))
+            else:
+                for key in keys:
+                    self._node_scopes.pop(key, None)
+            del outputs, keys
+        alive.reverse()
+        self._forwards = alive
+        # Limite dobrado a cada poda: o custo por chamada fica O(1) amortizado mesmo
+        # quando muitos forwards se acumulam antes do backward.
+        self._prune_at = max(_MIN_PENDING_FORWARDS, 2 * len(alive))
+
+    def _clear_scopes(self):
+        self._node_scopes.clear()
+        self._forwards = []
+        self._prune_at = _MIN_PENDING_FORWARDS
+
+    def _wrap_value_backward(self, original):
+        profiler = self
+
+        def backward(value, *args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return original(value, *args, **kwargs)
+            finally:
+                profiler._event("backward", "backward", start, time.perf_counter_ns() - start)
+                # O grafo já foi consumido: os escopos dos seus nós não são mais necessários.
+                profiler._clear_scopes()
+        return backward
+
+    def start(self):
+        """
+        Instala a instrumentação (equivalente a entrar no contexto).
+        """
+        self._origin_ns = self._origin_ns or time.perf_counter_ns()
+        self._counter = _NodeCounter(self, engine._active_tape)
+        engine._active_tape = self._counter
+
+        for attribute, name in PROFILED_OPS.items():
+            self._patch(Value, attribute, self._wrap_op(name, getattr(Value, attribute)))
+        for code, original in enumerate(engine._BACKWARD):
+            self._originals.append((engine._BACKWARD, code, original))
+            engine._BACKWARD[code] = self._wrap_backward(engine.OP_NAMES[code], original)
+        self._patch(Value, 'backward', self._wrap_value_backward(Value.backward))
+        self._modules = ExitStack()
+        self._modules.enter_context(instrument_modules(self._module_call))
+
+    def stop(self):
+        """
+        Remove a instrumentação, restaurando o código original do engine e do nn.
+        """
+        self._modules.close()
+        self._modules = None
+        for owner, attribute, original in reversed(self._originals):
+            if isinstance(owner, list):
+                owner[attribute] = original
+            else:
+                setattr(owner, attribute, original)
+        self._originals = []
+        engine._active_tape = self._counter._previous
+        self._counter = None
+        self._clear_scopes()
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    # --- Relatórios ---
+
+    def table(self, sort_by: str = 'total') -> str:
+        """
+        Tabela de texto com as estatísticas por operação e por módulo.
+
+        Args:
+            sort_by (str): 'total' (forward + backward), 'forward', 'backward', 'calls' ou 'nodes'.
+        """
+        keys = {
+            'total': lambda s: s.forward_ns + s.backward_ns,
+            'forward': lambda s: s.forward_ns,
+            'backward': lambda s: s.backward_ns,
+            'calls': lambda s: s.calls,
+            'nodes': lambda s: s.nodes,
+        }
+        key = keys[sort_by]
+        lines = [f"{'nome':<20} {'chamadas':>10} {'forward ms':>12} {'backward ms':>12} {'nós':>10}"]
+        for title, stats in (("operações", self.op_stats), ("módulos", self.module_stats)):
+            lines.append(f"-- {title} " + "-" * 56)
+            for name, stat in sorted(stats.items(), key=lambda item: key(item[1]), reverse=True):
+                if not (stat.calls or stat.backward_ns):
+                    continue
+                lines.append(
+                    f"{name:<20} {stat.calls:>10} {stat.forward_ns / 1e6:>12.3f} "
+                    f"{stat.backward_ns / 1e6:>12.3f} {stat.nodes:>10}"
+                )
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path: str):
+        """
+        Grava os eventos no formato Trace Event do Chrome (chrome://tracing, Perfetto),
+        junto com as estatísticas agregadas em `otherData`.
+        """
+        summary = {
+            f"{kind}:{name}": {slot: getattr(stat, slot) for slot in OpStats.__slots__}
+            for kind, stats in (("op", self.op_stats), ("module", self.module_stats))
+            for name, stat in stats.items()
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": summary}, file)
@@ -0,0 +1,153 @@
+from typing import Dict, List, Sequence, Union
+
+from learn.toolkit.engine import (
+    CONSTANT, Value, is_constant, topological_order,
+    OP_LEAF, OP_ADD, OP_MUL, OP_POW, OP_SUB, OP_DIV,
+)
+
+
+class _Builder:
+    """
+    Monta o grafo simplificado: guarda as constantes já criadas (por valor) e os
+    nós já existentes (por operação + filhos + argumento), para reaproveitá-los.
+    """
+
+    def __init__(self):
+        self.constants: Dict[float, Value] = {}
+        self.nodes: Dict[tuple, Value] = {}
+        self.folded = 0
+        self.merged = 0
+        self.rewritten = 0
+
+    def constant(self, data: float) -> Value:
+        node = self.constants.get(data)
+        if node is None:
+            node = self.constants[data] = Value(data, label=str(data), _arg=CONSTANT)
+        return node
+
+    def node(self, data: float, children: tuple, op: str, label, code: int, arg) -> Value:
+        # Soma e multiplicação são comutativas: a ordem dos filhos não importa para a CSE.
+        ids = tuple(id(c) for c in children)
+        if code in (OP_ADD, OP_MUL):
+            ids = tuple(sorted(ids))
+        try:
+            key = (code, ids, arg)
+            hash(key)
+        except TypeError:
+            key = (code, ids, id(arg))
+        node = self.nodes.get(key)
+        if node is not None:
+            self.merged += 1
+            return node
+        node = self.nodes[key] = Value(data, children, op, label, code, arg)
+        return node
+
+
+def _is(node: Value, number: float) -> bool:
+    return is_constant(node) and node.data == number
+
+
+def _rewrite(old: Value, children: List[Value], builder: _Builder) -> Value:
+    """
+    Gera o nó simplificado equivalente a `old`, cujos filhos já simplificados são `children`.
+    """
+    code = old._code
+
+    # Dobra de constantes: todos os operandos são constantes, então o resultado também é.
+    if all(is_constant(c) for c in children):
+        builder.folded += 1
+        return builder.constant(old.data)
+
+    if code == OP_ADD:
+        a, b = children
+        # a + 0 = a
+        if _is(b, 0):
+            return a
+        if _is(a, 0):
+            return b
+        # a + (b * -1) = a - b
+        for x, y in ((a, b), (b, a)):
+            if y._code == OP_MUL and _is(y._prev[1], -1):
+                builder.rewritten += 1
+                return builder.node(x.data - y._prev[0].data, (x, y._prev[0]), '-', old._label, OP_SUB, None)
+            if y._code == OP_MUL and _is(y._prev[0], -1):
+                builder.rewritten += 1
+                return builder.node(x.data - y._prev[1].data, (x, y._prev[1]), '-', old._label, OP_SUB, None)
+    elif code == OP_MUL:
+        a, b = children
+        # a * 1 = a
+        if _is(b, 1):
+            return a
+        if _is(a, 1):
+            return b
+        # a * (b ** -1) = a / b
+        for x, y in ((a, b), (b, a)):
+            if y._code == OP_POW and y._arg == -1:
+                (denominator,) = y._prev
+                builder.rewritten += 1
+                return builder.node(x.data / denominator.data, (x, denominator), '/', old._label, OP_DIV, None)
+    elif code == OP_POW and old._arg == 1:
+        return children[0]
+
+    return builder.node(old.data, tuple(children), old._op, old._label, code, old._arg)
+
+
+def simplify(outputs: Union[Value, Sequence[Value]], stats: bool = False):
+    """
+    Otimiza o grafo de `outputs` antes do backward, devolvendo um grafo novo e
+    equivalente (o grafo original não é alterado):
+
+    - dobra de constantes: operações sobre números do Python (que o engine embrulha
+      em folhas novas) viram uma única constante;
+    - eliminação de subexpressões comuns (CSE): nós com a mesma operação, os mesmos
+      filhos e o mesmo argumento são criados uma só vez;
+    - reescrita de padrões compostos: a + b * -1 vira `a - b` (OP_SUB) e a * b ** -1
+      vira `a / b` (OP_DIV), além de identidades como x + 0, x * 1 e x ** 1.
+
+    As folhas que não são constantes (entradas, pesos) são as mesmas do grafo
+    original, então o backward do grafo simplificado acumula nos mesmos `.grad`.
+
+    Args:
+        outputs (Value | Sequence[Value]): Saída(s) do grafo.
+        stats (bool): Se True, também retorna um dict com o número de nós antes e
+                      depois e quantas dobras, fusões (CSE) e reescritas ocorreram.
+
+    Usage:
+        >>> x = Value(2.0)
+        >>> y = (x - 1) / (x - 1) + 3 * 4
+        >>> z = simplify(y)
+        >>> z.backward()
+    """
+    single = isinstance(outputs, Value)
+    outputs = [outputs] if single else list(outputs)
+
+    order, seen = [], set()
+    for out in outputs:
+        for node in topological_order(out):
+            if id(node) not in seen:
+                seen.add(id(node))
+                order.append(node)
+
+    builder = _Builder()
+    mapping: Dict[int, Value] = {}
+    for node in order:
+        if node._code == OP_LEAF:
+            mapping[id(node)] = builder.constant(node.data) if is_constant(node) else node
+        else:
+            mapping[id(node)] = _rewrite(node, [mapping[id(c)] for c in node._prev], builder)
+
+    result = [mapping[id(out)] for out in outputs]
+    result = result[0] if single else result
+    if not stats:
+        return result
+
+    after = set()
+    for out in (result if not single else [result]):
+        after.update(id(node) for node in topological_order(out))
+    return result, {
+        "nodes_before": len(order),
+        "nodes_after": len(after),
+        "folded": builder.folded,
+        "merged": builder.merged,
+        "rewritten": builder.rewritten,
+    }
@@ -0,0 +1,290 @@
+import math
+import numpy as np
+
+from typing import List, Sequence, Tuple, Union
+
+from learn.toolkit.engine import Value, is_grad_enabled, topological_order
+
+
+def _unbroadcast(grad: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Reduz (soma) um gradiente que sofreu broadcasting de volta ao formato original do operando.
+
+    Ex.: se `b` tinha formato (3,) e foi somado a uma matriz (4, 3), o gradiente que chega
+    tem formato (4, 3) e precisa ser somado ao longo do eixo 0.
+    """
+    if grad.shape == shape:
+        return grad
+    # Eixos extras à esquerda, adicionados pelo broadcasting.
+    extra_axes = grad.ndim - len(shape)
+    if extra_axes > 0:
+        grad = grad.sum(axis=tuple(range(extra_axes)))
+    # Eixos que tinham tamanho 1 no operando original.
+    axes = tuple(i for i, dim in enumerate(shape) if dim == 1 and grad.shape[i] != 1)
+    if axes:
+        grad = grad.sum(axis=axes, keepdims=True)
+    return grad.reshape(shape)
+
+
+def _no_backward():
+    pass
+
+
+class Tensor:
+    """
+    Representa um array NumPy que participa de um grafo computacional para
+    diferenciação automática. Tem a mesma API do `Value`, mas cada operação é
+    vetorizada: um único nó representa a operação sobre o array inteiro.
+
+    Attributes:
+        data (np.ndarray): Os dados do nó (float64).
+        grad (np.ndarray): Gradiente da saída final em relação a este nó (mesmo formato de data).
+    """
+
+    def __init__(self, data, _children: tuple = (), _op: str = '', label: str = ''):
+        """
+        Inicializa um objeto Tensor.
+
+        Args:
+            data (array_like): Os dados numéricos (convertidos para np.ndarray float64).
+            _children (tuple, optional): Os Tensors (operandos) que geraram este nó. Default é ().
+            _op (str, optional): A operação que gerou este nó (ex: '+', '@'). Default é ''.
+            label (str, optional): Um rótulo opcional para depuração. Default é ''.
+        """
+        self.data = np.asarray(data, dtype=np.float64)
+        self.grad = np.zeros_like(self.data)
+        self._backward = lambda: None
+        # Dentro de `no_grad`, o nó não guarda referências aos operandos.
+        self._prev = tuple(_children) if is_grad_enabled() else ()
+        self._op = _op
+        self.label = label
+
+    @classmethod
+    def from_values(cls, values: Sequence[Value], shape: Tuple[int, ...], label: str = '') -> "Tensor":
+        """
+        Empacota uma sequência de `Value` escalares num Tensor com o formato pedido.
+
+        No backward, o gradiente do Tensor é devolvido para o `grad` de cada Value, de
+        modo que parâmetros escalares (ex: pesos de um `Neuron`) podem ser usados em
+        operações vetorizadas.
+        """
+        values = list(values)
+        data = np.fromiter((v.data for v in values), dtype=np.float64, count=len(values))
+        out = cls(data.reshape(shape), _op='stack', label=label)
+
+        def _backward():
+            for v, g in zip(values, out.grad.ravel().tolist()):
+                v.grad += g
+        out._backward = _backward
+        return out
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.data.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.data.ndim
+
+    def __repr__(self) -> str:
+        return f"Tensor(shape={self.data.shape}, label='{self.label}')"
+
+    def _ensure_tensor(self, other) -> "Tensor":
+        """
+        Garante que o 'other' operando seja também um Tensor.
+        """
+        return other if isinstance(other, Tensor) else Tensor(other)
+
+    # --- Operações Aritméticas e Métodos Especiais ---
+
+    def __add__(self, other) -> "Tensor":
+        """
+        Implementa a adição (com broadcasting): self + other.
+        """
+        other = self._ensure_tensor(other)
+        out = Tensor(self.data + other.data, (self, other), '+')
+
+        def _backward():
+            self.grad += _unbroadcast(out.grad, self.data.shape)
+            other.grad += _unbroadcast(out.grad, other.data.shape)
+        out._backward = _backward
+        return out
+
+    def __mul__(self, other) -> "Tensor":
+        """
+        Implementa a multiplicação elemento a elemento (com broadcasting): self * other.
+        """
+        other = self._ensure_tensor(other)
+        out = Tensor(self.data * other.data, (self, other), '*')
+
+        def _backward():
+            self.grad += _unbroadcast(other.data * out.grad, self.data.shape)
+            other.grad += _unbroadcast(self.data * out.grad, other.data.shape)
+        out._backward = _backward
+        return out
+
+    def __matmul__(self, other) -> "Tensor":
+        """
+        Implementa o produto matricial: self @ other (self com 1 ou 2 dimensões, other com 2).
+        """
+        other = self._ensure_tensor(other)
+        out = Tensor(self.data @ other.data, (self, other), '@')
+
+        def _backward():
+            if self.data.ndim == 1:
+                # (n,) @ (n, m) -> (m,)
+                self.grad += other.data @ out.grad
+                other.grad += np.outer(self.data, out.grad)
+            else:
+                self.grad += out.grad @ other.data.T
+                other.grad += self.data.T @ out.grad
+        out._backward = _backward
+        return out
+
+    def __pow__(self, other: float) -> "Tensor":
+        """
+        Implementa a potenciação elemento a elemento: self ** other (other escalar int ou float).
+        """
+        assert isinstance(other, (int, float)), "Apenas potências escalares (int/float) são suportadas por enquanto."
+        out = Tensor(self.data ** other, (self,), f'**{other}')
+
+        def _backward():
+            self.grad += (other * self.data ** (other - 1)) * out.grad
+        out._backward = _backward
+        return out
+
+    def __neg__(self) -> "Tensor":
+        return self * -1.0
+
+    def __sub__(self, other) -> "Tensor":
+        return self + (-self._ensure_tensor(other))
+
+    def __truediv__(self, other) -> "Tensor":
+        return self * (self._ensure_tensor(other) ** -1)
+
+    # Métodos refletidos para operações onde Tensor não é o primeiro operando (ex: 2 + t)
+    def __radd__(self, other) -> "Tensor":
+        return self + other
+
+    def __rsub__(self, other) -> "Tensor":
+        return self._ensure_tensor(other) + (-self)
+
+    def __rmul__(self, other) -> "Tensor":
+        return self * other
+
+    def __rtruediv__(self, other) -> "Tensor":
+        return self._ensure_tensor(other) * (self ** -1)
+
+    # --- Redução e formato ---
+
+    def sum(self, axis=None, keepdims: bool = False) -> "Tensor":
+        """
+        Soma os elementos ao longo de `axis` (todos, por padrão).
+        """
+        out = Tensor(self.data.sum(axis=axis, keepdims=keepdims), (self,), 'sum')
+
+        def _backward():
+            grad = out.grad
+            if axis is not None and not keepdims:
+                grad = np.expand_dims(grad, axis)
+            self.grad += np.broadcast_to(grad, self.data.shape)
+        out._backward = _backward
+        return out
+
+    def mean(self, axis=None) -> "Tensor":
+        """
+        Média dos elementos ao longo de `axis` (todos, por padrão).
+        """
+        count = self.data.size if axis is None else self.data.shape[axis]
+        return self.sum(axis=axis) * (1.0 / count)
+
+    def reshape(self, *shape) -> "Tensor":
+        """
+        Retorna um Tensor com os mesmos dados e outro formato.
+        """
+        if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+            shape = tuple(shape[0])
+        out = Tensor(self.data.reshape(shape), (self,), 'reshape')
+
+        def _backward():
+            self.grad += out.grad.reshape(self.data.shape)
+        out._backward = _backward
+        return out
+
+    # --- Funções de Ativação e Outras Funções Matemáticas ---
+
+    def relu(self) -> "Tensor":
+        """
+        Função de ativação ReLU elemento a elemento: max(0, x).
+
+        Como em `Value.relu`, o gradiente passa também quando x == 0 (bias zerados e
+        neurônios mortos produzem esse empate com frequência).
+        """
+        mask = self.data >= 0
+        out = Tensor(np.maximum(self.data, 0.0), (self,), 'ReLU')
+
+        def _backward():
+            self.grad += mask * out.grad
+        out._backward = _backward
+        return out
+
+    def tanh(self) -> "Tensor":
+        """
+        Tangente hiperbólica elemento a elemento.
+        """
+        t = np.tanh(self.data)
+        out = Tensor(t, (self,), 'tanh')
+
+        def _backward():
+            self.grad += (1 - t ** 2) * out.grad
+        out._backward = _backward
+        return out
+
+    def exp(self) -> "Tensor":
+        """
+        Exponencial elemento a elemento: e ** self.data
+        """
+        out = Tensor(np.exp(self.data), (self,), 'exp')
+
+        def _backward():
+            self.grad += out.data * out.grad
+        out._backward = _backward
+        return out
+
+    def log(self, base: float = math.e) -> "Tensor":
+        """
+        Logaritmo elemento a elemento (log natural por padrão).
+        """
+        x = self.data
+        if np.any(x <= 0):
+            raise ValueError("Logaritmo indefinido ou complexo para data <= 0.")
+        out = Tensor(np.log(x) / math.log(base), (self,), f'log_base{base:.2f}')
+
+        def _backward():
+            self.grad += out.grad / (x * math.log(base))
+        out._backward = _backward
+        return out
+
+    # --- Backpropagation ---
+    def backward(self, free_graph: bool = False):
+        """
+        Realiza o backpropagation a partir deste Tensor. Se ele não for escalar, o
+        gradiente inicial é um array de uns (equivalente a fazer backward de `self.sum()`).
+
+        Args:
+            free_graph (bool): Se True, cada nó descarta sua closure de backward (que
+                               prende os operandos e seus arrays) e seus filhos assim que
+                               propaga o gradiente (ver `Value.backward`).
+        """
+        topo = topological_order(self)
+        self.grad = np.ones_like(self.data)
+        if not free_graph:
+            for node in reversed(topo):
+                node._backward()
+            return
+
+        while topo:
+            node = topo.pop()
+            node._backward()
+            node._backward = _no_backward
+            node._prev = ()
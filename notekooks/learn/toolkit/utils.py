@@ -1,19 +1,20 @@
-from learn.toolkit.engine import Value
-from learn.toolkit.nn import MLP
-from typing import List, Union
+from learn.toolkit.engine import Tape, Value, topological_order
+from learn.toolkit.nn import MLP, instrument_modules
+from learn.toolkit.tensor import Tensor
+from typing import Dict, List, Optional, Union
+from collections import Counter
+from contextlib import contextmanager
+import json
+import numpy as np
 
 
 # Supondo que você tenha a função draw_dot como nos notebooks micrograd
 # Se precisar, aqui está uma versão simplificada (requer 'graphviz' instalado: pip install graphviz)
 def trace(root):
-    nodes, edges = set(), set()
-    def build(v):
-        if v not in nodes:
-            nodes.add(v)
-            for child in v._prev:
-                edges.add((child, v))
-                build(child)
-    build(root)
+    # Percurso iterativo (sem recursão): funciona com grafos de qualquer profundidade.
+    topo = topological_order(root)
+    nodes = set(topo)
+    edges = {(child, v) for v in topo for child in v._prev}
     return nodes, edges
 
 def draw_dot(root, format='svg', rankdir='LR'):
@@ -21,6 +22,9 @@ def draw_dot(root, format='svg', rankdir='LR'):
     """
     format: png | pdf | svg
     rankdir: TB (top-bottom graph) | LR (left-right graph)
+
+    Para grafos grandes (ex: um MLP inteiro sobre um lote), prefira `draw_summary`
+    ou `write_dot`/`write_json`, que gravam direto no disco.
     """
     assert rankdir in ['LR', 'TB']
     nodes, edges = trace(root)
@@ -38,12 +42,165 @@ def draw_dot(root, format='svg', rankdir='LR'):
 
     return dot
 
+
+@contextmanager
+def record_scopes():
+    """
+    Registra em qual camada/neurônio cada `Value` foi criado, para `summarize_graph(by='layer'|'neuron')`.
+
+    Enquanto o contexto está ativo, as chamadas de `Layer` e `Neuron` são instrumentadas
+    (`nn.instrument_modules`); fora dele, não há custo nenhum.
+
+    Usage:
+        >>> with record_scopes() as scopes:
+        ...     loss = sum((mlp(x) - y) ** 2 for x, y in zip(xs, ys))
+        >>> draw_summary(loss, by='layer', scopes=scopes)
+    """
+    scopes = {}
+
+    def on_call(scope, call):
+        start = len(tape.nodes)
+        try:
+            return call()
+        finally:
+            # O escopo mais interno (o neurônio) vence: a camada só fica com o que sobrou.
+            for node in tape.nodes[start:]:
+                scopes.setdefault(id(node), scope)
+
+    tape = Tape()
+    try:
+        with tape, instrument_modules(on_call):
+            yield scopes
+    finally:
+        tape.reset()
+
+
+def _group_of(node: "Value", by: str, scopes: Optional[Dict[int, str]]) -> str:
+    if by == 'op':
+        return node._op or ('leaf' if not node._prev else node.label)
+    scope = scopes.get(id(node)) if scopes else None
+    if scope is None:
+        return 'leaf' if not node._prev else 'other'
+    return scope.split('/')[0] if by == 'layer' else scope
+
+
+def summarize_graph(root, by: str = 'op', scopes: Optional[Dict[int, str]] = None):
+    """
+    Colapsa o grafo de `root` em grupos: por tipo de operação (`by='op'`) ou por
+    camada/neurônio (`by='layer'`/`'neuron'`, requer os `scopes` de `record_scopes`).
+
+    Returns:
+        (groups, edges): `groups` mapeia o nome do grupo para o número de nós e
+        `edges` mapeia (grupo_filho, grupo_pai) para o número de arestas entre grupos diferentes.
+    """
+    assert by in ['op', 'layer', 'neuron']
+    groups, edges = Counter(), Counter()
+    group_of = {}
+    for node in topological_order(root):
+        group = _group_of(node, by, scopes)
+        group_of[id(node)] = group
+        groups[group] += 1
+        for child in node._prev:
+            child_group = group_of[id(child)]
+            # Arestas internas a um grupo não aparecem no resumo.
+            if child_group != group:
+                edges[(child_group, group)] += 1
+    return dict(groups), dict(edges)
+
+
+def draw_summary(root, by: str = 'op', scopes: Optional[Dict[int, str]] = None, format='svg', rankdir='LR'):
+    """
+    Como `draw_dot`, mas com um nó por grupo (ver `summarize_graph`) e as arestas
+    anotadas com a quantidade de ligações que representam.
+    """
+    from graphviz import Digraph
+    assert rankdir in ['LR', 'TB']
+    groups, edges = summarize_graph(root, by=by, scopes=scopes)
+    dot = Digraph(format=format, graph_attr={'rankdir': rankdir})
+    for group, count in groups.items():
+        dot.node(name=group, label=f"{group} | {count} nós", shape='record')
+    for (child, parent), count in edges.items():
+        dot.edge(child, parent, label=str(count))
+    return dot
+
+
+def _dot_escape(text: str) -> str:
+    return str(text).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def write_dot(root, path: str, by: Optional[str] = None, scopes: Optional[Dict[int, str]] = None, rankdir='LR'):
+    """
+    Grava o grafo de `root` em formato DOT direto no arquivo `path`, um nó por vez,
+    sem montar o objeto `graphviz.Digraph` em memória. Com `by`, grava a versão resumida.
+
+    Como em `draw_dot`, as arestas entram no nó da operação ou, quando o nó não tem
+    `_op` (ex: `relu`), direto no nó.
+
+    Usage:
+        >>> import os, tempfile
+        >>> a = Value(2.0)
+        >>> root = (a * 3).relu() + 1
+        >>> path = os.path.join(tempfile.mkdtemp(), 'grafo.dot')
+        >>> write_dot(root, path)
+        >>> with open(path, encoding='utf-8') as file:
+        ...     # As arestas "nXop -> nX" ligam a operação ao próprio nó; as demais vêm dos filhos.
+        ...     child_edges = [line for line in file if '->' in line and 'op ->' not in line]
+        >>> _, edges = trace(root)
+        >>> len(child_edges) == len(edges)
+        True
+    """
+    assert rankdir in ['LR', 'TB']
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f'digraph {{\n  rankdir={rankdir};\n  node [shape=record];\n')
+        if by is not None:
+            groups, edges = summarize_graph(root, by=by, scopes=scopes)
+            for group, count in groups.items():
+                file.write(f'  "{_dot_escape(group)}" [label="{_dot_escape(group)} | {count} nós"];\n')
+            for (child, parent), count in edges.items():
+                file.write(f'  "{_dot_escape(child)}" -> "{_dot_escape(parent)}" [label="{count}"];\n')
+        else:
+            index = {}
+            for node in topological_order(root):
+                i = index[id(node)] = len(index)
+                label = f"data {node.data:.4f} | grad {node.grad:.4f} | label {node.label}"
+                file.write(f'  n{i} [label="{_dot_escape(label)}"];\n')
+                target = f'n{i}'
+                if node._op:
+                    target = f'n{i}op'
+                    file.write(f'  {target} [label="{_dot_escape(node._op)}", shape=ellipse];\n  {target} -> n{i};\n')
+                for child in node._prev:
+                    file.write(f'  n{index[id(child)]} -> {target};\n')
+        file.write('}\n')
+
+
+def write_json(root, path: str):
+    """
+    Grava o grafo de `root` em JSON direto no arquivo `path`, um nó por linha:
+    {"nodes": [{"id", "op", "label", "data", "grad", "children"}, ...]}, em ordem
+    topológica (os filhos sempre aparecem antes dos pais).
+    """
+    index = {}
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{"nodes": [\n')
+        for node in topological_order(root):
+            i = index[id(node)] = len(index)
+            record = {
+                "id": i,
+                "op": node._op,
+                "label": node.label,
+                "data": node.data,
+                "grad": node.grad,
+                "children": [index[id(child)] for child in node._prev],
+            }
+            file.write((',\n' if i else '') + json.dumps(record))
+        file.write('\n]}\n')
+
 # Função genérica para converter qualquer vetor/lista y em lista de objetos Value (com rótulo opcional)
 def to_value_vector(y, label_prefix="y"):
     """
     Converte um vetor/lista y em uma lista de objetos Value, com rótulo customizado.
     """
-    return [Value(v, label=f"{label_prefix} {i}") for i, v in enumerate(y)]
+    return [Value(v, label=("{} {}", label_prefix, i)) for i, v in enumerate(y)]
 
 def to_value_matrix(X, label_prefix="input"):
     """
@@ -51,15 +208,35 @@ def to_value_matrix(X, label_prefix="input"):
     com rótulo customizado para cada entrada.
     """
     return [
-        [Value(v, label=f"{label_prefix} {i}_{j}") for j, v in enumerate(row)]
+        [Value(v, label=("{} {}_{}", label_prefix, i, j)) for j, v in enumerate(row)]
         for i, row in enumerate(X)
     ]
 
 
-def forward(mlp: "MLP", x_data:List[List[float]]) -> List["Value"]:
+def to_batch(X) -> np.ndarray:
+    """
+    Converte uma matriz X (list of lists, np.ndarray ou a saída de `to_value_matrix`)
+    num array 2-D de floats, pronto para o caminho em lote do `MLP`.
+    """
+    if isinstance(X, np.ndarray):
+        return X.astype(np.float64, copy=False)
+    return np.array(
+        [[v.data if isinstance(v, Value) else v for v in row] for row in X],
+        dtype=np.float64
+    )
+
+
+def forward(mlp: "MLP", x_data:List[List[float]], batched: bool = False) -> Union[List["Value"], "Tensor"]:
     """
     The forward function takes the mlp and the inputs. The inputs are forwarded through the mlp, and we obtain the predictions from the mlp.
+
+    Com `batched=True`, o conjunto inteiro é processado como um único lote vetorizado
+    e o retorno é um `Tensor` (uma predição por linha) em vez de uma lista de `Value`.
+    Use-o com `mse_loss`/`cross_entropy_loss` de `learn.toolkit.losses`.
     """
+    if batched:
+        return mlp(to_batch(x_data))
+
     # Get the predictions upon forwarding the input data through the mlp
     y_pred_list = [mlp(x) for x in x_data]
     return y_pred_list
@@ -79,5 +256,10 @@ def update_mlp(mlp: "MLP", learning_rate:float):
     - O resultado líquido é que todos os pesos e biases do mlp são sutilmente alterados em uma direção que, espera-se, reduza a total_loss na próxima vez que o forward pass for executado com os mesmos dados.
     """
     # Update (Gradiente Descendente)
+    if mlp.is_flat:
+        # Buffer plano: uma única operação vetorizada sobre todos os pesos.
+        data = mlp.flat_data
+        data -= learning_rate * mlp.flat_grad
+        return
     for layer in mlp.parameters():
         layer.data -= learning_rate * layer.grad